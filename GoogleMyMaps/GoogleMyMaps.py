@@ -7,7 +7,16 @@ class GoogleMyMaps:
         self.parser = GoogleMyMapsParser()
 
     def create_map(self, map_link, chosen_layers: list = None):
-        data = self.parser.get_map_data(map_link)
+        return self.decode_map(map_link, self.download_map(map_link), chosen_layers)
+
+    def download_map(self, map_link, on_download=None, validators: dict = None):
+        return self.parser.fetch_map_page(map_link, on_download, validators)
+
+    def get_page_data_hash(self, raw_data: str) -> str:
+        return self.parser.get_page_data_hash(raw_data)
+
+    def decode_map(self, map_link, raw_data: str, chosen_layers: list = None):
+        data = self.parser.parse_map_page(raw_data)
         name = data[2] if len(data) > 2 else 'Unnamed Map'
         chosen_layers = GoogleMyMaps._parse_layers(data[6], chosen_layers) if len(data) > 6 else []
         return Map(map_link, name, chosen_layers)
@@ -1,4 +1,4 @@
-from . import Place
+from .Place import Place
 
 
 class Layer:
@@ -6,6 +6,13 @@ class Layer:
         self.name = name
         self.places = places
 
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'places': [place.to_dict() for place in self.places]}
+
+    @staticmethod
+    def from_dict(layer_dict: dict):
+        return Layer(layer_dict['name'], [Place.from_dict(place) for place in layer_dict['places']])
+
     def __str__(self):
         places_str = '\n'.join([f"    {place}" for place in self.places]) if self.places else "No places"
         return f'Layer: {self.name}\n' \
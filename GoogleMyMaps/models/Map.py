@@ -1,4 +1,4 @@
-from . import Layer
+from .Layer import Layer
 
 
 class Map:
@@ -7,6 +7,13 @@ class Map:
         self.name = name
         self.layers = layers
 
+    def to_dict(self) -> dict:
+        return {'link': self.link, 'name': self.name, 'layers': [layer.to_dict() for layer in self.layers]}
+
+    @staticmethod
+    def from_dict(map_dict: dict):
+        return Map(map_dict['link'], map_dict['name'], [Layer.from_dict(layer) for layer in map_dict['layers']])
+
     def __str__(self):
         layers_str = '\n'.join([f"  {layer}" for layer in self.layers]) if self.layers else "No layers"
         return f'Link: {self.link}\n' \
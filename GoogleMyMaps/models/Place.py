@@ -13,6 +13,25 @@ class Place:
         self.photos = photos
         self.data = data
 
+    def to_dict(self) -> dict:
+        return {
+            'place_type': self.place_type,
+            'name': self.name,
+            'icon': self.icon,
+            'coords': self.coords,
+            'photos': self.photos,
+            'data': self.data,
+        }
+
+    @staticmethod
+    def from_dict(place_dict: dict):
+        return Place(place_dict['place_type'],
+                     place_dict['name'],
+                     place_dict['icon'],
+                     place_dict['coords'],
+                     place_dict['photos'],
+                     place_dict['data'])
+
     def __str__(self):
         photos_str = ('      Photos:\n'
                       + ''.join([f"        {photo}\n" for photo in self.photos])) \
@@ -1,39 +1,131 @@
+import hashlib
 import re
-
-import requests
-from bs4 import BeautifulSoup
-from pyjsparser import PyJsParser
+import threading
 
 
 class GoogleMyMapsParser:
+    CHUNK_SIZE = 64 * 1024
+    WARM_UP_URL = 'https://www.google.com/maps/d/'
+    WARM_UP_TIMEOUT = 5
+    # Connect and read timeouts of the map download in seconds, a stalled connection fails instead of hanging
+    FETCH_TIMEOUT = (5, 30)
+    # The page data assigned in the map page script, the rest of the page changes with every load
+    PAGE_DATA_PATTERN = re.compile(r'var _pageData = "([^"\\]*(?:\\.[^"\\]*)*)"', re.DOTALL)
+
+    # requests.Session isn't thread-safe, so each thread loading maps gets its own session, reused by its loads.
+    # A session opened by open_connection waits as a spare for the first thread without a session.
+    _sessions = threading.local()
+    _spare_session = None
+    _session_lock = threading.Lock()
+
     def __init__(self):
-        self.parser = PyJsParser()
+        # requests, BeautifulSoup and PyJsParser are imported on the first map load, not at startup.
+        # PyJsParser keeps the parsed source in its state, so each thread decoding maps gets its own.
+        self._local = threading.local()
+
+    @property
+    def parser(self):
+        if getattr(self._local, 'parser', None) is None:
+            from pyjsparser import PyJsParser
+            self._local.parser = PyJsParser()
+        return self._local.parser
 
     def get_map_data(self, map_link: str):
-        GoogleMyMapsParser._validate_map_link(map_link)
-        raw_data = GoogleMyMapsParser._fetch_data(map_link)
-        parsed_data = self._parse_data(raw_data)
+        raw_data = self.fetch_map_page(map_link)
+        parsed_data = self.parse_map_page(raw_data)
         return parsed_data
 
+    def fetch_map_page(self, map_link: str, on_download=None, validators: dict = None):
+        # With validators, the request is conditional and None is returned if the page wasn't modified.
+        # The ETag and Last-Modified headers of a downloaded page are stored to validators for the next request.
+        GoogleMyMapsParser._validate_map_link(map_link)
+        return GoogleMyMapsParser._fetch_data(map_link, on_download, validators)
+
+    def parse_map_page(self, raw_data: str):
+        return self._parse_data(raw_data)
+
     @staticmethod
-    def _validate_map_link(map_link: str):
+    def open_connection():
+        # Opens a connection to the map server in advance in a new session, which is then handed over
+        # to the next thread loading a map, so its first load skips the DNS lookup and TLS handshake
+        import requests
+
+        session = requests.Session()
+        try:
+            session.head(GoogleMyMapsParser.WARM_UP_URL, timeout=GoogleMyMapsParser.WARM_UP_TIMEOUT)
+        except requests.RequestException:
+            session.close()
+            return
+        with GoogleMyMapsParser._session_lock:
+            previous, GoogleMyMapsParser._spare_session = GoogleMyMapsParser._spare_session, session
+        if previous is not None:
+            previous.close()
+
+    @staticmethod
+    def get_page_data_hash(raw_data: str) -> str:
+        # Hashes only the page data, so a page with the same map content has the same hash
+        match = GoogleMyMapsParser.PAGE_DATA_PATTERN.search(raw_data)
+        content = match.group(1) if match else raw_data
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def is_valid_map_link(map_link: str) -> bool:
         map_link_pattern = re.compile(
             r'https://www\.google\.com/maps/d/u/.*'
         )
+        return bool(map_link_pattern.match(map_link))
 
-        if not map_link_pattern.match(map_link):
+    @staticmethod
+    def _validate_map_link(map_link: str):
+        if not GoogleMyMapsParser.is_valid_map_link(map_link):
             raise ValueError('Invalid map link format.')
 
     @staticmethod
-    def _fetch_data(map_link: str):
-        response = requests.get(map_link)
+    def _get_session():
+        session = getattr(GoogleMyMapsParser._sessions, 'session', None)
+        if session is None:
+            with GoogleMyMapsParser._session_lock:
+                session, GoogleMyMapsParser._spare_session = GoogleMyMapsParser._spare_session, None
+            if session is None:
+                import requests
+
+                session = requests.Session()
+            GoogleMyMapsParser._sessions.session = session
+        return session
 
-        if response.status_code != 200:
-            raise Exception(f'Failed to fetch map data. Status code: {response.status_code}')
+    @staticmethod
+    def _fetch_data(map_link: str, on_download=None, validators: dict = None):
+        # on_download(received_bytes, total_bytes) is called for every chunk, total_bytes is None if unknown
+        headers = {}
+        if validators:
+            if validators.get('ETag'):
+                headers['If-None-Match'] = validators['ETag']
+            if validators.get('Last-Modified'):
+                headers['If-Modified-Since'] = validators['Last-Modified']
+        with GoogleMyMapsParser._get_session().get(map_link, stream=True, headers=headers,
+                                                   timeout=GoogleMyMapsParser.FETCH_TIMEOUT) as response:
+            if response.status_code == 304 and validators is not None:
+                return None
+            if response.status_code != 200:
+                raise Exception(f'Failed to fetch map data. Status code: {response.status_code}')
 
-        return response.text
+            if validators is not None:
+                for header in ('ETag', 'Last-Modified'):
+                    validators[header] = response.headers.get(header)
+            content_length = response.headers.get('Content-Length')
+            total = int(content_length) if content_length and content_length.isdigit() else None
+            chunks = []
+            received = 0
+            for chunk in response.iter_content(chunk_size=GoogleMyMapsParser.CHUNK_SIZE):
+                chunks.append(chunk)
+                received += len(chunk)
+                if on_download is not None:
+                    on_download(received, total)
+            return b''.join(chunks).decode(response.encoding or 'utf-8', errors='replace')
 
     def _parse_data(self, raw_data: str):
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(raw_data, 'html.parser')
         script = soup.find_all('script')[2].text
         js = self.parser.parse(script)
@@ -0,0 +1,189 @@
+"""
+Startup benchmark of the application.
+
+Measures the import time of the main window module with ``python -X importtime`` and the time
+from starting the interpreter to showing the first window, and checks them against a budget.
+Heavy modules must not be imported before the first window is shown.
+
+Run it from the repository root:
+
+    python -m benchmarks.startup_time [--runs N] [--import-budget MS] [--window-budget S]
+
+The exit code is 1 if a budget is exceeded or a heavy module is imported at startup.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+STARTUP_MODULE = "gui_interface.main_app"
+HEAVY_MODULES = ("openpyxl", "shapely", "numpy", "bs4", "pyjsparser", "requests", "PIL", "pyfiglet")
+IMPORT_BUDGET_MS = 150.0
+WINDOW_BUDGET_S = 1.5
+TOP_IMPORTS = 10
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_WINDOW_CODE = f"""
+import sys
+import tkinter as tk
+try:
+    from {STARTUP_MODULE} import MainApp
+    app = MainApp()
+    app.update()
+except tk.TclError as e:
+    print("no display:", e, file=sys.stderr)
+    sys.exit(3)
+app.destroy()
+"""
+
+
+class ImportTime(NamedTuple):
+    """
+    A single line of the ``-X importtime`` output.
+
+    Attributes:
+        module (str): Name of the imported module.
+        self_us (int): Time spent importing the module itself in microseconds.
+        cumulative_us (int): Time spent importing the module and its imports in microseconds.
+        depth (int): Nesting of the import, 0 for the top-level imports.
+    """
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_import_times(output: str) -> List[ImportTime]:
+    """
+    Parse the ``-X importtime`` output, skipping the imports done by the site module.
+
+    Parameters:
+        output (str): The standard error of the measured interpreter.
+
+    Returns:
+        List[ImportTime]: The imports in the order they finished.
+    """
+    import_times = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # The name is indented by two spaces per nesting level, after the separating space
+        name = name[1:].rstrip()
+        depth = (len(name) - len(name.lstrip(" "))) // 2 - 1
+        import_times.append(ImportTime(name.strip(), int(self_us), int(cumulative_us), depth))
+        if name.strip() == "site" and depth == 0:
+            # Everything before is imported by the interpreter and site-packages, not by the application
+            import_times.clear()
+    return import_times
+
+
+def measure_imports() -> List[ImportTime]:
+    """
+    Import the startup module in a new interpreter with ``-X importtime``.
+
+    Returns:
+        List[ImportTime]: The imports of the startup module.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {STARTUP_MODULE}"],
+                            cwd=REPOSITORY_ROOT, capture_output=True, text=True, check=True)
+    return parse_import_times(result.stderr)
+
+
+def measure_first_window() -> Optional[float]:
+    """
+    Start a new interpreter which creates the main window and shows it.
+
+    Returns:
+        Optional[float]: Seconds from starting the interpreter to showing the window,
+                         None if there is no display to show it on.
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", FIRST_WINDOW_CODE],
+                            cwd=REPOSITORY_ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode == 3:
+        return None
+    if result.returncode != 0:
+        raise RuntimeError(f"Showing the first window failed:\n{result.stderr}")
+    return elapsed
+
+
+def get_heavy_imports(import_times: List[ImportTime]) -> List[str]:
+    """
+    Get the heavy modules imported at startup.
+
+    Parameters:
+        import_times (List[ImportTime]): The imports of the startup module.
+
+    Returns:
+        List[str]: Names of the imported heavy packages.
+    """
+    modules = {import_time.module.split(".")[0] for import_time in import_times}
+    return [module for module in HEAVY_MODULES if module in modules]
+
+
+def get_top_imports(import_times: List[ImportTime], count: int) -> List[Tuple[str, int]]:
+    """
+    Get the modules that took the longest to import themselves.
+
+    Parameters:
+        import_times (List[ImportTime]): The imports of the startup module.
+        count (int): Number of returned modules.
+
+    Returns:
+        List[Tuple[str, int]]: Names and self import times in microseconds, the slowest first.
+    """
+    self_times: Dict[str, int] = {}
+    for import_time in import_times:
+        self_times[import_time.module] = import_time.self_us
+    return sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def main() -> int:
+    """
+    Run the benchmark and print its results.
+
+    Returns:
+        int: The exit code, 1 if a budget is exceeded or a heavy module is imported at startup.
+    """
+    parser = argparse.ArgumentParser(description="Measure the startup time of the application.")
+    parser.add_argument("--runs", type=int, default=5, help="number of measured runs, the median is used")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS,
+                        help="budget of importing the main window module in milliseconds")
+    parser.add_argument("--window-budget", type=float, default=WINDOW_BUDGET_S,
+                        help="budget of the time to the first window in seconds")
+    args = parser.parse_args()
+
+    runs = [measure_imports() for _ in range(args.runs)]
+    import_ms = statistics.median(sum(t.cumulative_us for t in run if t.depth == 0) for run in runs) / 1000
+    heavy_imports = get_heavy_imports(runs[-1])
+
+    print(f"Import of {STARTUP_MODULE}: {import_ms:.1f} ms (budget {args.import_budget:.0f} ms)")
+    print("Slowest imports:")
+    for module, self_us in get_top_imports(runs[-1], TOP_IMPORTS):
+        print(f"  {self_us / 1000:7.1f} ms  {module}")
+    failed = import_ms > args.import_budget
+    if heavy_imports:
+        print(f"Heavy modules imported at startup: {', '.join(heavy_imports)}")
+        failed = True
+
+    first_window = measure_first_window()
+    if first_window is None:
+        print("Time to first window: skipped, no display")
+    else:
+        window_s = statistics.median([first_window] + [measure_first_window() for _ in range(args.runs - 1)])
+        print(f"Time to first window: {window_s:.3f} s (budget {args.window_budget:.2f} s)")
+        failed = failed or window_s > args.window_budget
+
+    print("FAILED" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+class ProgressEvent(NamedTuple):
+    """
+    Progress of a running job.
+
+    Attributes:
+        stage (str): Name of the current stage.
+        label (str): Label of the current stage shown to the user.
+        fraction (float): Done part of the whole job from 0 to 1.
+        elapsed (float): Seconds since the job started.
+        detail (str): Details of the stage progress, e.g. downloaded kilobytes or the processed course.
+    """
+
+    stage: str
+    label: str
+    fraction: float
+    elapsed: float
+    detail: str
+
+
+class Progress:
+    """
+    Progress of a job running in stages, with the time spent in each stage.
+
+    The job is split into stages with a relative weight each, the overall progress moves through
+    the weight of a stage as it advances. Events are passed to a callback, which may put them to a queue
+    for the GUI thread, stage progress events are limited to one per EVENT_INTERVAL.
+
+    Attributes:
+        STAGES (Dict[str, Tuple[str, float]]): Labels and weights of the known stages by name.
+        EVENT_INTERVAL (float): Minimal interval between stage progress events in seconds.
+        timings (List[Tuple[str, float]]): Finished stages with their durations in seconds.
+    """
+
+    STAGES: Dict[str, Tuple[str, float]] = {
+        "download": ("Pobieranie mapy", 3),
+        "decode": ("Odczytywanie mapy", 1),
+        "preview": ("Podgląd mapy", 0.5),
+        "zones": ("Strefy", 0.5),
+        "chainage": ("Kilometraż tras", 3),
+        "matching": ("Dopasowywanie przeszkód", 2),
+        "render": ("Tworzenie listy", 2),
+        "update": ("Aktualizacja listy", 3),
+        "save": ("Zapisywanie", 1),
+    }
+    EVENT_INTERVAL = 0.05
+
+    def __init__(self, stages: Optional[List[str]] = None, on_event: Optional[Callable[[ProgressEvent], None]] = None):
+        """
+        Initialize the progress of a job.
+
+        Parameters:
+            stages (Optional[List[str]]): Names of the stages the job runs, in order. Stages that aren't
+                                          listed are timed, but don't move the overall progress.
+            on_event (Optional[Callable[[ProgressEvent], None]]): Callback getting the progress events.
+        """
+        self.stages = stages or []
+        self.on_event = on_event
+        self.timings: List[Tuple[str, float]] = []
+        self._start = time.perf_counter()
+        self._total_weight = sum(self._get_weight(stage) for stage in self.stages) or 1
+        self._done_weight = 0.0
+        self._stage: Optional[str] = None
+        self._last_event = 0.0
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Run a stage of the job, timing it.
+
+        Parameters:
+            name (str): Name of the stage.
+        """
+        outer_stage = self._stage
+        self._stage = name
+        stage_start = time.perf_counter()
+        self._emit(0.0, "", force=True)
+        try:
+            yield self
+        finally:
+            self.timings.append((name, time.perf_counter() - stage_start))
+            self._stage = outer_stage
+            if name in self.stages:
+                self._done_weight += self._get_weight(name)
+
+    def advance(self, done: float, total: Optional[float], detail: str = "") -> None:
+        """
+        Report the progress of the current stage.
+
+        Parameters:
+            done (float): Done amount of the stage work, e.g. downloaded bytes or processed courses.
+            total (Optional[float]): Whole amount of the stage work, None if it isn't known.
+            detail (str): Details shown with the stage.
+        """
+        stage_fraction = min(done / total, 1.0) if total else 0.0
+        self._emit(stage_fraction, detail, force=bool(total) and done >= total)
+
+    def get_elapsed(self) -> float:
+        """
+        Get the seconds since the job started.
+
+        Returns:
+            float: The elapsed time.
+        """
+        return time.perf_counter() - self._start
+
+    def log_timings(self) -> None:
+        """
+        Log the durations of all finished stages.
+        """
+        if not self.timings:
+            return
+        stages = ", ".join(f"{name} {duration:.3f} s" for name, duration in self.timings)
+        log.info("Stage timings: %s, total %.3f s of %.3f s", stages,
+                 sum(duration for _, duration in self.timings), self.get_elapsed())
+
+    def _get_weight(self, stage: str) -> float:
+        """
+        Get the weight of a stage.
+
+        Parameters:
+            stage (str): Name of the stage.
+
+        Returns:
+            float: The weight, 1 for unknown stages.
+        """
+        return self.STAGES.get(stage, (stage, 1))[1]
+
+    def _emit(self, stage_fraction: float, detail: str, force: bool = False) -> None:
+        """
+        Pass a progress event of the current stage to the callback.
+
+        Parameters:
+            stage_fraction (float): Done part of the current stage from 0 to 1.
+            detail (str): Details of the stage progress.
+            force (bool): Whether to pass the event even if the previous one was passed just now.
+        """
+        if self.on_event is None or self._stage is None:
+            return
+        now = time.perf_counter()
+        if not force and now - self._last_event < self.EVENT_INTERVAL:
+            return
+        self._last_event = now
+        weight = self._get_weight(self._stage) if self._stage in self.stages else 0
+        fraction = (self._done_weight + weight * stage_fraction) / self._total_weight
+        label = self.STAGES.get(self._stage, (self._stage, 1))[0]
+        self.on_event(ProgressEvent(self._stage, label, min(fraction, 1.0), now - self._start, detail))
@@ -3,9 +3,14 @@ import logging
 import os
 import platform
 import sys
+import tempfile
+from typing import BinaryIO, Callable
 
 log = logging.getLogger(__name__)
 
+# Permissions of newly written files
+NEW_FILE_MODE = 0o644
+
 
 def resource_path(relative_path: str) -> str:
     """
@@ -53,6 +58,36 @@ def start_application(file_path: str) -> None:
         log.error("Unsupported operating system: %s", platform.system())
 
 
+def write_atomically(file_path: str, write: Callable[[BinaryIO], None]) -> None:
+    """
+    Write a file through a temporary file in the same directory, which then replaces the target file.
+    
+    The temporary file has the extension of the target file, so it's recognized by its type while being written.
+    
+    Parameters:
+        file_path (str): Path of the written file.
+        write (Callable[[BinaryIO], None]): Function writing the whole content to the given binary file.
+        
+    Raises:
+        OSError: If the file can't be written.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    file_mode = os.stat(file_path).st_mode if os.path.exists(file_path) else NEW_FILE_MODE
+    fd, temp_path = tempfile.mkstemp(prefix=".~", suffix=os.path.splitext(file_path)[1], dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            write(temp_file)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        # Temporary files are private, the written file gets the permissions of the replaced or a regular file
+        os.chmod(temp_path, file_mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 def unify_string(string: str) -> str:
     """
     Standardize a string by removing whitespace and converting to uppercase.
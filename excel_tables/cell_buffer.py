@@ -0,0 +1,92 @@
+from typing import Any, Dict, Set, Tuple
+
+from openpyxl.styles import Font
+from openpyxl.worksheet.worksheet import Worksheet
+
+
+class CellBuffer:
+    """
+    An in-memory sparse grid of cells written to a worksheet.
+
+    Cells are kept in a dictionary and written to the openpyxl worksheet in a single pass ordered by rows
+    and columns. Checking whether a cell is taken looks only at the dictionary, never at the worksheet.
+    Fonts are created once and shared by all cells using them.
+
+    Attributes:
+        FONTS (Dict[str, Font]): Cached fonts by style name.
+        cells (Dict[Tuple[int, int], Any]): Written values by (column, row).
+        styles (Dict[Tuple[int, int], str]): Style names of styled cells by (column, row).
+    """
+
+    FONTS: Dict[str, Font] = {
+        "bold": Font(bold=True, name="Calibri"),
+    }
+
+    def __init__(self):
+        """
+        Initialize an empty buffer.
+        """
+        self.cells: Dict[Tuple[int, int], Any] = {}
+        self.styles: Dict[Tuple[int, int], str] = {}
+
+    def write(self, col: int, row: int, value) -> None:
+        """
+        Write a value to a cell.
+
+        Parameters:
+            col (int): Column number (1-based)
+            row (int): Row number (1-based)
+            value: The value to write, None clears the cell
+        """
+        self.cells[(col, row)] = value
+
+    def is_written(self, col: int, row: int) -> bool:
+        """
+        Check whether a value other than None was written to a cell.
+
+        Parameters:
+            col (int): Column number (1-based)
+            row (int): Row number (1-based)
+
+        Returns:
+            bool: True if the cell holds a written value.
+        """
+        return self.cells.get((col, row)) is not None
+
+    def set_style(self, col: int, row: int, style: str) -> None:
+        """
+        Set a cached style of a cell.
+
+        Parameters:
+            col (int): Column number (1-based)
+            row (int): Row number (1-based)
+            style (str): Name of the style in FONTS.
+        """
+        self.styles[(col, row)] = style
+
+    def get_styled_cells(self, style: str) -> Set[Tuple[int, int]]:
+        """
+        Get all cells with a given style.
+
+        Parameters:
+            style (str): Name of the style in FONTS.
+
+        Returns:
+            Set[Tuple[int, int]]: Cells as (column, row).
+        """
+        return {cell for cell, cell_style in self.styles.items() if cell_style == style}
+
+    def flush(self, ws: Worksheet) -> None:
+        """
+        Write all buffered cells and styles to a worksheet in a single pass ordered by rows and columns.
+
+        Parameters:
+            ws (Worksheet): The worksheet to write to.
+        """
+        for col, row in sorted(self.cells.keys() | self.styles.keys(), key=lambda cell: (cell[1], cell[0])):
+            cell = ws.cell(row=row, column=col)
+            if (col, row) in self.cells:
+                cell.value = self.cells[(col, row)]
+            style = self.styles.get((col, row))
+            if style is not None:
+                cell.font = self.FONTS[style]
@@ -24,6 +24,7 @@ class CourseTrail:
             course (Layer): The course layer containing places and trail information.
         """
         self.trail = self._get_trail(course)
+        self._cumulative_distances: Optional[list] = None
 
     @staticmethod
     def _get_trail(course) -> Optional[list]:
@@ -80,16 +81,30 @@ class CourseTrail:
         Returns:
             float: Total distance in meters from the start of the trail to the specified point.
         """
+        if self._cumulative_distances is None:
+            self._cumulative_distances = self._get_cumulative_distances()
+        total_distance = self._cumulative_distances[segment_idx] if segment_idx > 0 else 0
+
+        total_distance += distance_along
+
+        return total_distance
+
+    def _get_cumulative_distances(self) -> list:
+        """
+        Calculate distances from the start of the trail to each of its points.
+
+        Returns:
+            list: Distance in meters along the trail to the point with the same index.
+        """
+        cumulative_distances = [0]
         total_distance = 0
-        for i in range(segment_idx):
+        for i in range(len(self.trail) - 1):
             total_distance += CourseTrail._haversine_distance(
                 self.trail[i][0], self.trail[i][1],
                 self.trail[i + 1][0], self.trail[i + 1][1]
             )
-
-        total_distance += distance_along
-
-        return total_distance
+            cumulative_distances.append(total_distance)
+        return cumulative_distances
 
     @staticmethod
     def _haversine_distance(lat1, lon1, lat2, lon2):
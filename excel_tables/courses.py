@@ -67,6 +67,20 @@ class Courses:
                 return number
         return 0
 
+    @staticmethod
+    def get_max_obstacle_number(course: Layer) -> int:
+        """
+        Get the highest obstacle number in a course, wherever the obstacle is placed in the layer.
+
+        Parameters:
+            course (Layer): The course layer to analyze.
+
+        Returns:
+            int: The highest obstacle number found in the course, or 0 if none found.
+        """
+        numbers = (Courses.get_obstacle_number(obstacle) for obstacle in course.places)
+        return max((number for number in numbers if number is not None), default=0)
+
     def get_course_index(self, course: Layer) -> Optional[int]:
         """
         Get the index of a course in the courses list.
@@ -0,0 +1,25 @@
+from .map_document import MapDocument
+
+
+class DirectorOrder(MapDocument):
+    """
+    A class for generating the equipment order for the director in Excel format.
+
+    The ordered equipment and its amounts are filled in by hand, the generated order gets the event name.
+
+    Attributes:
+        COLUMN_TITLE (int): Column index for the order title.
+        ROW_TITLE (int): Row index for the order title.
+    """
+
+    COLUMN_TITLE = 1
+    ROW_TITLE = 1
+
+    file_name = "ZAMÓWIENIE DLA DYREKTORA"
+    file_path = f"WZORY/{file_name}.xlsx"
+
+    def create(self) -> None:
+        """
+        Write the order title with the event name.
+        """
+        self._write_cell(self.COLUMN_TITLE, self.ROW_TITLE, f"Zamówienie - {self.context.google_map.name}")
@@ -0,0 +1,168 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+from GoogleMyMaps.models import Map
+from configs.utils import resource_path
+from .director_order import DirectorOrder
+from .fleet_request import FleetRequest
+from .map_context import MapContext
+from .obstacle_list import ObstacleList
+from .obstacle_list_cache import ObstacleListCache
+from .template_store import TemplateStore
+from .transport_list import TransportList
+from .volunteer_request import VolunteerRequest
+
+log = logging.getLogger(__name__)
+
+
+def _render_document(document_class, context: MapContext, file_path: str) -> str:
+    """
+    Fill a document from the map context and save it, in a worker process.
+
+    Parameters:
+        document_class: The document class, ObstacleList or a MapDocument subclass.
+        context (MapContext): The computed context of the map.
+        file_path (str): Path of the saved document.
+
+    Returns:
+        str: The path where the document was saved.
+    """
+    start = time.perf_counter()
+    document = document_class.from_context(context)
+    document.create()
+    document.save_to_path(file_path)
+    log.debug("%s rendered in %.3f s", document_class.__name__, time.perf_counter() - start)
+    return file_path
+
+
+class DocumentPack:
+    """
+    Generator of all documents of an event from the WZORY templates.
+
+    The map context is computed once, and the documents are rendered from it concurrently
+    in a process pool, because rendering and saving workbooks with openpyxl is CPU bound.
+    If worker processes can't be started, the documents are rendered one after another.
+
+    Attributes:
+        DOCUMENTS (list): Classes of all generated documents.
+        context (Optional[MapContext]): The computed context, available after create_and_save.
+    """
+
+    DOCUMENTS = [ObstacleList, TransportList, DirectorOrder, FleetRequest, VolunteerRequest]
+
+    def __init__(self, google_map: Map, cache: Optional[ObstacleListCache] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize the document pack for a map.
+
+        Parameters:
+            google_map (Map): The map the documents are generated for.
+            cache (Optional[ObstacleListCache]): Cache of course results from previous generations.
+            max_workers (Optional[int]): Maximal number of worker processes, by default one per document
+                                         up to the number of CPUs. 1 renders the documents without processes.
+        """
+        self.google_map = google_map
+        self.cache = cache
+        self.max_workers = max_workers or min(len(self.DOCUMENTS), os.cpu_count() or 1)
+        self.context: Optional[MapContext] = None
+
+    def get_file_paths(self, directory: str) -> Dict[type, str]:
+        """
+        Get paths of all documents in a directory.
+
+        Parameters:
+            directory (str): The directory the documents are saved to.
+
+        Returns:
+            Dict[type, str]: Paths by document class.
+        """
+        return {document_class: os.path.join(directory, f"{self.google_map.name} - {document_class.file_name}.xlsx")
+                for document_class in self.DOCUMENTS}
+
+    def create_and_save(self, directory: str) -> List[str]:
+        """
+        Compute the map context and save all documents to a directory.
+
+        Parameters:
+            directory (str): The directory the documents are saved to.
+
+        Returns:
+            List[str]: Paths of the saved documents, documents that failed are logged and left out.
+        """
+        start = time.perf_counter()
+        self.context = MapContext.create(self.google_map, self.cache)
+        log.info("Map context computed in %.3f s", time.perf_counter() - start)
+
+        file_paths = self.get_file_paths(directory)
+        if self.max_workers > 1:
+            try:
+                saved = self._render_in_processes(file_paths)
+            except (BrokenProcessPool, OSError) as e:
+                log.warning("Unable to render documents in worker processes, rendering them one by one: %s", e)
+                saved = self._render_sequentially(file_paths)
+        else:
+            saved = self._render_sequentially(file_paths)
+        log.info("%d of %d documents saved in %.3f s", len(saved), len(file_paths), time.perf_counter() - start)
+        return saved
+
+    def _render_in_processes(self, file_paths: Dict[type, str]) -> List[str]:
+        """
+        Render the documents in a process pool.
+
+        Parameters:
+            file_paths (Dict[type, str]): Paths of the documents by document class.
+
+        Returns:
+            List[str]: Paths of the saved documents.
+        """
+        templates = [resource_path(document_class.file_path) for document_class in file_paths]
+        saved = []
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=TemplateStore.preload,
+                                 initargs=tuple(templates)) as pool:
+            futures = {pool.submit(_render_document, document_class, self.context, file_path): document_class
+                       for document_class, file_path in file_paths.items()}
+            for future in as_completed(futures):
+                saved.extend(self._get_result(futures[future], future.result))
+        return saved
+
+    def _render_sequentially(self, file_paths: Dict[type, str]) -> List[str]:
+        """
+        Render the documents one after another in this process.
+
+        Parameters:
+            file_paths (Dict[type, str]): Paths of the documents by document class.
+
+        Returns:
+            List[str]: Paths of the saved documents.
+        """
+        saved = []
+        for document_class, file_path in file_paths.items():
+            saved.extend(self._get_result(document_class,
+                                          lambda: _render_document(document_class, self.context, file_path)))
+        return saved
+
+    @staticmethod
+    def _get_result(document_class, get_path) -> List[str]:
+        """
+        Get the path of a rendered document, logging its failure.
+
+        Parameters:
+            document_class: The document class.
+            get_path: Function returning the path of the saved document, or raising the error of rendering it.
+
+        Returns:
+            List[str]: The path of the saved document, or an empty list if rendering failed.
+        """
+        try:
+            file_path = get_path()
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            log.error("Error generating %s: %s", document_class.file_name, e)
+            return []
+        log.info("Document saved: %s", file_path)
+        return [file_path]
@@ -1,17 +1,19 @@
 import logging
 import os
 import os.path
-import tkinter as tk
 from abc import ABC
-from tkinter import filedialog
-from typing import Tuple, Optional
+from copy import copy
+from io import BytesIO
+from typing import Tuple, Optional, BinaryIO
 
-import openpyxl as xl
 from openpyxl.utils import get_column_letter
 from openpyxl.workbook.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 
-from configs.utils import resource_path
+from configs.utils import resource_path, write_atomically
+from .cell_buffer import CellBuffer
+from .template_store import TemplateStore
+from .xlsx_patch_writer import XlsxPatchWriter
 
 log = logging.getLogger(__name__)
 
@@ -21,8 +23,16 @@ class ExcelFile(ABC):
     Abstract base class for handling Excel files.
     
     Provides functionality for opening, manipulating, and saving Excel workbooks.
+    
+    Attributes:
+        use_patch_writer (bool): Whether to save with the XlsxPatchWriter, which patches the template file
+                                 with the written cells instead of serializing the whole workbook with openpyxl.
+        MAX_COLUMN (int): The last column number of a worksheet.
     """
     
+    use_patch_writer = True
+    MAX_COLUMN = 16384
+
     def __init__(self, file_path: str, worksheet_number: int = 0):
         """
         Initialize an Excel file handler.
@@ -34,12 +44,17 @@ class ExcelFile(ABC):
         self.file_path = resource_path(file_path)
         self.file_name = os.path.basename(file_path)
         self.wb, self.ws = ExcelFile.open_file(self.file_path, worksheet_number)
+        self.cell_buffer = CellBuffer()
+        self.patch_writer = XlsxPatchWriter(self.file_path, worksheet_number)
+        self.template_extended = False
 
     @staticmethod
     def open_file(file_name: str, worksheet_number: int = 0) -> Tuple[Optional[Workbook], Optional[Worksheet]]:
         """
         Open an Excel file and return the workbook and worksheet objects.
         
+        The file is parsed only once per process, following calls get a copy from the TemplateStore.
+        
         Parameters:
             file_name (str): Path to the Excel file to be opened
             worksheet_number (int, optional): Index of the worksheet to be used (0-based). Defaults to 0.
@@ -51,7 +66,7 @@ class ExcelFile(ABC):
         log.info("Opening file: %s", file_name)
         if file_name:
             try:
-                wb = xl.load_workbook(file_name)
+                wb = TemplateStore.get_workbook(file_name)
                 ws = wb.worksheets[worksheet_number] if worksheet_number < len(wb.worksheets) else None
                 log.info("File opened successfully: %s", file_name)
                 return wb, ws
@@ -61,12 +76,15 @@ class ExcelFile(ABC):
         else:
             return None, None
 
-    def save_file(self, new_file_name: str = None) -> Optional[str]:
+    def save_file(self, new_file_name: str = None, parent=None) -> Optional[str]:
         """
-        Save the workbook to a file with a dialog prompt if no filename is provided.
+        Save the workbook to a file chosen in a save dialog.
+        
+        This is the GUI layer on top of save_to_path, tkinter is imported only when the dialog is shown.
         
         Parameters:
-            new_file_name (str, optional): Name for the saved file. If None, a file dialog will be shown.
+            new_file_name (str, optional): Name suggested in the dialog.
+            parent (tk.Misc, optional): Window the dialog belongs to. If None, a hidden root window is created.
             
         Returns:
             Optional[str]: The path where the file was saved, or None if the save operation was cancelled or failed.
@@ -78,42 +96,141 @@ class ExcelFile(ABC):
         if self.wb is None:
             raise ValueError("Workbook is not initialized")
 
-        root = tk.Tk()
-        root.withdraw()
+        new_file_name = ExcelFile.ask_save_path(new_file_name, parent)
+        if new_file_name:
+            try:
+                return self.save_to_path(new_file_name)
+            except Exception as e:
+                log.error("Error saving file %s: %s", new_file_name, e)
+        else:
+            log.warning("File name not provided")
+            return None
+
+    @staticmethod
+    def ask_save_path(new_file_name: str = None, parent=None) -> Optional[str]:
+        """
+        Ask for the path of a saved workbook in a save dialog, on the GUI thread.
+        
+        Parameters:
+            new_file_name (str, optional): Name suggested in the dialog.
+            parent (tk.Misc, optional): Window the dialog belongs to. If None, a hidden root window is created.
+            
+        Returns:
+            Optional[str]: The chosen path, or None if the dialog was cancelled.
+        """
+        import tkinter as tk
+        from tkinter import filedialog
+
+        root = None
+        if parent is None:
+            root = parent = tk.Tk()
+            root.withdraw()
         new_file_name = filedialog.asksaveasfilename(
+            parent=parent,
             initialdir=".",
             initialfile=new_file_name,
             defaultextension=".xlsx",
             filetypes=(("Excel files", "*.xlsx"), ("All files", "*.*"))
         )
-        root.destroy()
+        if root is not None:
+            root.destroy()
+        return new_file_name or None
 
-        if new_file_name:
-            try:
-                self.wb.save(new_file_name)
-                log.info("File saved successfully: %s", new_file_name)
-                return new_file_name
-            except Exception as e:
-                log.error("Error saving file %s: %s", new_file_name, e)
+    def save_to_path(self, file_path: str) -> str:
+        """
+        Save the workbook to a file without any dialog.
+        
+        The workbook is written to a temporary file in the target directory, which then replaces
+        the target file in one step, so an interrupted save never leaves a partially written file.
+        
+        Parameters:
+            file_path (str): Path of the saved file.
+            
+        Returns:
+            str: The path where the file was saved.
+            
+        Raises:
+            ValueError: If the workbook is not initialized.
+            OSError: If the file can't be written.
+        """
+        if self.wb is None:
+            raise ValueError("Workbook is not initialized")
+
+        write_atomically(file_path, self._save_workbook)
+        log.info("File saved successfully: %s", file_path)
+        return file_path
+
+    def save_to_stream(self, stream: BinaryIO) -> None:
+        """
+        Write the workbook to a binary stream, e.g. an open file or a BytesIO.
+        
+        Parameters:
+            stream (BinaryIO): The writable stream, it is left open.
+            
+        Raises:
+            ValueError: If the workbook is not initialized.
+        """
+        if self.wb is None:
+            raise ValueError("Workbook is not initialized")
+        self._save_workbook(stream)
+
+    def to_bytes(self) -> bytes:
+        """
+        Get the content of the xlsx file without writing it to disk.
+        
+        Returns:
+            bytes: The saved workbook.
+            
+        Raises:
+            ValueError: If the workbook is not initialized.
+        """
+        stream = BytesIO()
+        self.save_to_stream(stream)
+        return stream.getvalue()
+
+    def _save_workbook(self, file_name) -> None:
+        """
+        Write the workbook to a file with openpyxl or with the XlsxPatchWriter.
+
+        Buffered cells are flushed to the worksheet or handed to the patch writer first.
+        The patch writer can only fill the template as it is, so extended templates are always saved with openpyxl.
+
+        Parameters:
+            file_name: Path or binary file object the workbook is written to.
+        """
+        if self.use_patch_writer and not self.template_extended:
+            self.patch_writer.cells = self.cell_buffer.cells
+            self.patch_writer.bold_cells = self.cell_buffer.get_styled_cells("bold")
+            self.patch_writer.save(file_name)
         else:
-            log.warning("File name not provided")
-            return None
+            self.flush()
+            self.wb.save(file_name)
+
+    def flush(self) -> None:
+        """
+        Write all buffered cells and styles to the worksheet.
+        """
+        self.cell_buffer.flush(self.ws)
 
     def _write_cell(self, col: int, row: int, value) -> None:
         """
         Write a value to a specific cell in the worksheet.
         
+        The value is kept in the cell buffer and written to the worksheet on flush.
+        
         Parameters:
             col (int): Column number (1-based)
             row (int): Row number (1-based)
             value: The value to write to the cell
         """
-        self.ws[f"{get_column_letter(col)}{row}"] = value
+        self.cell_buffer.write(col, row, value)
 
     def _get_cell_value(self, col: int, row: int) -> str:
         """
         Get the value from a specific cell in the worksheet.
         
+        Buffered values take precedence over the template's values.
+        
         Parameters:
             col (int): Column number (1-based)
             row (int): Row number (1-based)
@@ -121,7 +238,9 @@ class ExcelFile(ABC):
         Returns:
             str: The value of the specified cell
         """
-        return self.ws[f"{get_column_letter(col)}{row}"].value
+        if (col, row) in self.cell_buffer.cells:
+            return self.cell_buffer.cells[(col, row)]
+        return self.ws.cell(row=row, column=col).value
 
     def _group_rows(self, start_row: int, end_row: int, hidden: bool = False) -> None:
         """
@@ -132,7 +251,9 @@ class ExcelFile(ABC):
             end_row (int): Last row to include in the group (1-based)
             hidden (bool, optional): Whether the grouped rows should be hidden. Defaults to False.
         """
-        self.ws.row_dimensions.group(start_row, end_row, hidden=hidden)
+        if start_row <= end_row:
+            self.ws.row_dimensions.group(start_row, end_row, hidden=hidden)
+            self.patch_writer.row_groups.append((start_row, end_row, hidden))
 
     def _group_columns(self, start_col: int, end_col: int, hidden: bool = False) -> None:
         """
@@ -145,6 +266,7 @@ class ExcelFile(ABC):
         """
         if start_col <= end_col:
             self.ws.column_dimensions.group(get_column_letter(start_col), get_column_letter(end_col), hidden=hidden)
+            self.patch_writer.column_groups.append((start_col, end_col, hidden))
 
     def _bold_cell(self, col: int, row: int) -> None:
         """
@@ -154,4 +276,89 @@ class ExcelFile(ABC):
             col (int): Column number (1-based)
             row (int): Row number (1-based)
         """
-        self.ws[f"{get_column_letter(col)}{row}"].font = xl.styles.Font(bold=True, name="Calibri")
+        self.cell_buffer.set_style(col, row, "bold")
+
+    def _extend_rows(self, source_row: int, end_row: int, last_col: int) -> None:
+        """
+        Extend the template with rows formatted like a given row.
+
+        Parameters:
+            source_row (int): The template row whose cell styles and height are copied (1-based)
+            end_row (int): Last row of the extension, rows after source_row up to this row are formatted (1-based)
+            last_col (int): Last column whose cell styles are copied (1-based)
+        """
+        if end_row <= source_row:
+            return
+        self.template_extended = True
+        source_styles = [self.ws.cell(row=source_row, column=col)._style for col in range(1, last_col + 1)]
+        source_height = self.ws.row_dimensions[source_row].height
+        for row in range(source_row + 1, end_row + 1):
+            for col, style in enumerate(source_styles, start=1):
+                self.ws.cell(row=row, column=col)._style = copy(style)
+            self.ws.row_dimensions[row].height = source_height
+
+    def _insert_columns(self, col: int, amount: int) -> None:
+        """
+        Insert empty columns into the template, moving cells, column widths and merged cells on the right.
+
+        Parameters:
+            col (int): Column number before which the columns are inserted (1-based)
+            amount (int): Number of inserted columns
+        """
+        if amount <= 0:
+            return
+        self.template_extended = True
+        # Only existing cells are moved, worksheet.insert_cols would create every cell up to the last styled row
+        moved_cells = sorted((key for key in self.ws._cells if key[1] >= col), key=lambda key: key[1], reverse=True)
+        for row, column in moved_cells:
+            self.ws._move_cell(row, column, 0, amount)
+
+        dimensions = self.ws.column_dimensions
+        moved = [dimensions.pop(letter) for letter, dimension in list(dimensions.items()) if dimension.min >= col]
+        for dimension in moved:
+            new_dimension = copy(dimension)
+            new_dimension.min = dimension.min + amount
+            new_dimension.max = min(dimension.max + amount, self.MAX_COLUMN)
+            new_dimension.index = get_column_letter(new_dimension.min)
+            dimensions[new_dimension.index] = new_dimension
+
+        for merged_range in self.ws.merged_cells.ranges:
+            if merged_range.min_col >= col:
+                merged_range.shift(col_shift=amount)
+
+    def _copy_column(self, source_col: int, target_col: int, last_row: int, last_value_row: int = 0) -> None:
+        """
+        Format a column like another column of the template.
+
+        Parameters:
+            source_col (int): The column whose width and cell styles are copied (1-based)
+            target_col (int): The formatted column (1-based)
+            last_row (int): Last row whose cell styles are copied (1-based)
+            last_value_row (int, optional): Last row whose values are copied too, e.g. headers. Defaults to 0.
+        """
+        self.template_extended = True
+        for row in range(1, last_row + 1):
+            source_cell = self.ws.cell(row=row, column=source_col)
+            target_cell = self.ws.cell(row=row, column=target_col)
+            target_cell._style = copy(source_cell._style)
+            if row <= last_value_row:
+                target_cell.value = source_cell.value
+        source_dimension = self.ws.column_dimensions[get_column_letter(source_col)]
+        target_dimension = self.ws.column_dimensions[get_column_letter(target_col)]
+        target_dimension.width = source_dimension.width
+        target_dimension._style = copy(source_dimension._style)
+
+    def _set_table_area(self, last_col: int, last_row: int, header_row: int) -> None:
+        """
+        Set the auto filter and print area to cover the whole table.
+
+        Parameters:
+            last_col (int): Last column of the table (1-based)
+            last_row (int): Last row of the table (1-based)
+            header_row (int): Row with the filtered column headers (1-based)
+        """
+        last_col_letter = get_column_letter(last_col)
+        if self.ws.auto_filter.ref:
+            self.ws.auto_filter.ref = f"A{header_row}:{last_col_letter}{last_row}"
+        if self.ws.print_area:
+            self.ws.print_area = f"A1:{last_col_letter}{last_row}"
@@ -0,0 +1,13 @@
+from .map_document import MapDocument
+
+
+class FleetRequest(MapDocument):
+    """
+    A class for generating the fleet request in Excel format.
+
+    Vehicles and the days they are needed on aren't part of the map, so the request
+    is a copy of the template named after the event, filled in by hand.
+    """
+
+    file_name = "ZAPOTRZEBOWANIE NA FLOTĘ"
+    file_path = f"WZORY/{file_name}.xlsx"
@@ -0,0 +1,72 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from GoogleMyMaps.models import Map, Layer, Place
+from .courses import Courses
+from .obstacle_list_cache import ObstacleListCache
+from .obstacle_table import ObstacleTable, ObstacleTableBuilder
+
+log = logging.getLogger(__name__)
+
+
+class MapContext:
+    """
+    Everything computed from a map that is shared by all generated documents.
+
+    The obstacle table is computed once: zones, kilometres and obstacles matched between courses,
+    and documents built on the obstacle list only render it. The context holds only picklable values,
+    so it can be sent to the processes rendering the documents.
+
+    Attributes:
+        google_map (Map): The map the documents are generated for.
+        cache (ObstacleListCache): Results of all courses of the obstacle table.
+        table (Optional[ObstacleTable]): The obstacle table computed from the map.
+        not_found_obstacles (List[Tuple[Layer, int, Place]]): Obstacles that couldn't be matched with
+                                                              the main and kids courses.
+        volunteers (Dict[str, int]): Minimal number of volunteers on the obstacles of each course by course name.
+        judges (Dict[str, int]): Number of judges on the obstacles of each course by course name.
+    """
+
+    def __init__(self, google_map: Map, cache: ObstacleListCache):
+        """
+        Initialize an empty context, use create to compute it.
+
+        Parameters:
+            google_map (Map): The map the documents are generated for.
+            cache (ObstacleListCache): Cache for the results of the obstacle list courses.
+        """
+        self.google_map = google_map
+        self.cache = cache
+        self.table: Optional[ObstacleTable] = None
+        self.not_found_obstacles: List[Tuple[Layer, int, Place]] = []
+        self.volunteers: Dict[str, int] = {}
+        self.judges: Dict[str, int] = {}
+
+    @staticmethod
+    def create(google_map: Map, cache: Optional[ObstacleListCache] = None) -> "MapContext":
+        """
+        Compute the context of a map.
+
+        Parameters:
+            google_map (Map): The map the documents are generated for.
+            cache (Optional[ObstacleListCache]): Cache of course results from previous generations.
+                                                 If given, only courses whose layers changed are recomputed.
+
+        Returns:
+            MapContext: The computed context.
+        """
+        context = MapContext(google_map, cache if cache is not None else ObstacleListCache())
+        context.table = ObstacleTableBuilder(google_map, context.cache).build()
+        context.not_found_obstacles = context.table.get_not_found_obstacles(Courses(google_map))
+        context._count_people()
+        return context
+
+    def _count_people(self) -> None:
+        """
+        Sum volunteers and judges of the obstacles of each course from the computed obstacle table.
+        """
+        for course_index, course_name in enumerate(self.table.course_names):
+            volunteers, judges = self.table.get_people(course_index)
+            self.volunteers[course_name] = volunteers
+            self.judges[course_name] = judges
+            log.debug("Course %s needs %d volunteers and %d judges", course_name, volunteers, judges)
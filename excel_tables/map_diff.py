@@ -0,0 +1,249 @@
+import json
+import logging
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+
+from openpyxl import Workbook
+from openpyxl.styles import Font
+
+from GoogleMyMaps.models import Map, Layer, Place
+from configs.utils import unify_string
+from .course_trail import CourseTrail
+from .courses import Courses
+
+log = logging.getLogger(__name__)
+
+
+class PlaceChange:
+    """
+    A single change of a place between two versions of a map.
+
+    Attributes:
+        change_type (str): One of the MapDiff change types.
+        layer_name (str): Name of the layer containing the place.
+        old_place (Optional[Place]): The place in the old map, or None if it was added.
+        new_place (Optional[Place]): The place in the new map, or None if it was removed.
+        distance (Optional[float]): Distance in meters the place has moved, for moved points.
+    """
+
+    def __init__(self, change_type: str, layer_name: str, old_place: Optional[Place], new_place: Optional[Place],
+                 distance: Optional[float] = None):
+        self.change_type = change_type
+        self.layer_name = layer_name
+        self.old_place = old_place
+        self.new_place = new_place
+        self.distance = distance
+
+    def to_dict(self) -> dict:
+        """
+        Convert the change to a dictionary of plain values.
+
+        Returns:
+            dict: The change with the layer, names and numbers of both place versions and the moved distance.
+        """
+        return {
+            "change": self.change_type,
+            "layer": self.layer_name,
+            "old_name": self.old_place.name if self.old_place else None,
+            "new_name": self.new_place.name if self.new_place else None,
+            "old_number": Courses.get_obstacle_number(self.old_place) if self.old_place else None,
+            "new_number": Courses.get_obstacle_number(self.new_place) if self.new_place else None,
+            "distance": round(self.distance, 1) if self.distance is not None else None,
+        }
+
+
+class MapDiff:
+    """
+    Differences between two versions of a Google Map.
+
+    Layers are matched by name. Places of a layer are matched with a hash join, first by their
+    unified name and type, and the remaining points by their obstacle number, so the whole
+    comparison is linear in the number of places.
+
+    Attributes:
+        ADDED, REMOVED, RENAMED, MOVED, RENUMBERED, RESHAPED (str): Types of changes.
+        MOVE_THRESHOLD (float): Default minimal distance in meters for a point to be reported as moved.
+        changes (List[PlaceChange]): All found changes in order of layers and places.
+    """
+
+    ADDED = "added"
+    REMOVED = "removed"
+    RENAMED = "renamed"
+    MOVED = "moved"
+    RENUMBERED = "renumbered"
+    RESHAPED = "reshaped"
+
+    MOVE_THRESHOLD = 5.0
+
+    def __init__(self, old_map: Map, new_map: Map, move_threshold: float = MOVE_THRESHOLD):
+        """
+        Compare two versions of a map.
+
+        Parameters:
+            old_map (Map): The previous version of the map, e.g. restored with Map.from_dict from a snapshot.
+            new_map (Map): The current version of the map.
+            move_threshold (float, optional): Minimal distance in meters for a point to be reported as moved.
+        """
+        self.move_threshold = move_threshold
+        self.changes: List[PlaceChange] = []
+
+        old_layers = {layer.name: layer for layer in old_map.layers}
+        for new_layer in new_map.layers:
+            old_layer = old_layers.pop(new_layer.name, Layer(new_layer.name, []))
+            self._compare_layers(old_layer, new_layer)
+        for old_layer in old_layers.values():
+            self._compare_layers(old_layer, Layer(old_layer.name, []))
+
+    @staticmethod
+    def _get_place_key(place: Place) -> Tuple[str, str]:
+        """
+        Get the key places are matched by in the first pass.
+
+        Parameters:
+            place (Place): The place to get the key for.
+
+        Returns:
+            Tuple[str, str]: Type and unified name of the place.
+        """
+        return place.place_type, unify_string(place.name)
+
+    def _compare_layers(self, old_layer: Layer, new_layer: Layer) -> None:
+        """
+        Find changes between two versions of a layer.
+
+        Parameters:
+            old_layer (Layer): The previous version of the layer.
+            new_layer (Layer): The current version of the layer.
+        """
+        old_places: Dict[Tuple[str, str], deque] = defaultdict(deque)
+        for place in old_layer.places:
+            old_places[MapDiff._get_place_key(place)].append(place)
+
+        unmatched_new = []
+        for new_place in new_layer.places:
+            candidates = old_places.get(MapDiff._get_place_key(new_place))
+            if candidates:
+                self._compare_places(new_layer.name, candidates.popleft(), new_place)
+            else:
+                unmatched_new.append(new_place)
+
+        old_by_number: Dict[int, deque] = defaultdict(deque)
+        unmatched_old = []
+        for candidates in old_places.values():
+            for old_place in candidates:
+                number = Courses.get_obstacle_number(old_place)
+                if number is None:
+                    unmatched_old.append(old_place)
+                else:
+                    old_by_number[number].append(old_place)
+
+        for new_place in unmatched_new:
+            candidates = old_by_number.get(Courses.get_obstacle_number(new_place))
+            if candidates:
+                old_place = candidates.popleft()
+                self.changes.append(PlaceChange(self.RENAMED, new_layer.name, old_place, new_place))
+                self._compare_places(new_layer.name, old_place, new_place)
+            else:
+                self.changes.append(PlaceChange(self.ADDED, new_layer.name, None, new_place))
+
+        for candidates in old_by_number.values():
+            unmatched_old.extend(candidates)
+        for old_place in unmatched_old:
+            self.changes.append(PlaceChange(self.REMOVED, old_layer.name, old_place, None))
+
+    def _compare_places(self, layer_name: str, old_place: Place, new_place: Place) -> None:
+        """
+        Find changes between two matched versions of a place.
+
+        Parameters:
+            layer_name (str): Name of the layer containing the place.
+            old_place (Place): The previous version of the place.
+            new_place (Place): The current version of the place.
+        """
+        if Courses.get_obstacle_number(old_place) != Courses.get_obstacle_number(new_place):
+            self.changes.append(PlaceChange(self.RENUMBERED, layer_name, old_place, new_place))
+
+        if old_place.coords == new_place.coords:
+            return
+        if new_place.place_type == "Point" and old_place.coords and new_place.coords:
+            distance = CourseTrail._haversine_distance(old_place.coords[0], old_place.coords[1],
+                                                       new_place.coords[0], new_place.coords[1])
+            if distance >= self.move_threshold:
+                self.changes.append(PlaceChange(self.MOVED, layer_name, old_place, new_place, distance))
+        elif new_place.place_type != "Point":
+            self.changes.append(PlaceChange(self.RESHAPED, layer_name, old_place, new_place))
+
+    @staticmethod
+    def save_snapshot(google_map: Map, file_path: str) -> None:
+        """
+        Save a map as a JSON snapshot, so it can be compared with later versions of the map.
+
+        Parameters:
+            google_map (Map): The map to save.
+            file_path (str): Path of the snapshot file.
+        """
+        with open(file_path, "w", encoding="utf-8") as snapshot_file:
+            json.dump(google_map.to_dict(), snapshot_file, ensure_ascii=False)
+        log.info("Map snapshot saved: %s", file_path)
+
+    @staticmethod
+    def load_snapshot(file_path: str) -> Map:
+        """
+        Load a map from a JSON snapshot.
+
+        Parameters:
+            file_path (str): Path of the snapshot file saved with save_snapshot.
+
+        Returns:
+            Map: The restored map.
+        """
+        with open(file_path, encoding="utf-8") as snapshot_file:
+            return Map.from_dict(json.load(snapshot_file))
+
+    def get_changes(self, change_type: str) -> List[PlaceChange]:
+        """
+        Get all changes of a given type.
+
+        Parameters:
+            change_type (str): One of the change types, e.g. MapDiff.MOVED.
+
+        Returns:
+            List[PlaceChange]: Changes of the given type.
+        """
+        return [change for change in self.changes if change.change_type == change_type]
+
+    def to_json(self) -> str:
+        """
+        Export the changes as JSON.
+
+        Returns:
+            str: JSON array of changes in the PlaceChange.to_dict format.
+        """
+        return json.dumps([change.to_dict() for change in self.changes], ensure_ascii=False, indent=2)
+
+    def to_workbook(self) -> Workbook:
+        """
+        Export the changes as a workbook with a single sheet.
+
+        Returns:
+            Workbook: The workbook with one row per change.
+        """
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "ZMIANY"
+        ws.append(["ZMIANA", "WARSTWA", "STARA NAZWA", "NOWA NAZWA", "STARY NR", "NOWY NR", "PRZESUNIĘCIE [m]"])
+        for cell in ws[1]:
+            cell.font = Font(bold=True, name="Calibri")
+        for change in self.changes:
+            ws.append(list(change.to_dict().values()))
+        return wb
+
+    def log(self) -> None:
+        """
+        Log a summary of the changes.
+        """
+        if not self.changes:
+            log.info("No changes in the map")
+            return
+        for change in self.changes:
+            log.info("Map change: %s", change.to_dict())
@@ -0,0 +1,55 @@
+from .excel_file import ExcelFile
+
+
+class MapDocument(ExcelFile):
+    """
+    Base class for documents generated from a computed map context.
+
+    Subclasses set the template and override create to fill it, documents filled only by hand
+    are saved as a copy of the template named after the map.
+
+    Attributes:
+        file_name (str): Base name of the Excel file.
+        file_path (str): Path to the template Excel file.
+        context (MapContext): The computed context of the map.
+    """
+
+    file_name: str
+    file_path: str
+
+    def __init__(self, context):
+        """
+        Initialize the document with a computed map context.
+
+        Parameters:
+            context (MapContext): The computed context of the map.
+        """
+        super().__init__(self.file_path)
+        self.context = context
+
+    @classmethod
+    def from_context(cls, context) -> "MapDocument":
+        """
+        Create the document from a computed map context.
+
+        Parameters:
+            context (MapContext): The computed context of the map.
+
+        Returns:
+            MapDocument: The document, filled by create.
+        """
+        return cls(context)
+
+    def create(self) -> None:
+        """
+        Write all data to the workbook without saving it.
+        """
+
+    def get_default_file_name(self) -> str:
+        """
+        Get the name of the document file for the map.
+
+        Returns:
+            str: The file name with the map name.
+        """
+        return f"{self.context.google_map.name} - {self.file_name}"
@@ -0,0 +1,135 @@
+import logging
+from typing import List, Tuple
+
+from GoogleMyMaps.models import Map, Layer
+from configs.utils import unify_string
+from .courses import Courses
+
+log = logging.getLogger(__name__)
+
+
+class MapValidationReport:
+    """
+    Result of the map validation.
+
+    Errors make generating the obstacle list impossible, warnings only make it incomplete.
+
+    Attributes:
+        errors (List[Tuple[str, str]]): Errors as tuples of (layer name, message).
+        warnings (List[Tuple[str, str]]): Warnings as tuples of (layer name, message).
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty report.
+        """
+        self.errors: List[Tuple[str, str]] = []
+        self.warnings: List[Tuple[str, str]] = []
+
+    @property
+    def is_valid(self) -> bool:
+        """
+        Check whether the map can be used to generate the obstacle list.
+
+        Returns:
+            bool: True if the report contains no errors, False otherwise.
+        """
+        return not self.errors
+
+    def add_error(self, layer_name: str, message: str) -> None:
+        """
+        Add an error to the report.
+
+        Parameters:
+            layer_name (str): Name of the layer the error concerns, or the map name.
+            message (str): Description of the error.
+        """
+        self.errors.append((layer_name, message))
+
+    def add_warning(self, layer_name: str, message: str) -> None:
+        """
+        Add a warning to the report.
+
+        Parameters:
+            layer_name (str): Name of the layer the warning concerns, or the map name.
+            message (str): Description of the warning.
+        """
+        self.warnings.append((layer_name, message))
+
+    def log(self) -> None:
+        """
+        Log all errors and warnings of the report.
+        """
+        for layer_name, message in self.errors:
+            log.error("%s: %s", layer_name, message)
+        for layer_name, message in self.warnings:
+            log.warning("%s: %s", layer_name, message)
+
+    def __str__(self):
+        return '\n'.join(f"{layer_name}: {message}" for layer_name, message in self.errors + self.warnings)
+
+
+class MapValidator:
+    """
+    Validation of a Google Map before generating the obstacle list.
+
+    All checks are done in a single walk over the map's layers and places, without any
+    geometry calculations or loading of the Excel template, so problems can be reported
+    before the heavy processing starts.
+    """
+
+    @staticmethod
+    def validate(google_map: Map) -> MapValidationReport:
+        """
+        Validate a Google Map.
+
+        Checks that the map contains the "STREFY" layer and course layers, that every course has
+        a trail line, and that every point of a course has a unique number.
+
+        Parameters:
+            google_map (Map): The Google Map object to validate.
+
+        Returns:
+            MapValidationReport: The report with all found errors and warnings.
+        """
+        report = MapValidationReport()
+        courses = Courses(google_map)
+
+        if not any("STREFY" in layer.name.upper() for layer in google_map.layers):
+            report.add_warning(google_map.name, 'Missing "STREFY" layer, obstacle zones will be empty')
+
+        if not courses.courses_list:
+            report.add_error(google_map.name, 'No course layers, course names must start with "TRASA"')
+            return report
+
+        for course in courses.courses_list:
+            MapValidator._validate_course(course, report)
+        return report
+
+    @staticmethod
+    def _validate_course(course: Layer, report: MapValidationReport) -> None:
+        """
+        Validate places of a single course layer.
+
+        Parameters:
+            course (Layer): The course layer to validate.
+            report (MapValidationReport): The report to add found problems to.
+        """
+        course_name = unify_string(course.name)
+        has_trail = False
+        numbers = set()
+        for place in course.places:
+            if place.place_type == "Line":
+                place_name = unify_string(place.name)
+                has_trail = has_trail or place_name in course_name
+            elif place.place_type == "Point":
+                number = Courses.get_obstacle_number(place)
+                if number is None:
+                    report.add_warning(course.name, f'Obstacle "{place.name}" has no number')
+                    continue
+                if number in numbers:
+                    report.add_warning(course.name, f'Obstacle number {number} ("{place.name}") is duplicated')
+                numbers.add(number)
+
+        if not has_trail:
+            report.add_warning(course.name, "No trail line named like the course, distances will be empty")
@@ -4,11 +4,14 @@ from typing import Optional, Tuple, List
 from openpyxl.utils import get_column_letter
 
 from GoogleMyMaps.models import *
-from configs.utils import unify_string
-from .areas import Areas
-from .course_trail import CourseTrail
 from .courses import Courses
 from .excel_file import ExcelFile
+from .map_preview import MapPreview
+from .obstacle_list_cache import ObstacleListCache
+from .obstacle_suggestions import ObstacleSuggestions
+from .obstacle_table import ObstacleTable, ObstacleTableBuilder
+from .photo_cache import PhotoCache
+from .photo_sheet import PhotoSheet
 
 log = logging.getLogger(__name__)
 
@@ -19,33 +22,46 @@ class ObstacleList(ExcelFile):
     
     This class handles the creation of an Excel file containing information about obstacles
     across different courses, including their positions, areas, distances, and required personnel.
+    The obstacles are computed by the ObstacleTableBuilder, the obstacle list only writes the ObstacleTable
+    into the template.
     
     Attributes:
-        IMPORTANT_OBSTACLE_NAMES (List[str]): Names of obstacles that should be highlighted in the output.
-        COLUMN_LAST_COURSE (int): Column index for the last course.
-        COLUMN_NAME (int): Column index for obstacle names.
-        COLUMN_WOLO (int): Column index for volunteer information.
-        COLUMN_JUDGE (int): Column index for judge information.
-        COLUMN_INFO (int): Column index for additional obstacle information.
+        COLUMN_LAST_COURSE (int): Column index for the last course in the template.
+        COLUMN_NAME (int): Column index for obstacle names in the template.
+        COLUMN_WOLO (int): Column index for volunteer information in the template.
+        COLUMN_JUDGE (int): Column index for judge information in the template.
+        COLUMN_INFO (int): Column index for additional obstacle information in the template.
+        COLUMN_LAST (int): Column index for the last column of the table in the template.
         ROW_HEADERS (int): Row index for headers.
         ROW_OBSTACLES_OFFSET (int): Offset for obstacle rows.
-        ROW_MAX (int): Maximum row index.
+        ROW_MAX (int): Last formatted row index in the template.
+        row_max (int): Last row of the table, extended to fit all obstacles of the map.
+        column_last_course (int): Column index for the last course, extended to fit all courses of the map.
+        column_name (int): Column index for obstacle names after inserting the extra course columns.
+        column_wolo (int): Column index for volunteer information after inserting the extra course columns.
+        column_judge (int): Column index for judge information after inserting the extra course columns.
+        column_info (int): Column index for additional obstacle information after inserting the extra course columns.
+        column_last (int): Column index for the last column of the table after inserting the extra course columns.
         file_name (str): Base name of the Excel file.
         file_path (str): Path to the template Excel file.
         not_found_obstacles (List[Tuple[Layer, int, Place]]): List to store obstacles that couldn't be found.
+        table (Optional[ObstacleTable]): The computed obstacle table, available after create.
+        photo_cache (Optional[PhotoCache]): If set, a sheet with thumbnails of the obstacle photos from this cache
+                                            is added by create.
+        preview_png (Optional[bytes]): If set, a sheet with this PNG preview of the map is added by create.
     """
 
-    IMPORTANT_OBSTACLE_NAMES = ["START", "META", "START KIDS", "META KIDS"]
     COLUMN_LAST_COURSE = 18
     COLUMN_NAME = 19
     COLUMN_WOLO = 20
     COLUMN_JUDGE = 21
     # COLUMN_WORKER = 22
     COLUMN_INFO = 24
+    COLUMN_LAST = 24
     ROW_HEADERS = 1
     ROW_OBSTACLES_OFFSET = 2
     ROW_MAX = 200
-    ROW_KIDS_SPACING = 1
+    ROW_KIDS_SPACING = ObstacleTableBuilder.KIDS_SPACING
 
     file_name = "LISTA PRZESZKÓD"
     file_path = f"WZORY/{file_name}.xlsx"
@@ -53,265 +69,141 @@ class ObstacleList(ExcelFile):
     # List to store obstacles that couldn't be found
     not_found_obstacles: List[Tuple[Layer, int, Place]] = []
 
-    def __init__(self, google_map: Map):
+    def __init__(self, google_map: Map, cache: Optional[ObstacleListCache] = None,
+                 table: Optional[ObstacleTable] = None):
         """
         Initialize the ObstacleList with a Google Map.
         
         Parameters:
             google_map (Map): The Google Map object containing course and obstacle data.
+            cache (Optional[ObstacleListCache]): Cache of course results from previous generations.
+                                                 If given, only courses whose layers changed are recomputed.
+            table (Optional[ObstacleTable]): The obstacle table already computed from the map.
+                                             If None, it is computed by create.
         """
         super().__init__(self.file_path)
         self.google_map = google_map
         self.courses = Courses(google_map)
-        self.areas = Areas(google_map)
+        self.cache = cache
+        self.table = table
+        self.photo_cache: Optional[PhotoCache] = None
+        self.preview_png: Optional[bytes] = None
+        self.not_found_obstacles = []
+        self._obstacle_suggestions: Optional[ObstacleSuggestions] = None
+        self._data_written = False
+
+        self.row_max = max(self.ROW_MAX, self._get_rows_needed())
+        extra_columns = max(0, len(self.courses.courses_list) * 3 - self.COLUMN_LAST_COURSE)
+        self.column_last_course = self.COLUMN_LAST_COURSE + extra_columns
+        self.column_name = self.COLUMN_NAME + extra_columns
+        self.column_wolo = self.COLUMN_WOLO + extra_columns
+        self.column_judge = self.COLUMN_JUDGE + extra_columns
+        self.column_info = self.COLUMN_INFO + extra_columns
+        self.column_last = self.COLUMN_LAST + extra_columns
+        if self.ws is not None:
+            self._extend_template(extra_columns)
+
+    @classmethod
+    def from_context(cls, context) -> "ObstacleList":
+        """
+        Create the obstacle list from a computed map context, rendering its obstacle table.
 
-    def _write_headlines(self):
-        """
-        Write course headlines to the Excel file.
-        
-        Writes the shortened course names as column headers in the Excel file.
-        """
-        for course in self.courses.courses_list:
-            self._write_cell(self._get_course_column_number(course), self.ROW_HEADERS, course.name[6:])
-
-    def _get_course_column_number(self, course: Layer) -> int:
-        """
-        Calculate the column number for a given course.
-        
-        Parameters:
-            course (Layer): The course layer to calculate the column number for.
-            
-        Returns:
-            int: The column number where the course data should be written.
-        """
-        return self.courses.get_course_index(course) * 3 + 1
-
-    def _write_obstacle_number_area_km(self, course_column: int, obstacle_row: int, obstacle_number: int,
-                                       obstacle_area: int, obstacle_distance: Optional[float]) -> None:
-        """
-        Write obstacle number, area, and distance information to the Excel file.
-        
-        Parameters:
-            course_column (int): The starting column number for the course.
-            obstacle_row (int): The row number for the obstacle.
-            obstacle_number (int): The obstacle's number.
-            obstacle_area (int): The area number where the obstacle is located.
-            obstacle_distance (Optional[float]): The distance to the obstacle in meters, or None if unknown.
-        """
-        if obstacle_distance is not None:
-            obstacle_distance = round(obstacle_distance / 1000, 1)
-        self._write_cell(course_column, obstacle_row, obstacle_number)
-        self._write_cell(course_column + 1, obstacle_row, obstacle_area)
-        self._write_cell(course_column + 2, obstacle_row, obstacle_distance)
-
-    def _write_obstacle_name_data(self, obstacle: Place, obstacle_row: int):
-        """
-        Write obstacle name and associated data to the Excel file.
-        
         Parameters:
-            obstacle (Place): The obstacle place object containing name and data.
-            obstacle_row (int): The row number for the obstacle.
-        """
-        self._write_cell(self.COLUMN_NAME, obstacle_row, obstacle.name)
-        if obstacle.name.upper() in self.IMPORTANT_OBSTACLE_NAMES:
-            self._bold_cell(self.COLUMN_NAME, obstacle_row)
-
-        # self.ws["V" + str(cell_line)] = # Responsible person
-
-        data = self._get_obstacle_data(obstacle)
-        if data is None:
-            return
+            context (MapContext): The computed context of the map.
 
-        wolo, judge, description = data
-        self._write_cell(self.COLUMN_WOLO, obstacle_row, wolo if wolo > 0 else None)
-        self._write_cell(self.COLUMN_JUDGE, obstacle_row, judge if judge > 0 else None)
-        self._write_cell(self.COLUMN_INFO, obstacle_row, description)
-
-    def _get_obstacle_data(self, obstacle: Place) -> Optional[Tuple[int, int, str]]:
-        """
-        Extract volunteer, judge, and description data from an obstacle.
-        
-        Parameters:
-            obstacle (Place): The obstacle place object to extract data from.
-            
         Returns:
-            Optional[Tuple[int, int, str]]: A tuple containing (volunteer count, judge count, description),
-                                           or None if the obstacle has no data.
+            ObstacleList: The obstacle list, filled by create.
         """
-        if obstacle.data is None:
-            return None
-        normalized_data = {key[0].upper(): value for key, value in obstacle.data.items()}
-
-        wolo = self._get_person_number(normalized_data, "W")  # WOLO
-        judge = self._get_person_number(normalized_data, "S")  # SĘDZIA
-        description = normalized_data.get("O", "")  # OPIS
-        return wolo, judge, description
+        return cls(context.google_map, table=context.table)
 
-    @staticmethod
-    def _get_person_number(data: dict, data_key: str) -> int:
+    def _get_rows_needed(self) -> int:
         """
-        Extract and convert a person count from obstacle data.
-        
-        Parameters:
-            data (dict): The normalized obstacle data dictionary.
-            data_key (str): The key to look up in the data dictionary.
-            
+        Calculate the last row needed for the obstacles of the main and kids courses.
+
         Returns:
-            int: The number of persons, or 0 if not found or invalid.
+            int: The last row any obstacle can be written to.
         """
-        try:
-            return int(data.get(data_key, 0))
-        except ValueError:
-            # TODO: info?
-            log.warning("Invalid data type for %s: %s", data_key, type(data.get(data_key, 0)))
+        if not self.courses.courses_list:
             return 0
+        main_course, kids_course = self.courses.courses_list[0], self.courses.courses_list[-1]
+        rows_needed = self.courses.get_max_obstacle_number(main_course) + self.ROW_OBSTACLES_OFFSET
+        if "KIDS" in kids_course.name.upper():
+            kids_row_offset = self.courses.get_course_obstacles_number(
+                main_course) + self.ROW_OBSTACLES_OFFSET + self.ROW_KIDS_SPACING
+            rows_needed = max(rows_needed, self.courses.get_max_obstacle_number(kids_course) + kids_row_offset)
+        return rows_needed
 
-    def _write_course_info(self, course: Layer):
-        """
-        Write all obstacle information for a specific course.
-        
-        Parameters:
-            course (Layer): The course layer containing obstacles to write.
+    def _extend_template(self, extra_columns: int) -> None:
         """
-        row_offset = self.courses.get_course_obstacles_number(self.courses.courses_list[
-                                                                  0]) + self.ROW_OBSTACLES_OFFSET + self.ROW_KIDS_SPACING if "KIDS" in course.name.upper() else self.ROW_OBSTACLES_OFFSET
-
-        for obstacle in course.places:
-            if obstacle.place_type != "Point":
-                continue
+        Extend the template table when the map has more courses or obstacles than the template fits.
 
-            self._write_single_obstacle_info(course, obstacle, row_offset)
+        New course columns are inserted before the obstacle name column and formatted like the last course
+        of the template, new rows are formatted like the last row of the template.
 
-    def _write_single_obstacle_info(self, course: Layer, obstacle: Place, row_offset: int):
-        """
-        Write information for a single obstacle in a course.
-        
         Parameters:
-            course (Layer): The course layer the obstacle belongs to.
-            obstacle (Place): The obstacle place object to write information for.
-            row_offset (int): The row offset to apply when calculating the obstacle's row.
+            extra_columns (int): Number of course columns to add.
         """
-        course_column = self._get_course_column_number(course)
-        obstacle_number = self.courses.get_obstacle_number(obstacle)
-        if obstacle_number is None:
-            log.warning("Obstacle without number: %s, %s", obstacle.name, obstacle.icon)
+        if extra_columns == 0 and self.row_max == self.ROW_MAX:
             return
-        obstacle_row = obstacle_number + row_offset
-        obstacle_area_number = self.areas.get_obstacle_area_number(obstacle)
-        obstacle_distance = CourseTrail(course).get_obstacle_distance(obstacle)
-        self._write_obstacle_number_area_km(course_column, obstacle_row, obstacle_number, obstacle_area_number,
-                                            obstacle_distance)
-        self._write_obstacle_name_data(obstacle, obstacle_row)
-
-    def _write_obstacles_numbers(self, course: Layer):
+        log.info("Extending the template to %d courses and %d rows", len(self.courses.courses_list), self.row_max)
+
+        self._insert_columns(self.COLUMN_NAME, extra_columns)
+        for col in range(self.COLUMN_NAME, self.column_name):
+            source_col = self.COLUMN_LAST_COURSE - 2 + (col - self.COLUMN_NAME) % 3
+            self._copy_column(source_col, col, self.ROW_MAX, self.ROW_HEADERS + 1)
+        for col in range(self.COLUMN_NAME, self.column_name, 3):
+            self.ws.merge_cells(start_row=self.ROW_HEADERS, start_column=col,
+                                end_row=self.ROW_HEADERS, end_column=col + 2)
+
+        self._extend_rows(self.ROW_MAX, self.row_max, self.column_last)
+        self._set_table_area(self.column_last, self.row_max, self.ROW_HEADERS + 1)
+
+    def _write_headlines(self):
         """
-        Write obstacle numbers for a course by matching obstacles with the main courses.
+        Write course headlines to the Excel file.
         
-        Parameters:
-            course (Layer): The course layer to process obstacles for.
+        Writes the shortened course names as column headers in the Excel file.
         """
-        obstacle_row_offset = self.ROW_OBSTACLES_OFFSET
-        kids_obstacle_row_offset = self.courses.get_course_obstacles_number(
-            self.courses.courses_list[0]) + self.ROW_OBSTACLES_OFFSET + self.ROW_KIDS_SPACING
-
-        last_found_obstacle_index = -1
-        for analysed_obstacle in course.places:
-            if analysed_obstacle.place_type != "Point":
-                continue
-
-            last_found_obstacle_index = self._process_obstacle(
-                course,
-                analysed_obstacle,
-                obstacle_row_offset,
-                kids_obstacle_row_offset,
-                last_found_obstacle_index
-            )
+        for course in self.courses.courses_list:
+            self._write_cell(self._get_course_column_number(course), self.ROW_HEADERS, course.name[6:])
 
-    def _process_obstacle(
-            self,
-            course: Layer,
-            analysed_obstacle: Place,
-            obstacle_row_offset: int,
-            kids_obstacle_row_offset: int,
-            last_found_obstacle_index: int
-    ) -> int:
+    def _get_course_column_number(self, course: Layer) -> int:
         """
-        Process an obstacle by trying to find a matching obstacle in the main courses.
+        Calculate the column number for a given course.
         
         Parameters:
-            course (Layer): The course layer the obstacle belongs to.
-            analysed_obstacle (Place): The obstacle place object to process.
-            obstacle_row_offset (int): The row offset for the main course.
-            kids_obstacle_row_offset (int): The row offset for the kids course.
-            last_found_obstacle_index (int): The index of the last found obstacle.
+            course (Layer): The course layer to calculate the column number for.
             
         Returns:
-            int: The updated index of the last found obstacle.
+            int: The column number where the course data should be written.
         """
-        found_obstacle_index = self._find_and_write_obstacle(
-            analysed_obstacle,
-            self.courses.courses_list[0].places[last_found_obstacle_index + 1:],
-            course,
-            obstacle_row_offset,
-        )
-        if found_obstacle_index is not None:
-            return last_found_obstacle_index + found_obstacle_index + 1
-
-        found_obstacle_index = self._find_and_write_obstacle(
-            analysed_obstacle,
-            self.courses.courses_list[0].places[last_found_obstacle_index + 1::-1],
-            course,
-            obstacle_row_offset,
-        )
-        if found_obstacle_index is not None:
-            return last_found_obstacle_index + found_obstacle_index + 1
-
-        found_obstacle_index = self._find_and_write_obstacle(
-            analysed_obstacle,
-            self.courses.courses_list[-1].places,
-            course,
-            kids_obstacle_row_offset,
-        )
-        if found_obstacle_index is None:
-            log.warning("-Unable to find obstacle: %s from course: %s", analysed_obstacle.name, course.name)
-            # Add to list with course name
-            self.add_to_list(analysed_obstacle, course)
-
-        return last_found_obstacle_index
+        return self.courses.get_course_index(course) * 3 + 1
 
-    def _find_and_write_obstacle(self, analysed_obstacle: Place, obstacles, course: Layer, row_offset: int) -> \
-            Optional[int]:
+    def _write_table(self) -> None:
         """
-        Find a matching obstacle in a list and write its information.
-        
-        Parameters:
-            analysed_obstacle (Place): The obstacle place object to find a match for.
-            obstacles: The list of obstacles to search in.
-            course (Layer): The course layer the analysed obstacle belongs to.
-            row_offset (int): The row offset to apply when calculating the obstacle's row.
-            
-        Returns:
-            Optional[int]: The index of the found obstacle, or None if not found.
+        Write the rows of the obstacle table below the headers.
         """
-        for obstacle in obstacles:
-            if unify_string(analysed_obstacle.name) == unify_string(obstacle.name):
-                obstacle_number = self.courses.get_obstacle_number(obstacle)
-                if obstacle_number is None:
-                    log.warning("Obstacle without number: %s, %s", obstacle.name, obstacle.icon)
-                    return
-                obstacle_row = obstacle_number + row_offset
-                course_column = self._get_course_column_number(course)
-                if self._get_cell_value(course_column, obstacle_row) is not None:
+        for obstacle_row in self.table.rows:
+            row = obstacle_row.row + self.ROW_OBSTACLES_OFFSET
+            for course_index, entry in enumerate(obstacle_row.courses):
+                if entry is None:
                     continue
-
-                analysed_obstacle_number = self.courses.get_obstacle_number(analysed_obstacle)
-                obstacle_area_number = self.areas.get_obstacle_area_number(obstacle)
-                obstacle_distance = CourseTrail(course).get_obstacle_distance(obstacle)
-                self._write_obstacle_number_area_km(course_column, obstacle_row, analysed_obstacle_number,
-                                                    obstacle_area_number, obstacle_distance)
-
-                return obstacles.index(obstacle)
-        return None
+                course_column = course_index * 3 + 1
+                self._write_cell(course_column, row, entry.number)
+                self._write_cell(course_column + 1, row, entry.zone)
+                self._write_cell(course_column + 2, row, entry.km)
+
+            if obstacle_row.name is not None:
+                self._write_cell(self.column_name, row, obstacle_row.name)
+            if obstacle_row.important:
+                self._bold_cell(self.column_name, row)
+            # self.ws["V" + str(cell_line)] = # Responsible person
+            if obstacle_row.wolo is not None:
+                self._write_cell(self.column_wolo, row, obstacle_row.wolo)
+            if obstacle_row.judge is not None:
+                self._write_cell(self.column_judge, row, obstacle_row.judge)
+            if obstacle_row.description is not None:
+                self._write_cell(self.column_info, row, obstacle_row.description)
 
     def _sum_and_write_number_of_volunteers_and_judges(self):
         """
@@ -320,14 +212,14 @@ class ObstacleList(ExcelFile):
         Adds formulas to sum the volunteer and judge columns in the Excel file.
         """
         self._write_cell(
-            self.COLUMN_WOLO,
-            self.ROW_MAX + 1,
-            f"=SUM({get_column_letter(self.COLUMN_WOLO)}{self.ROW_OBSTACLES_OFFSET + 1}:{get_column_letter(self.COLUMN_WOLO)}{self.ROW_MAX})"
+            self.column_wolo,
+            self.row_max + 1,
+            f"=SUM({get_column_letter(self.column_wolo)}{self.ROW_OBSTACLES_OFFSET + 1}:{get_column_letter(self.column_wolo)}{self.row_max})"
         )
         self._write_cell(
-            self.COLUMN_JUDGE,
-            self.ROW_MAX + 1,
-            f"=SUM({get_column_letter(self.COLUMN_JUDGE)}{self.ROW_OBSTACLES_OFFSET + 1}:{get_column_letter(self.COLUMN_JUDGE)}{self.ROW_MAX})"
+            self.column_judge,
+            self.row_max + 1,
+            f"=SUM({get_column_letter(self.column_judge)}{self.ROW_OBSTACLES_OFFSET + 1}:{get_column_letter(self.column_judge)}{self.row_max})"
         )
 
     def _hide_unnecessary_columns_and_rows(self):
@@ -338,53 +230,112 @@ class ObstacleList(ExcelFile):
         """
         self._group_columns(
             self._get_course_column_number(self.courses.courses_list[-1]) + 3,
-            self.COLUMN_LAST_COURSE,
+            self.column_last_course,
             True
         )
         self._group_rows(
             self.courses.get_course_obstacles_number(self.courses.courses_list[0])
             + self.courses.get_course_obstacles_number(self.courses.courses_list[-1])
             + self.ROW_OBSTACLES_OFFSET + self.ROW_KIDS_SPACING + 1,
-            self.ROW_MAX,
+            self.row_max,
             True
         )
 
-    def _save_data(self) -> Optional[str]:
+    def _save_data(self, file_path: Optional[str] = None, parent=None) -> Optional[str]:
         """
         Save all obstacle data to the Excel file.
         
         This method orchestrates the process of writing all obstacle data to the Excel file
         and saving it with an appropriate name.
         
+        Parameters:
+            file_path (Optional[str]): Path to save the file to. If None, the path is chosen in a save dialog.
+            parent (tk.Misc, optional): Window the save dialog belongs to.
+        
         Returns:
             Optional[str]: The path to the saved file, or None if saving failed.
         """
+        self.create()
+        if file_path is not None:
+            return self.save_to_path(file_path)
+        return self.save_file(self.get_default_file_name(), parent)
+
+    def get_default_file_name(self) -> str:
+        """
+        Get the name of the obstacle list file for the map.
+
+        Returns:
+            str: The file name with the map name.
+        """
+        return f"{self.google_map.name} - {self.file_name}"
+
+    def create(self) -> List[Tuple[Layer, int, Place]]:
+        """
+        Write all obstacle data to the workbook without saving it.
+
+        The obstacle table is computed first if it wasn't given, then written only once, so the workbook
+        can be saved with save_to_path, save_to_stream or to_bytes, also from a worker thread or process
+        without any GUI.
+
+        Returns:
+            List[Tuple[Layer, int, Place]]: Obstacles that couldn't be found, each represented as a tuple of
+            (course layer, obstacle number, obstacle place)
+        """
+        if self._data_written:
+            return self.not_found_obstacles
+        self._data_written = True
+        if self.table is None:
+            self.table = ObstacleTableBuilder(self.google_map, self.cache).build()
         self._write_headlines()
-        self._write_course_info(self.courses.courses_list[0])
-        self._write_course_info(self.courses.courses_list[-1])
-        for course in self.courses.courses_list[1:-1]:
-            self._write_obstacles_numbers(course)
+        self._write_table()
         self._sum_and_write_number_of_volunteers_and_judges()
         self._hide_unnecessary_columns_and_rows()
-        return self.save_file(self.google_map.name + " - LISTA PRZESZKÓD.xlsx")
+        if self.photo_cache is not None and self.wb is not None:
+            PhotoSheet(self.courses, self.photo_cache).add_to(self.wb)
+            # The patch writer can't add worksheets
+            self.template_extended = True
+        if self.preview_png is not None and self.wb is not None:
+            MapPreview.add_to(self.wb, self.preview_png)
+            self.template_extended = True
+        self.not_found_obstacles = self.table.get_not_found_obstacles(self.courses)
+        if self.not_found_obstacles:
+            log.info("Not found obstacles report:\n%s", self.get_not_found_obstacles_report())
+        return self.not_found_obstacles
 
-    def add_to_list(self, obstacle: Place, course: Layer):
+    def get_obstacle_suggestions(self, obstacle: Place) -> List[Tuple[Place, Optional[int], float]]:
         """
-        Add an obstacle to the list of obstacles that couldn't be found in the main courses.
-        
-        This method tracks obstacles that couldn't be matched with obstacles in the main courses,
-        storing them for later reporting or analysis.
-        
+        Suggest the obstacles from the main and kids courses with names most similar to the given obstacle.
+
+        The trigram index is built on the first call and reused for all following obstacles.
+
         Parameters:
-            obstacle (Place): The obstacle place object that couldn't be found.
-            course (Layer): The course layer the obstacle belongs to.
-        
+            obstacle (Place): The obstacle that couldn't be found.
+
+        Returns:
+            List[Tuple[Place, Optional[int], float]]: Suggested obstacles as tuples of
+            (obstacle place, obstacle number, similarity score), sorted from the best match.
+        """
+        if self._obstacle_suggestions is None:
+            self._obstacle_suggestions = ObstacleSuggestions(
+                [self.courses.courses_list[0], self.courses.courses_list[-1]]
+            )
+        return self._obstacle_suggestions.get_suggestions(obstacle)
+
+    def get_not_found_obstacles_report(self) -> str:
+        """
+        Create a text report of obstacles that couldn't be found, with suggested matches.
+
         Returns:
-            None: This method modifies the internal not_found_obstacles list but doesn't return a value.
+            str: The report with one tab separated line per obstacle: course, number, name and suggestions.
         """
-        self.not_found_obstacles.append((course, self.courses.get_obstacle_number(obstacle), obstacle))
+        lines = []
+        for course, number, obstacle in self.not_found_obstacles:
+            suggestions = ObstacleSuggestions.format_suggestions(self.get_obstacle_suggestions(obstacle)) or "-"
+            lines.append(f"{course.name}\t{number}\t{obstacle.name}\t{suggestions}")
+        return "\n".join(lines)
 
-    def create_and_save(self) -> Tuple[Optional[str], List[Tuple[Layer, int, Place]]]:
+    def create_and_save(self, file_path: Optional[str] = None, parent=None) \
+            -> Tuple[Optional[str], List[Tuple[Layer, int, Place]]]:
         """
         Creates and saves the obstacle list Excel file.
         
@@ -396,11 +347,16 @@ class ObstacleList(ExcelFile):
         5. Hides unnecessary columns and rows for better readability
         6. Saves the file with the map name
         
+        Parameters:
+            file_path (Optional[str]): Path to save the file to without any dialog.
+                                       If None, the path is chosen in a save dialog.
+            parent (tk.Misc, optional): Window the save dialog belongs to.
+        
         Returns:
             Tuple[Optional[str], List[Tuple[Layer, int, Place]]]: A tuple containing:
                 - The path to the saved Excel file, or None if saving failed
                 - A list of obstacles that couldn't be found, each represented as a tuple of
                   (course layer, obstacle number, obstacle place)
         """
-        file_path = self._save_data()
+        file_path = self._save_data(file_path, parent)
         return file_path, self.not_found_obstacles
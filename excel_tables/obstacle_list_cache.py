@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple, Any
+
+from GoogleMyMaps.models import Layer
+
+log = logging.getLogger(__name__)
+
+
+class CourseResult:
+    """
+    Everything added to the obstacle table while processing a single course.
+
+    Attributes:
+        entries (List[Tuple[int, Any]]): Course entries added to the table as tuples of (row, CourseEntry).
+        obstacle_indexes (List[Tuple[int, int]]): Obstacles whose name and data were added to the table
+                                                  as tuples of (row, index in the course's places).
+        not_found_indexes (List[int]): Indexes in the course's places of obstacles that couldn't be found.
+        reference_distances (Dict[int, Optional[float]]): Distances of the reference course obstacles
+                                                          by their index in the course's places.
+    """
+
+    def __init__(self):
+        self.entries: List[Tuple[int, Any]] = []
+        self.obstacle_indexes: List[Tuple[int, int]] = []
+        self.not_found_indexes: List[int] = []
+        self.reference_distances: Dict[int, Optional[float]] = {}
+
+    def to_dict(self) -> dict:
+        """
+        Convert the result to a dictionary of plain values.
+
+        Returns:
+            dict: The result with the course entries as lists of (row, number, zone, km).
+        """
+        return {
+            "entries": [[row, entry.number, entry.zone, entry.km] for row, entry in self.entries],
+            "obstacle_indexes": [list(obstacle_index) for obstacle_index in self.obstacle_indexes],
+            "not_found_indexes": list(self.not_found_indexes),
+            "reference_distances": [[index, distance] for index, distance in self.reference_distances.items()],
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "CourseResult":
+        """
+        Create a result from a dictionary created by to_dict.
+
+        Parameters:
+            data (dict): The result as a dictionary.
+
+        Returns:
+            CourseResult: The restored result.
+        """
+        from .obstacle_table import CourseEntry
+
+        result = CourseResult()
+        result.entries = [(row, CourseEntry(number, zone, km)) for row, number, zone, km in data["entries"]]
+        result.obstacle_indexes = [(row, index) for row, index in data["obstacle_indexes"]]
+        result.not_found_indexes = list(data["not_found_indexes"])
+        result.reference_distances = {index: distance for index, distance in data["reference_distances"]}
+        return result
+
+
+class ObstacleListCache:
+    """
+    Cache of per-course results of the obstacle table computation.
+
+    Results are stored by course name together with a key built from content hashes of all layers
+    the course result depends on, so a result is reused only if none of these layers changed.
+    The cache can be kept in memory between generations or saved to a JSON file. One cache is used by
+    the generation, the documents, the export and the watch mode threads, so the results are guarded by a lock.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty cache.
+        """
+        self.results: Dict[str, Tuple[str, CourseResult]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # The cache is sent to the processes rendering documents, a lock can't be pickled
+        with self._lock:
+            return {"results": dict(self.results)}
+
+    def __setstate__(self, state: dict) -> None:
+        self.results = state["results"]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_layer_hash(layer: Optional[Layer]) -> str:
+        """
+        Calculate a content hash of a layer.
+
+        Parameters:
+            layer (Optional[Layer]): The layer to hash.
+
+        Returns:
+            str: Hex digest of the layer's content, or an empty string if there is no layer.
+        """
+        if layer is None:
+            return ""
+        content = json.dumps(layer.to_dict(), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def get(self, course_name: str, key: str) -> Optional[CourseResult]:
+        """
+        Get a cached course result.
+
+        Parameters:
+            course_name (str): Name of the course.
+            key (str): Key built from hashes of the layers the result depends on.
+
+        Returns:
+            Optional[CourseResult]: The cached result, or None if it's missing or was computed from different layers.
+        """
+        with self._lock:
+            cached = self.results.get(course_name)
+        if cached is None or cached[0] != key:
+            return None
+        return cached[1]
+
+    def put(self, course_name: str, key: str, result: CourseResult) -> None:
+        """
+        Store a course result.
+
+        Parameters:
+            course_name (str): Name of the course.
+            key (str): Key built from hashes of the layers the result depends on.
+            result (CourseResult): The course result to store.
+        """
+        with self._lock:
+            self.results[course_name] = (key, result)
+
+    def retain(self, course_names: List[str]) -> None:
+        """
+        Remove results of courses that no longer exist.
+
+        Parameters:
+            course_names (List[str]): Names of the courses to keep.
+        """
+        with self._lock:
+            for name in [name for name in self.results if name not in course_names]:
+                del self.results[name]
+
+    def save(self, file_path: str) -> None:
+        """
+        Save the cache to a JSON file.
+
+        Parameters:
+            file_path (str): Path of the cache file.
+        """
+        with self._lock:
+            data = {name: {"key": key, "result": result.to_dict()} for name, (key, result) in self.results.items()}
+        with open(file_path, "w", encoding="utf-8") as cache_file:
+            json.dump(data, cache_file, ensure_ascii=False)
+        log.info("Obstacle list cache saved: %s", file_path)
+
+    @staticmethod
+    def load(file_path: str) -> "ObstacleListCache":
+        """
+        Load the cache from a file, or create an empty cache if the file can't be read.
+
+        Parameters:
+            file_path (str): Path of the cache file saved with save.
+
+        Returns:
+            ObstacleListCache: The loaded cache.
+        """
+        cache = ObstacleListCache()
+        try:
+            with open(file_path, "r", encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+            cache.results = {name: (cached["key"], CourseResult.from_dict(cached["result"]))
+                             for name, cached in data.items()}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.warning("Unable to load obstacle list cache %s: %s", file_path, e)
+        return cache
@@ -0,0 +1,352 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import openpyxl as xl
+from openpyxl.utils import get_column_letter
+
+from GoogleMyMaps.models import Map
+from configs.utils import write_atomically
+from .obstacle_list import ObstacleList
+from .obstacle_list_cache import ObstacleListCache
+from .xlsx_patch_writer import XlsxPatchWriter
+
+log = logging.getLogger(__name__)
+
+
+class CellChange:
+    """
+    A single cell changed by the update of an obstacle list workbook.
+
+    Attributes:
+        reference (str): The cell reference in the updated workbook, e.g. "C14".
+        column_name (str): The column header, prefixed with the course name for course columns.
+        course_name (str): Name of the main or kids course the row belongs to.
+        obstacle_number (int): Number of the obstacle in that course.
+        old_value (Any): The value in the workbook before the update.
+        new_value (Any): The value computed from the map.
+    """
+
+    def __init__(self, reference: str, column_name: str, course_name: str, obstacle_number: int,
+                 old_value: Any, new_value: Any):
+        self.reference = reference
+        self.column_name = column_name
+        self.course_name = course_name
+        self.obstacle_number = obstacle_number
+        self.old_value = old_value
+        self.new_value = new_value
+
+    def to_dict(self) -> dict:
+        """
+        Convert the change to a dictionary of plain values.
+
+        Returns:
+            dict: The change with the cell, its column, row and both values.
+        """
+        return {
+            "cell": self.reference,
+            "column": self.column_name,
+            "course": self.course_name,
+            "number": self.obstacle_number,
+            "old_value": self.old_value,
+            "new_value": self.new_value,
+        }
+
+
+class ObstacleListUpdater:
+    """
+    Update of a previously generated obstacle list workbook with a new version of the map.
+
+    Rows of the workbook are matched with the rows of a newly computed obstacle list by the course
+    (main or kids course) and obstacle number, and columns by the course names and headers, so sorted
+    rows are still found. Only the cells computed from the map are compared: course numbers, zones and
+    kilometres, obstacle names and WOLO/judge counts. Notes are filled only into empty cells, and all other
+    columns are left as the coordinators wrote them. The changed cells are patched into the workbook file
+    with the XlsxPatchWriter, so the rest of the file stays exactly as it was.
+
+    Attributes:
+        obstacle_list (ObstacleList): The obstacle list computed from the new version of the map.
+        workbook_path (str): Path of the updated workbook.
+        changes (List[CellChange]): Cells changed by the update.
+        unplaced (List[str]): Courses and obstacles of the map that have no place in the workbook,
+                              they need a full regeneration of the list.
+    """
+
+    def __init__(self, google_map: Map, workbook_path: str, cache: Optional[ObstacleListCache] = None):
+        """
+        Initialize the update of a workbook.
+
+        Parameters:
+            google_map (Map): The new version of the map.
+            workbook_path (str): Path of the previously generated obstacle list workbook.
+            cache (Optional[ObstacleListCache]): Cache of course results from previous generations.
+        """
+        self.obstacle_list = ObstacleList(google_map, cache)
+        self.workbook_path = workbook_path
+        self.changes: List[CellChange] = []
+        self.unplaced: List[str] = []
+        self._old_rows: Dict[int, Tuple[Any, ...]] = {}
+        self._last_old_row = 0
+        self.patch_writer = XlsxPatchWriter(workbook_path)
+        self.patch_writer.full_calc_on_load = True
+
+    def update(self, file_path: Optional[str] = None) -> List[CellChange]:
+        """
+        Compute the obstacle list and write the changed cells to the workbook.
+
+        Parameters:
+            file_path (Optional[str]): Path to save the updated workbook to. If None, the workbook is updated in place.
+
+        Returns:
+            List[CellChange]: Cells changed by the update.
+
+        Raises:
+            OSError: If the workbook can't be read or written.
+        """
+        self.obstacle_list.create()
+        self._read_workbook()
+        column_mapping = self._get_column_mapping()
+        self._compare_rows(column_mapping)
+
+        target_path = file_path or self.workbook_path
+        if self.changes or target_path != self.workbook_path:
+            write_atomically(target_path, self.patch_writer.save)
+        self.log()
+        return self.changes
+
+    def _read_workbook(self) -> None:
+        """
+        Read values of all non-empty rows of the workbook's obstacle sheet.
+        """
+        wb = xl.load_workbook(self.workbook_path, read_only=True)
+        try:
+            ws = wb.worksheets[0]
+            for row, values in enumerate(ws.iter_rows(values_only=True), start=1):
+                if any(value is not None for value in values):
+                    self._old_rows[row] = values
+        finally:
+            wb.close()
+
+    def _get_old_value(self, col: int, row: int) -> Any:
+        """
+        Get a value of the workbook before the update.
+
+        Parameters:
+            col (int): Column number (1-based)
+            row (int): Row number (1-based)
+
+        Returns:
+            Any: The cell value, or None if the cell is empty.
+        """
+        values = self._old_rows.get(row, ())
+        return values[col - 1] if col <= len(values) else None
+
+    def _find_old_column(self, row: int, value: Any, last_col: Optional[int] = None) -> Optional[int]:
+        """
+        Find the first column of the workbook with a given header.
+
+        Parameters:
+            row (int): The header row (1-based)
+            value (Any): The header value.
+            last_col (Optional[int]): Last searched column, or None to search the whole row.
+
+        Returns:
+            Optional[int]: The column number (1-based), or None if there is no such header.
+        """
+        for col, old_value in enumerate(self._old_rows.get(row, ()), start=1):
+            if last_col is not None and col > last_col:
+                break
+            if old_value is not None and str(old_value).strip() == str(value).strip():
+                return col
+        return None
+
+    def _get_column_mapping(self) -> List[Tuple[int, int, str, bool]]:
+        """
+        Match the computed columns of the new obstacle list with the columns of the workbook.
+
+        Returns:
+            List[Tuple[int, int, str, bool]]: Tuples of (new column, workbook column, column name,
+            whether the workbook cell is only filled when empty).
+        """
+        obstacle_list = self.obstacle_list
+        header_row = obstacle_list.ROW_HEADERS + 1
+        shared_columns = [
+            (obstacle_list.column_name, False),
+            (obstacle_list.column_wolo, False),
+            (obstacle_list.column_judge, False),
+            (obstacle_list.column_info, True),
+        ]
+        mapping = []
+        old_name_col = None
+        for new_col, fill_empty in shared_columns:
+            header = obstacle_list._get_cell_value(new_col, header_row)
+            old_col = self._find_old_column(header_row, header)
+            if old_col is None:
+                self.unplaced.append(f'Column "{header}" is missing in the workbook')
+                continue
+            if new_col == obstacle_list.column_name:
+                old_name_col = old_col
+            mapping.append((new_col, old_col, str(header), fill_empty))
+
+        last_course_col = old_name_col - 1 if old_name_col else None
+        for course in obstacle_list.courses.courses_list:
+            new_col = obstacle_list._get_course_column_number(course)
+            course_header = obstacle_list._get_cell_value(new_col, obstacle_list.ROW_HEADERS)
+            old_col = self._find_old_column(obstacle_list.ROW_HEADERS, course_header, last_course_col)
+            if old_col is None:
+                self.unplaced.append(f'Course "{course.name}" is missing in the workbook')
+                continue
+            for offset in range(3):
+                header = obstacle_list._get_cell_value(new_col + offset, header_row)
+                mapping.append((new_col + offset, old_col + offset, f"{course_header} {header}", False))
+        return mapping
+
+    def _get_row_keys(self, get_value, main_col: Optional[int], kids_col: Optional[int], rows) \
+            -> Dict[Tuple[str, int], int]:
+        """
+        Identify obstacle rows by the course and obstacle number.
+
+        Rows of the main course obstacles have the number in the main course column,
+        rows of the kids course obstacles only in the kids course column.
+
+        Parameters:
+            get_value: Function returning a cell value for a column and row.
+            main_col (Optional[int]): Column of the main course numbers.
+            kids_col (Optional[int]): Column of the kids course numbers, or None if there is no kids course.
+            rows: Row numbers to identify.
+
+        Returns:
+            Dict[Tuple[str, int], int]: Rows by (course name, obstacle number), the first row of duplicated keys.
+        """
+        courses_list = self.obstacle_list.courses.courses_list
+        main_course, kids_course = courses_list[0], courses_list[-1]
+        keys = {}
+        for row in rows:
+            main_number = get_value(main_col, row) if main_col else None
+            kids_number = get_value(kids_col, row) if kids_col else None
+            if isinstance(main_number, (int, float)):
+                key = (main_course.name, int(main_number))
+            elif isinstance(kids_number, (int, float)):
+                key = (kids_course.name, int(kids_number))
+            else:
+                continue
+            keys.setdefault(key, row)
+        return keys
+
+    def _compare_rows(self, column_mapping: List[Tuple[int, int, str, bool]]) -> None:
+        """
+        Compare the computed cells of matched rows and record the changes in the patch writer.
+
+        Parameters:
+            column_mapping (List[Tuple[int, int, str, bool]]): Matched columns from _get_column_mapping.
+        """
+        obstacle_list = self.obstacle_list
+        courses_list = obstacle_list.courses.courses_list
+        if not courses_list:
+            return
+        old_columns = {new_col: old_col for new_col, old_col, _, _ in column_mapping}
+        main_col = obstacle_list._get_course_column_number(courses_list[0])
+        kids_col = obstacle_list._get_course_column_number(courses_list[-1]) \
+            if "KIDS" in courses_list[-1].name.upper() else None
+        old_main_col = old_columns.get(main_col)
+        old_kids_col = old_columns.get(kids_col) if kids_col else None
+
+        # Rows after the header rows up to the totals row, whose volunteer sum has a formula
+        old_wolo_col = old_columns.get(obstacle_list.column_wolo)
+        first_row = obstacle_list.ROW_OBSTACLES_OFFSET + 1
+        totals_rows = [row for row in self._old_rows if row >= first_row and old_wolo_col
+                       and str(self._get_old_value(old_wolo_col, row)).startswith("=")]
+        self._last_old_row = min(totals_rows) - 1 if totals_rows else max(self._old_rows, default=0)
+        old_rows = range(first_row, self._last_old_row + 1)
+
+        new_keys = self._get_row_keys(lambda col, row: obstacle_list.cell_buffer.cells.get((col, row)),
+                                      main_col, kids_col, range(first_row, obstacle_list.row_max + 1))
+        old_keys = self._get_row_keys(self._get_old_value, old_main_col, old_kids_col,
+                                      [row for row in old_rows if row in self._old_rows])
+        old_key_rows = set(old_keys.values())
+        bold_cells = obstacle_list.cell_buffer.get_styled_cells("bold")
+
+        for key, new_row in new_keys.items():
+            old_row = old_keys.get(key)
+            if old_row is None:
+                old_row = new_row
+                if old_row in old_key_rows or old_row not in old_rows:
+                    self.unplaced.append(f'Obstacle {key[1]} of course "{key[0]}" has no free row in the workbook')
+                    continue
+                old_key_rows.add(old_row)
+            for new_col, old_col, column_name, fill_empty in column_mapping:
+                new_value = obstacle_list.cell_buffer.cells.get((new_col, new_row))
+                self._compare_cell(key, old_col, old_row, column_name, new_value, fill_empty,
+                                   (new_col, new_row) in bold_cells)
+
+        for key, old_row in old_keys.items():
+            if key in new_keys:
+                continue
+            for _, old_col, column_name, fill_empty in column_mapping:
+                if not fill_empty:
+                    self._compare_cell(key, old_col, old_row, column_name, None, False, False)
+
+    def _compare_cell(self, key: Tuple[str, int], col: int, row: int, column_name: str, new_value: Any,
+                      fill_empty: bool, bold: bool) -> None:
+        """
+        Compare a workbook cell with its computed value and record the change.
+
+        Parameters:
+            key (Tuple[str, int]): The (course name, obstacle number) of the row.
+            col (int): Column number in the workbook (1-based)
+            row (int): Row number in the workbook (1-based)
+            column_name (str): Name of the column for the report.
+            new_value (Any): The computed value.
+            fill_empty (bool): Whether the cell is only written when it's empty.
+            bold (bool): Whether the computed cell is bold.
+        """
+        old_value = self._get_old_value(col, row)
+        if self._is_empty(new_value) and self._is_empty(old_value):
+            return
+        if fill_empty and (not self._is_empty(old_value) or self._is_empty(new_value)):
+            return
+        if old_value == new_value:
+            return
+        self.changes.append(CellChange(f"{get_column_letter(col)}{row}", column_name, key[0], key[1],
+                                       old_value, new_value))
+        self.patch_writer.cells[(col, row)] = new_value
+        if bold:
+            self.patch_writer.bold_cells.add((col, row))
+
+    @staticmethod
+    def _is_empty(value: Any) -> bool:
+        """
+        Check whether a cell value is empty.
+
+        Parameters:
+            value (Any): The cell value.
+
+        Returns:
+            bool: True for None and empty strings.
+        """
+        return value is None or value == ""
+
+    def get_report(self) -> str:
+        """
+        Create a text report of the update.
+
+        Returns:
+            str: One tab separated line per changed cell: cell, column, course, number, old and new value,
+            followed by the courses and obstacles that have no place in the workbook.
+        """
+        lines = [f"{change.reference}\t{change.column_name}\t{change.course_name}\t{change.obstacle_number}\t"
+                 f"{'' if change.old_value is None else change.old_value}\t"
+                 f"{'' if change.new_value is None else change.new_value}"
+                 for change in self.changes]
+        lines.extend(self.unplaced)
+        return "\n".join(lines)
+
+    def log(self) -> None:
+        """
+        Log the summary and the report of the update.
+        """
+        log.info("Workbook %s updated: %d changed cells", self.workbook_path, len(self.changes))
+        if self.changes or self.unplaced:
+            log.info("Update report:\n%s", self.get_report())
+        if self.unplaced:
+            log.warning("%d courses or obstacles couldn't be placed in the workbook, "
+                        "generate a new list to add them", len(self.unplaced))
@@ -0,0 +1,126 @@
+import heapq
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from GoogleMyMaps.models import Layer, Place
+from configs.utils import unify_string
+from .courses import Courses
+
+log = logging.getLogger(__name__)
+
+
+class ObstacleSuggestions:
+    """
+    A trigram index over obstacle names of the reference courses.
+
+    The index is used to suggest the most similar obstacles for obstacles that couldn't be
+    matched by name, so typos in the map can be found without searching by hand.
+    Every unique unified name is indexed once, and queries only touch the candidates that
+    share at least one trigram with the searched name.
+
+    Attributes:
+        TRIGRAM_SIZE (int): Length of the n-grams used by the index.
+        MAX_SUGGESTIONS (int): Default number of suggestions returned for one obstacle.
+        MIN_SCORE (float): Minimal similarity score for a candidate to be suggested.
+    """
+
+    TRIGRAM_SIZE = 3
+    MAX_SUGGESTIONS = 3
+    MIN_SCORE = 0.2
+
+    def __init__(self, reference_courses: List[Layer]):
+        """
+        Build the trigram index from the obstacles of the reference courses.
+
+        Parameters:
+            reference_courses (List[Layer]): Courses whose obstacles can be suggested,
+                                             usually the longest course and the kids course.
+        """
+        self.names: List[str] = []
+        self.candidates: List[Tuple[Place, Optional[int]]] = []
+        self.trigrams_count: List[int] = []
+        self.index: Dict[str, List[int]] = defaultdict(list)
+        self._add_courses(reference_courses)
+
+    def _add_courses(self, courses: List[Layer]) -> None:
+        """
+        Add all numbered points of the given courses to the index.
+
+        Parameters:
+            courses (List[Layer]): Courses to index. Obstacles with an already indexed name are skipped.
+        """
+        known_names = set()
+        for course in courses:
+            for obstacle in course.places:
+                if obstacle.place_type != "Point":
+                    continue
+                name = unify_string(obstacle.name)
+                if not name or name in known_names:
+                    continue
+                known_names.add(name)
+
+                candidate_id = len(self.names)
+                trigrams = ObstacleSuggestions._get_trigrams(name)
+                self.names.append(name)
+                self.candidates.append((obstacle, Courses.get_obstacle_number(obstacle)))
+                self.trigrams_count.append(len(trigrams))
+                for trigram in trigrams:
+                    self.index[trigram].append(candidate_id)
+
+    @staticmethod
+    def _get_trigrams(name: str) -> Set[str]:
+        """
+        Split a unified name into a set of trigrams.
+
+        The name is padded with spaces so that short names and word boundaries produce trigrams too.
+
+        Parameters:
+            name (str): Unified obstacle name.
+
+        Returns:
+            Set[str]: A set of all trigrams of the padded name.
+        """
+        padded = f"  {name} "
+        return {padded[i:i + ObstacleSuggestions.TRIGRAM_SIZE]
+                for i in range(len(padded) - ObstacleSuggestions.TRIGRAM_SIZE + 1)}
+
+    def get_suggestions(self, obstacle: Place, limit: int = MAX_SUGGESTIONS) -> List[Tuple[Place, Optional[int], float]]:
+        """
+        Find the reference obstacles with names most similar to the given obstacle.
+
+        The similarity score is the Jaccard index of both names' trigram sets.
+
+        Parameters:
+            obstacle (Place): The obstacle that couldn't be found.
+            limit (int, optional): Maximum number of suggestions. Defaults to MAX_SUGGESTIONS.
+
+        Returns:
+            List[Tuple[Place, Optional[int], float]]: Suggested obstacles as tuples of
+            (obstacle place, obstacle number, similarity score), sorted from the best match.
+        """
+        trigrams = ObstacleSuggestions._get_trigrams(unify_string(obstacle.name))
+        shared_counts: Dict[int, int] = defaultdict(int)
+        for trigram in trigrams:
+            for candidate_id in self.index.get(trigram, ()):
+                shared_counts[candidate_id] += 1
+
+        scores = (
+            (shared / (len(trigrams) + self.trigrams_count[candidate_id] - shared), candidate_id)
+            for candidate_id, shared in shared_counts.items()
+        )
+        best = heapq.nlargest(limit, (score for score in scores if score[0] >= self.MIN_SCORE))
+        return [(*self.candidates[candidate_id], round(score, 2)) for score, candidate_id in best]
+
+    @staticmethod
+    def format_suggestions(suggestions: List[Tuple[Place, Optional[int], float]]) -> str:
+        """
+        Format suggestions as a single line of text.
+
+        Parameters:
+            suggestions (List[Tuple[Place, Optional[int], float]]): Suggestions returned by get_suggestions.
+
+        Returns:
+            str: Suggestions in the "NUMBER. NAME (SCORE%)" format separated by commas.
+        """
+        return ", ".join(f"{number}. {place.name} ({score:.0%})" for place, number, score in suggestions)
@@ -0,0 +1,657 @@
+import logging
+from bisect import bisect_right
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from GoogleMyMaps.models import Map, Layer, Place
+from configs.progress import Progress
+from configs.utils import unify_string
+from .areas import Areas
+from .course_trail import CourseTrail
+from .courses import Courses
+from .obstacle_list_cache import ObstacleListCache, CourseResult
+from .trail_overlap import TrailOverlaps
+
+log = logging.getLogger(__name__)
+
+
+class CourseEntry(NamedTuple):
+    """
+    An obstacle of a course in a row of the obstacle table.
+
+    Attributes:
+        number (Optional[int]): Number of the obstacle in the course.
+        zone (Optional[int]): Number of the zone the obstacle is in.
+        km (Optional[float]): Distance to the obstacle along the course in kilometres, or None if unknown.
+    """
+
+    number: Optional[int]
+    zone: Optional[int]
+    km: Optional[float]
+
+
+class ObstacleRow(NamedTuple):
+    """
+    A row of the obstacle table: an obstacle of the main or kids course and its numbers in all courses.
+
+    Attributes:
+        row (int): Row of the table, main course obstacles are at their numbers and the kids course
+                   obstacles follow them after ObstacleTableBuilder.KIDS_SPACING empty rows.
+        name (Optional[str]): Name of the obstacle.
+        important (bool): Whether the obstacle is one of the IMPORTANT_OBSTACLE_NAMES.
+        wolo (Optional[int]): Minimal number of volunteers, or None if there are none.
+        judge (Optional[int]): Number of judges, or None if there are none.
+        description (Any): Description of the obstacle, or None if the obstacle has no data.
+        courses (Tuple[Optional[CourseEntry], ...]): Entries of the obstacle in the courses of the map,
+                                                      None for courses without the obstacle.
+    """
+
+    row: int
+    name: Optional[str]
+    important: bool
+    wolo: Optional[int]
+    judge: Optional[int]
+    description: Any
+    courses: Tuple[Optional[CourseEntry], ...]
+
+
+class ObstacleTable(NamedTuple):
+    """
+    The obstacle list computed from a map, independent of any workbook.
+
+    The table holds only immutable plain values, so it can be pickled, cached, compared
+    or sent to other processes, and rendered to the Excel template or any other format.
+
+    Attributes:
+        map_name (str): Name of the map.
+        course_names (Tuple[str, ...]): Names of the courses in the order of their columns.
+        rows (Tuple[ObstacleRow, ...]): Rows of the table sorted by their row number.
+        not_found (Tuple[Tuple[int, int], ...]): Obstacles that couldn't be matched with the main and
+                                                 kids courses as tuples of (course index, place index).
+    """
+
+    map_name: str
+    course_names: Tuple[str, ...]
+    rows: Tuple[ObstacleRow, ...]
+    not_found: Tuple[Tuple[int, int], ...]
+
+    def get_course_rows(self, course_index: int) -> List[Tuple[ObstacleRow, CourseEntry]]:
+        """
+        Get the rows with an obstacle of a course.
+
+        Parameters:
+            course_index (int): Index of the course in course_names.
+
+        Returns:
+            List[Tuple[ObstacleRow, CourseEntry]]: The rows and the course entries in them.
+        """
+        return [(row, row.courses[course_index]) for row in self.rows
+                if row.courses[course_index] is not None and row.courses[course_index].number is not None]
+
+    def get_people(self, course_index: int) -> Tuple[int, int]:
+        """
+        Sum volunteers and judges of the obstacles of a course.
+
+        Parameters:
+            course_index (int): Index of the course in course_names.
+
+        Returns:
+            Tuple[int, int]: The number of volunteers and judges.
+        """
+        course_rows = self.get_course_rows(course_index)
+        return sum(row.wolo or 0 for row, _ in course_rows), sum(row.judge or 0 for row, _ in course_rows)
+
+    def get_not_found_obstacles(self, courses: Courses) -> List[Tuple[Layer, int, Place]]:
+        """
+        Resolve the obstacles that couldn't be found to the layers and places of the map.
+
+        Parameters:
+            courses (Courses): Courses of the map the table was computed from.
+
+        Returns:
+            List[Tuple[Layer, int, Place]]: Obstacles that couldn't be found, each represented as a tuple of
+            (course layer, obstacle number, obstacle place)
+        """
+        not_found_obstacles = []
+        for course_index, place_index in self.not_found:
+            course = courses.courses_list[course_index]
+            obstacle = course.places[place_index]
+            not_found_obstacles.append((course, courses.get_obstacle_number(obstacle), obstacle))
+        return not_found_obstacles
+
+
+class ObstacleTableBuilder:
+    """
+    Computation of the obstacle table from a map.
+
+    The main and kids courses are written at the rows of their obstacle numbers, and obstacles of the
+    other courses are matched with them by name. Zones and kilometres of the matched obstacles are
+    calculated for each course. The zones, the kilometres of the main and kids courses, and the matching
+    of the other courses are reported as stages of the progress.
+
+    Attributes:
+        IMPORTANT_OBSTACLE_NAMES (List[str]): Names of obstacles that should be highlighted in the output.
+        KIDS_SPACING (int): Number of empty rows between the main and kids course obstacles.
+        CACHE_KEY_VERSION (str): Prefix of the cache keys, changed whenever the course results change.
+    """
+
+    IMPORTANT_OBSTACLE_NAMES = ["START", "META", "START KIDS", "META KIDS"]
+    KIDS_SPACING = 1
+    CACHE_KEY_VERSION = "table-1"
+
+    def __init__(self, google_map: Map, cache: Optional[ObstacleListCache] = None,
+                 progress: Optional[Progress] = None, check_cancelled: Optional[Callable[[], None]] = None):
+        """
+        Initialize the computation for a map.
+
+        Parameters:
+            google_map (Map): The Google Map object containing course and obstacle data.
+            cache (Optional[ObstacleListCache]): Cache of course results from previous computations.
+                                                 If given, only courses whose layers changed are recomputed.
+            progress (Optional[Progress]): Progress the "zones", "chainage" and "matching" stages are reported to.
+            check_cancelled (Optional[Callable[[], None]]): Callback raising an exception to stop the computation,
+                                                            called before each stage and each course.
+        """
+        self.google_map = google_map
+        self.progress = progress or Progress()
+        self.check_cancelled = check_cancelled or (lambda: None)
+        self.courses = Courses(google_map)
+        self.check_cancelled()
+        with self.progress.stage("zones"):
+            self.areas = Areas(google_map)
+        self.cache = cache
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._not_found: List[Tuple[int, int]] = []
+        self._course_index = 0
+        self._course_result: Optional[CourseResult] = None
+        self._layer_hashes: Dict[int, str] = {}
+        self._course_trails: Dict[int, CourseTrail] = {}
+        self._reference_distances: Dict[int, Optional[float]] = {}
+        self._trail_overlaps: Optional[TrailOverlaps] = None
+        # Distance to the last obstacle found along the matched course, choosing between repeated passes
+        self._last_course_distance: Optional[float] = None
+        self._name_indexes: Dict[int, Dict[str, List[int]]] = {}
+        self._place_indexes: Dict[int, Dict[int, int]] = {}
+
+    def build(self) -> ObstacleTable:
+        """
+        Compute the obstacle table.
+
+        Returns:
+            ObstacleTable: The computed table.
+        """
+        courses_list = self.courses.courses_list
+        if courses_list:
+            chainage_courses = [courses_list[0], courses_list[-1]]
+            with self.progress.stage("chainage"):
+                for index, course in enumerate(chainage_courses):
+                    self.check_cancelled()
+                    self.progress.advance(index, len(chainage_courses), course.name)
+                    self._process_course(course, self._add_course_obstacles)
+                self.progress.advance(len(chainage_courses), len(chainage_courses))
+            self.check_cancelled()
+            with self.progress.stage("matching"):
+                other_courses = courses_list[1:-1]
+                for index, course in enumerate(other_courses):
+                    self.check_cancelled()
+                    self.progress.advance(index, len(other_courses), course.name)
+                    self._process_course(course, self._match_course_obstacles)
+                self.progress.advance(len(other_courses), len(other_courses))
+        if self.cache is not None:
+            self.cache.retain([course.name for course in courses_list])
+
+        rows = tuple(self._freeze_row(row) for row in sorted(self._rows))
+        return ObstacleTable(self.google_map.name, tuple(course.name for course in courses_list), rows,
+                             tuple(self._not_found))
+
+    def get_kids_row_offset(self) -> int:
+        """
+        Get the row offset of the kids course obstacles.
+
+        Returns:
+            int: Number of rows before the first kids course obstacle.
+        """
+        return self.courses.get_course_obstacles_number(self.courses.courses_list[0]) + self.KIDS_SPACING
+
+    def _freeze_row(self, row: int) -> ObstacleRow:
+        """
+        Convert a computed row to its immutable form.
+
+        Parameters:
+            row (int): The row of the table.
+
+        Returns:
+            ObstacleRow: The immutable row.
+        """
+        fields = self._rows[row]
+        entries: Dict[int, CourseEntry] = fields["courses"]
+        return ObstacleRow(
+            row=row,
+            name=fields.get("name"),
+            important=fields.get("important", False),
+            wolo=fields.get("wolo"),
+            judge=fields.get("judge"),
+            description=fields.get("description"),
+            courses=tuple(entries.get(index) for index in range(len(self.courses.courses_list))),
+        )
+
+    def _get_row(self, row: int) -> Dict[str, Any]:
+        """
+        Get the fields of a row being computed, creating it if needed.
+
+        Parameters:
+            row (int): The row of the table.
+
+        Returns:
+            Dict[str, Any]: Fields of the row, with course entries by course index under "courses".
+        """
+        if row not in self._rows:
+            self._rows[row] = {"courses": {}}
+        return self._rows[row]
+
+    def _add_entry(self, row: int, obstacle_number: Optional[int], obstacle_area: Optional[int],
+                   obstacle_distance: Optional[float]) -> None:
+        """
+        Add an obstacle of the currently computed course to a row.
+
+        Parameters:
+            row (int): The row of the table.
+            obstacle_number (Optional[int]): The obstacle's number in the course.
+            obstacle_area (Optional[int]): The area number where the obstacle is located.
+            obstacle_distance (Optional[float]): The distance to the obstacle in meters, or None if unknown.
+        """
+        if obstacle_distance is not None:
+            obstacle_distance = round(obstacle_distance / 1000, 1)
+        entry = CourseEntry(obstacle_number, obstacle_area, obstacle_distance)
+        self._get_row(row)["courses"][self._course_index] = entry
+        if self._course_result is not None:
+            self._course_result.entries.append((row, entry))
+
+    def _is_entry_numbered(self, row: int) -> bool:
+        """
+        Check whether the currently computed course already has a numbered obstacle in a row.
+
+        Parameters:
+            row (int): The row of the table.
+
+        Returns:
+            bool: True if an obstacle with a number was added to the row for the course.
+        """
+        entry = self._rows.get(row, {}).get("courses", {}).get(self._course_index)
+        return entry is not None and entry.number is not None
+
+    def _add_obstacle(self, row: int, course: Layer, obstacle: Place) -> None:
+        """
+        Add name and data of a main or kids course obstacle to a row.
+
+        An obstacle without data keeps the data of a previous obstacle with the same row.
+
+        Parameters:
+            row (int): The row of the table.
+            course (Layer): The course layer the obstacle belongs to.
+            obstacle (Place): The obstacle place object containing name and data.
+        """
+        fields = self._get_row(row)
+        fields["name"] = obstacle.name
+        fields["important"] = fields.get("important", False) or \
+            obstacle.name.upper() in self.IMPORTANT_OBSTACLE_NAMES
+        data = self._get_obstacle_data(obstacle)
+        if data is not None:
+            wolo, judge, description = data
+            fields["wolo"] = wolo if wolo > 0 else None
+            fields["judge"] = judge if judge > 0 else None
+            fields["description"] = description
+        if self._course_result is not None:
+            self._course_result.obstacle_indexes.append((row, self._get_place_index(course, obstacle)))
+
+    def _get_obstacle_data(self, obstacle: Place) -> Optional[Tuple[int, int, str]]:
+        """
+        Extract volunteer, judge, and description data from an obstacle.
+
+        Parameters:
+            obstacle (Place): The obstacle place object to extract data from.
+
+        Returns:
+            Optional[Tuple[int, int, str]]: A tuple containing (volunteer count, judge count, description),
+                                           or None if the obstacle has no data.
+        """
+        if obstacle.data is None:
+            return None
+        normalized_data = {key[0].upper(): value for key, value in obstacle.data.items()}
+
+        wolo = self._get_person_number(normalized_data, "W")  # WOLO
+        judge = self._get_person_number(normalized_data, "S")  # SĘDZIA
+        description = normalized_data.get("O", "")  # OPIS
+        return wolo, judge, description
+
+    @staticmethod
+    def _get_person_number(data: dict, data_key: str) -> int:
+        """
+        Extract and convert a person count from obstacle data.
+
+        Parameters:
+            data (dict): The normalized obstacle data dictionary.
+            data_key (str): The key to look up in the data dictionary.
+
+        Returns:
+            int: The number of persons, or 0 if not found or invalid.
+        """
+        try:
+            return int(data.get(data_key, 0))
+        except ValueError:
+            # TODO: info?
+            log.warning("Invalid data type for %s: %s", data_key, type(data.get(data_key, 0)))
+            return 0
+
+    def _add_course_obstacles(self, course: Layer) -> None:
+        """
+        Add all obstacles of the main or kids course at the rows of their numbers.
+
+        Parameters:
+            course (Layer): The course layer containing obstacles to add.
+        """
+        row_offset = self.get_kids_row_offset() if "KIDS" in course.name.upper() else 0
+        for obstacle in course.places:
+            if obstacle.place_type != "Point":
+                continue
+            self._add_single_obstacle(course, obstacle, row_offset)
+
+    def _add_single_obstacle(self, course: Layer, obstacle: Place, row_offset: int) -> None:
+        """
+        Add a single obstacle of the main or kids course.
+
+        Parameters:
+            course (Layer): The course layer the obstacle belongs to.
+            obstacle (Place): The obstacle place object to add.
+            row_offset (int): The row offset to apply when calculating the obstacle's row.
+        """
+        obstacle_number = self.courses.get_obstacle_number(obstacle)
+        if obstacle_number is None:
+            log.warning("Obstacle without number: %s, %s", obstacle.name, obstacle.icon)
+            return
+        obstacle_row = obstacle_number + row_offset
+        obstacle_area_number = self.areas.get_obstacle_area_number(obstacle)
+        obstacle_distance = self._get_course_trail(course).get_obstacle_distance(obstacle)
+        if course is self.courses.courses_list[0]:
+            self._reference_distances[id(obstacle)] = obstacle_distance
+            if self._course_result is not None:
+                self._course_result.reference_distances[self._get_place_index(course, obstacle)] = obstacle_distance
+        self._add_entry(obstacle_row, obstacle_number, obstacle_area_number, obstacle_distance)
+        self._add_obstacle(obstacle_row, course, obstacle)
+
+    def _get_course_trail(self, course: Layer) -> CourseTrail:
+        """
+        Get the trail of a course, extracting it from the course layer only once.
+
+        Parameters:
+            course (Layer): The course layer.
+
+        Returns:
+            CourseTrail: The trail of the course.
+        """
+        if id(course) not in self._course_trails:
+            self._course_trails[id(course)] = CourseTrail(course)
+        return self._course_trails[id(course)]
+
+    def _get_shared_obstacle_distance(self, course: Layer, obstacle: Place) -> Optional[float]:
+        """
+        Calculate the distance to an obstacle of the main or kids course along another course.
+
+        For obstacles of the main course, the distance is looked up through the shared-trail mapping
+        between the course and the main course. If the course passes the obstacle's position more than once,
+        the pass after the last found obstacle of the course is used. The obstacle is projected onto
+        the course trail only when the course doesn't share the trail at the obstacle's position.
+
+        Parameters:
+            course (Layer): The course layer the distance is calculated for.
+            obstacle (Place): The matched obstacle from the main or kids course.
+
+        Returns:
+            Optional[float]: Distance in meters from the start of the course trail, or None if unknown.
+        """
+        reference_distance = self._reference_distances.get(id(obstacle))
+        if reference_distance is not None:
+            if self._trail_overlaps is None:
+                self._trail_overlaps = TrailOverlaps(self.courses, self._course_trails)
+            overlap = self._trail_overlaps.get_overlap(course)
+            course_distance = overlap.get_course_distance(reference_distance, self._last_course_distance) \
+                if overlap else None
+            if course_distance is not None:
+                self._last_course_distance = course_distance
+                return course_distance
+        course_distance = self._get_course_trail(course).get_obstacle_distance(obstacle)
+        if course_distance is not None:
+            self._last_course_distance = course_distance
+        return course_distance
+
+    def _match_course_obstacles(self, course: Layer) -> None:
+        """
+        Add obstacle numbers of a course by matching its obstacles with the main courses.
+
+        Parameters:
+            course (Layer): The course layer to process obstacles for.
+        """
+        kids_row_offset = self.get_kids_row_offset()
+        last_found_obstacle_index = -1
+        self._last_course_distance = None
+        for analysed_obstacle in course.places:
+            if analysed_obstacle.place_type != "Point":
+                continue
+            last_found_obstacle_index = self._process_obstacle(
+                course,
+                analysed_obstacle,
+                kids_row_offset,
+                last_found_obstacle_index
+            )
+
+    def _process_obstacle(self, course: Layer, analysed_obstacle: Place, kids_row_offset: int,
+                          last_found_obstacle_index: int) -> int:
+        """
+        Process an obstacle by trying to find a matching obstacle in the main courses.
+
+        The main course is searched forward from the last found obstacle first, then backward from it,
+        and finally the kids course is searched. Only obstacles with the same name are visited,
+        so the search doesn't depend on the number of obstacles in the main courses.
+
+        Parameters:
+            course (Layer): The course layer the obstacle belongs to.
+            analysed_obstacle (Place): The obstacle place object to process.
+            kids_row_offset (int): The row offset for the kids course.
+            last_found_obstacle_index (int): The index of the last found obstacle.
+
+        Returns:
+            int: The updated index of the last found obstacle.
+        """
+        main_course, kids_course = self.courses.courses_list[0], self.courses.courses_list[-1]
+        analysed_name = unify_string(analysed_obstacle.name)
+        main_indexes = self._get_name_indexes(main_course).get(analysed_name, [])
+
+        forward_indexes = main_indexes[bisect_right(main_indexes, last_found_obstacle_index):]
+        found_obstacle_index = self._find_and_add_obstacle(analysed_obstacle, main_course, forward_indexes,
+                                                           course, 0)
+        if found_obstacle_index is not None:
+            return found_obstacle_index
+
+        backward_start = min(last_found_obstacle_index + 1, len(main_course.places) - 1)
+        backward_indexes = main_indexes[:bisect_right(main_indexes, backward_start)][::-1]
+        found_obstacle_index = self._find_and_add_obstacle(analysed_obstacle, main_course, backward_indexes,
+                                                           course, 0)
+        if found_obstacle_index is not None:
+            # Position of the found obstacle in the backward search
+            return last_found_obstacle_index + backward_start - found_obstacle_index + 1
+
+        found_obstacle_index = self._find_and_add_obstacle(
+            analysed_obstacle,
+            kids_course,
+            self._get_name_indexes(kids_course).get(analysed_name, []),
+            course,
+            kids_row_offset,
+        )
+        if found_obstacle_index is None:
+            log.warning("-Unable to find obstacle: %s from course: %s", analysed_obstacle.name, course.name)
+            self._add_not_found(analysed_obstacle, course)
+
+        return last_found_obstacle_index
+
+    def _find_and_add_obstacle(self, analysed_obstacle: Place, reference_course: Layer, indexes: List[int],
+                               course: Layer, row_offset: int) -> Optional[int]:
+        """
+        Find a matching obstacle among candidates from a reference course and add it to the course.
+
+        Parameters:
+            analysed_obstacle (Place): The obstacle place object to find a match for.
+            reference_course (Layer): The main or kids course to search in.
+            indexes (List[int]): Indexes of the reference course places with the analysed obstacle's name,
+                                 in the order they are searched.
+            course (Layer): The course layer the analysed obstacle belongs to.
+            row_offset (int): The row offset to apply when calculating the obstacle's row.
+
+        Returns:
+            Optional[int]: The index of the found obstacle in the reference course places, or None if not found.
+        """
+        for index in indexes:
+            obstacle = reference_course.places[index]
+            obstacle_number = self.courses.get_obstacle_number(obstacle)
+            if obstacle_number is None:
+                log.warning("Obstacle without number: %s, %s", obstacle.name, obstacle.icon)
+                return None
+            obstacle_row = obstacle_number + row_offset
+            if self._is_entry_numbered(obstacle_row):
+                continue
+
+            analysed_obstacle_number = self.courses.get_obstacle_number(analysed_obstacle)
+            obstacle_area_number = self.areas.get_obstacle_area_number(obstacle)
+            obstacle_distance = self._get_shared_obstacle_distance(course, obstacle)
+            self._add_entry(obstacle_row, analysed_obstacle_number, obstacle_area_number, obstacle_distance)
+            return index
+        return None
+
+    def _get_name_indexes(self, course: Layer) -> Dict[str, List[int]]:
+        """
+        Get indexes of the course places grouped by their unified names, building them only once.
+
+        Parameters:
+            course (Layer): The course layer.
+
+        Returns:
+            Dict[str, List[int]]: Ascending place indexes by unified place name.
+        """
+        if id(course) not in self._name_indexes:
+            name_indexes: Dict[str, List[int]] = {}
+            for index, place in enumerate(course.places):
+                name_indexes.setdefault(unify_string(place.name), []).append(index)
+            self._name_indexes[id(course)] = name_indexes
+        return self._name_indexes[id(course)]
+
+    def _get_place_index(self, course: Layer, place: Place) -> int:
+        """
+        Get the index of a place in the course places without scanning them every time.
+
+        Parameters:
+            course (Layer): The course layer.
+            place (Place): A place of the course.
+
+        Returns:
+            int: The index of the place in the course places.
+        """
+        if id(course) not in self._place_indexes:
+            self._place_indexes[id(course)] = {id(course_place): index
+                                               for index, course_place in enumerate(course.places)}
+        return self._place_indexes[id(course)][id(place)]
+
+    def _add_not_found(self, obstacle: Place, course: Layer) -> None:
+        """
+        Add an obstacle to the obstacles that couldn't be found in the main courses.
+
+        Parameters:
+            obstacle (Place): The obstacle place object that couldn't be found.
+            course (Layer): The course layer the obstacle belongs to.
+        """
+        place_index = self._get_place_index(course, obstacle)
+        self._not_found.append((self._course_index, place_index))
+        if self._course_result is not None:
+            self._course_result.not_found_indexes.append(place_index)
+
+    def _get_course_cache_key(self, course: Layer) -> str:
+        """
+        Build the cache key of a course from hashes of all layers its result depends on.
+
+        The main course depends on its own layer and zones, the kids course also on the main course
+        (its rows start after the main course obstacles), and the other courses on the main and kids courses,
+        because their obstacles are matched with them.
+
+        Parameters:
+            course (Layer): The course layer to build the key for.
+
+        Returns:
+            str: The cache key.
+        """
+        main_course, kids_course = self.courses.courses_list[0], self.courses.courses_list[-1]
+        areas_layer = next((layer for layer in self.google_map.layers if "STREFY" in layer.name.upper()), None)
+        if course is main_course:
+            layers = [main_course, areas_layer]
+        elif course is kids_course:
+            layers = [kids_course, main_course, areas_layer]
+        else:
+            layers = [course, main_course, kids_course, areas_layer]
+        hashes = [self.CACHE_KEY_VERSION]
+        hashes.extend(self._get_layer_hash(layer) for layer in layers)
+        return ":".join(hashes)
+
+    def _get_layer_hash(self, layer: Optional[Layer]) -> str:
+        """
+        Get a content hash of a layer, calculating it only once per computation.
+
+        Parameters:
+            layer (Optional[Layer]): The layer to hash.
+
+        Returns:
+            str: Hex digest of the layer's content, or an empty string if there is no layer.
+        """
+        if id(layer) not in self._layer_hashes:
+            self._layer_hashes[id(layer)] = ObstacleListCache.get_layer_hash(layer)
+        return self._layer_hashes[id(layer)]
+
+    def _process_course(self, course: Layer, add_course) -> None:
+        """
+        Compute a course, reusing its cached result if its layers haven't changed.
+
+        Parameters:
+            course (Layer): The course layer to compute.
+            add_course: The method computing the course, either _add_course_obstacles or _match_course_obstacles.
+        """
+        self._course_index = self.courses.get_course_index(course)
+        if self.cache is None:
+            add_course(course)
+            return
+
+        key = self._get_course_cache_key(course)
+        course_result = self.cache.get(course.name, key)
+        if course_result is not None:
+            log.info("Course %s hasn't changed, reusing its previous result", course.name)
+            self._replay_course_result(course, course_result)
+            return
+
+        log.info("Course %s has changed, computing it", course.name)
+        self._course_result = CourseResult()
+        try:
+            add_course(course)
+            self.cache.put(course.name, key, self._course_result)
+        finally:
+            self._course_result = None
+
+    def _replay_course_result(self, course: Layer, course_result: CourseResult) -> None:
+        """
+        Add a cached course result to the table.
+
+        Parameters:
+            course (Layer): The course layer the result belongs to.
+            course_result (CourseResult): The cached result of the course.
+        """
+        for row, entry in course_result.entries:
+            self._get_row(row)["courses"][self._course_index] = entry
+        for row, index in course_result.obstacle_indexes:
+            self._add_obstacle(row, course, course.places[index])
+        for index, distance in course_result.reference_distances.items():
+            self._reference_distances[id(course.places[index])] = distance
+        for index in course_result.not_found_indexes:
+            self._not_found.append((self._course_index, index))
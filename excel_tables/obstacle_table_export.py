@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, TextIO
+
+from configs.utils import write_atomically
+from .obstacle_table import ObstacleTable
+
+log = logging.getLogger(__name__)
+
+
+class ObstacleTableExport:
+    """
+    Export of the obstacle table to CSV and JSON Lines for tools that don't read workbooks.
+
+    Every record is an obstacle of a course, with the course name, the obstacle number, zone and km
+    in that course, and the obstacle name, WOLO, judges and description. Records are written to the stream
+    one by one as they are generated, courses in the order of their columns and obstacles by number.
+
+    Attributes:
+        FIELDS (List[str]): Names of the record fields, the CSV header.
+        FORMATS (Dict[str, str]): Export formats by file extension.
+        ENCODING (str): Encoding of the exported files.
+    """
+
+    FIELDS = ["course", "number", "zone", "km", "name", "wolo", "judge", "description"]
+    FORMATS = {".csv": "csv", ".jsonl": "jsonl"}
+    ENCODING = "utf-8"
+
+    @staticmethod
+    def iter_records(table: ObstacleTable) -> Iterator[Dict[str, Any]]:
+        """
+        Generate the records of the obstacle table.
+
+        Parameters:
+            table (ObstacleTable): The computed obstacle table.
+
+        Returns:
+            Iterator[Dict[str, Any]]: Records with the FIELDS as keys.
+        """
+        for course_index, course_name in enumerate(table.course_names):
+            course_rows = sorted(table.get_course_rows(course_index), key=lambda item: (item[1].number, item[0].row))
+            for row, entry in course_rows:
+                yield {
+                    "course": course_name,
+                    "number": entry.number,
+                    "zone": entry.zone,
+                    "km": entry.km,
+                    "name": row.name,
+                    "wolo": row.wolo or 0,
+                    "judge": row.judge or 0,
+                    "description": row.description or "",
+                }
+
+    @staticmethod
+    def write_csv(table: ObstacleTable, stream: TextIO) -> int:
+        """
+        Write the obstacle table as CSV with a header line.
+
+        Parameters:
+            table (ObstacleTable): The computed obstacle table.
+            stream (TextIO): Text stream opened with newline="".
+
+        Returns:
+            int: Number of written records.
+        """
+        writer = csv.DictWriter(stream, fieldnames=ObstacleTableExport.FIELDS)
+        writer.writeheader()
+        count = 0
+        for record in ObstacleTableExport.iter_records(table):
+            writer.writerow(record)
+            count += 1
+        return count
+
+    @staticmethod
+    def write_json_lines(table: ObstacleTable, stream: TextIO) -> int:
+        """
+        Write the obstacle table as JSON Lines, one JSON object per record.
+
+        Parameters:
+            table (ObstacleTable): The computed obstacle table.
+            stream (TextIO): Text stream.
+
+        Returns:
+            int: Number of written records.
+        """
+        count = 0
+        for record in ObstacleTableExport.iter_records(table):
+            stream.write(json.dumps(record, ensure_ascii=False))
+            stream.write("\n")
+            count += 1
+        return count
+
+    @staticmethod
+    def get_format(file_path: str) -> str:
+        """
+        Get the export format from the file extension.
+
+        Parameters:
+            file_path (str): Path of the exported file.
+
+        Returns:
+            str: "csv" or "jsonl".
+
+        Raises:
+            ValueError: If the extension isn't one of the FORMATS.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension not in ObstacleTableExport.FORMATS:
+            raise ValueError(f"Unsupported export format: {extension or file_path}")
+        return ObstacleTableExport.FORMATS[extension]
+
+    @staticmethod
+    def save_to_path(table: ObstacleTable, file_path: str) -> str:
+        """
+        Save the obstacle table to a CSV or JSON Lines file chosen by its extension.
+
+        The file is replaced atomically, like the saved workbooks.
+
+        Parameters:
+            table (ObstacleTable): The computed obstacle table.
+            file_path (str): Path of the exported file, ending with .csv or .jsonl.
+
+        Returns:
+            str: The path of the saved file.
+        """
+        export_format = ObstacleTableExport.get_format(file_path)
+        write_records = ObstacleTableExport.write_csv if export_format == "csv" \
+            else ObstacleTableExport.write_json_lines
+        count = 0
+
+        def write(binary_stream):
+            nonlocal count
+            stream = io.TextIOWrapper(binary_stream, encoding=ObstacleTableExport.ENCODING, newline="")
+            count = write_records(table, stream)
+            stream.flush()
+            stream.detach()
+
+        write_atomically(file_path, write)
+        log.info("Exported %d obstacles: %s", count, file_path)
+        return file_path
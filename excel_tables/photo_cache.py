@@ -0,0 +1,278 @@
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+
+from configs.utils import write_atomically
+
+log = logging.getLogger(__name__)
+
+
+def _make_thumbnail(source_path: str, thumbnail_path: str, size: int) -> str:
+    """
+    Downscale a photo to a JPEG thumbnail, in a worker process.
+
+    Parameters:
+        source_path (str): Path of the downloaded photo.
+        thumbnail_path (str): Path of the thumbnail.
+        size (int): Maximal width and height of the thumbnail in pixels.
+
+    Returns:
+        str: The path of the thumbnail.
+    """
+    with Image.open(source_path) as image:
+        image.draft("RGB", (size, size))
+        image.thumbnail((size, size))
+        if image.mode == "RGB":
+            thumbnail = image.copy()
+        else:
+            # Transparent parts become white instead of black
+            rgba_image = image.convert("RGBA")
+            thumbnail = Image.new("RGB", rgba_image.size, "white")
+            thumbnail.paste(rgba_image, mask=rgba_image.getchannel("A"))
+    write_atomically(thumbnail_path, lambda stream: thumbnail.save(stream, "JPEG", quality=85))
+    return thumbnail_path
+
+
+class PhotoCache:
+    """
+    On-disk cache of obstacle photos and their thumbnails.
+
+    Photos are stored by the SHA-256 of their content, and each URL points to the content it was downloaded as,
+    so a photo shared by several obstacles or URLs is stored and downscaled once. Missing photos are downloaded
+    by a bounded pool of threads, and missing thumbnails are made by Pillow in worker processes.
+    When everything is cached, getting the thumbnails only reads a few small files.
+
+    Attributes:
+        DEFAULT_DIRECTORY (str): The cache directory used if none is given.
+        MAX_DOWNLOADS (int): Maximal number of concurrent downloads.
+        TIMEOUT (float): Timeout of a single download in seconds.
+        MAX_PHOTO_SIZE (int): Photos larger than this number of bytes are skipped.
+        CHUNK_SIZE (int): Number of bytes of a photo read at once while downloading it.
+        THUMBNAIL_SIZE (int): Maximal width and height of the thumbnails in pixels.
+        PROCESS_THRESHOLD (int): Minimal number of thumbnails made in worker processes,
+                                 fewer are made in this process, because starting the processes takes longer.
+    """
+
+    DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".rmg", "photos")
+    MAX_DOWNLOADS = 8
+    TIMEOUT = 20.0
+    MAX_PHOTO_SIZE = 20 * 1024 * 1024
+    CHUNK_SIZE = 64 * 1024
+    THUMBNAIL_SIZE = 160
+    PROCESS_THRESHOLD = 8
+
+    def __init__(self, directory: Optional[str] = None, max_workers: Optional[int] = None):
+        """
+        Initialize the cache in a directory, creating it if needed.
+
+        Parameters:
+            directory (Optional[str]): The cache directory, DEFAULT_DIRECTORY if None.
+            max_workers (Optional[int]): Maximal number of worker processes making thumbnails,
+                                         by default the number of CPUs. 1 makes them without processes.
+        """
+        self.directory = directory or self.DEFAULT_DIRECTORY
+        self.max_workers = max_workers or os.cpu_count() or 1
+        for subdirectory in ("objects", "urls", "thumbnails"):
+            os.makedirs(os.path.join(self.directory, subdirectory), exist_ok=True)
+
+    def get_thumbnails(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Get thumbnails of photos, downloading and downscaling only those that aren't cached.
+
+        Parameters:
+            urls (List[str]): URLs of the photos.
+
+        Returns:
+            Dict[str, str]: Paths of the thumbnails by URL, photos that couldn't be downloaded or read are left out.
+        """
+        start = time.perf_counter()
+        urls = list(dict.fromkeys(urls))
+        digests = {url: self._get_url_digest(url) for url in urls}
+        missing = [url for url, digest in digests.items() if digest is None]
+        if missing:
+            digests.update(self._download(missing))
+
+        thumbnails: Dict[str, str] = {}
+        missing_thumbnails: Dict[str, str] = {}
+        for url, digest in digests.items():
+            if digest is None:
+                continue
+            thumbnail_path = self._get_thumbnail_path(digest)
+            thumbnails[url] = thumbnail_path
+            if not os.path.exists(thumbnail_path):
+                missing_thumbnails[digest] = thumbnail_path
+        if missing_thumbnails:
+            failed = self._make_thumbnails(missing_thumbnails)
+            thumbnails = {url: path for url, path in thumbnails.items() if path not in failed}
+
+        downloaded = sum(1 for url in missing if digests[url] is not None)
+        log.info("%d of %d photos ready in %.3f s (%d downloaded, %d downscaled)", len(thumbnails), len(urls),
+                 time.perf_counter() - start, downloaded, len(missing_thumbnails))
+        return thumbnails
+
+    def _get_url_path(self, url: str) -> str:
+        """
+        Get the path of the file pointing from a URL to the digest of its content.
+
+        Parameters:
+            url (str): URL of the photo.
+
+        Returns:
+            str: The path in the urls directory.
+        """
+        return os.path.join(self.directory, "urls", hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def _get_object_path(self, digest: str) -> str:
+        """
+        Get the path of a downloaded photo.
+
+        Parameters:
+            digest (str): SHA-256 hex digest of the photo.
+
+        Returns:
+            str: The path in the objects directory.
+        """
+        return os.path.join(self.directory, "objects", digest)
+
+    def _get_thumbnail_path(self, digest: str) -> str:
+        """
+        Get the path of a photo thumbnail.
+
+        Parameters:
+            digest (str): SHA-256 hex digest of the photo.
+
+        Returns:
+            str: The path in the thumbnails directory.
+        """
+        return os.path.join(self.directory, "thumbnails", f"{digest}-{self.THUMBNAIL_SIZE}.jpg")
+
+    def _get_url_digest(self, url: str) -> Optional[str]:
+        """
+        Get the digest of a photo downloaded before.
+
+        Parameters:
+            url (str): URL of the photo.
+
+        Returns:
+            Optional[str]: The digest, or None if the photo isn't cached.
+        """
+        try:
+            with open(self._get_url_path(url), encoding="utf-8") as url_file:
+                digest = url_file.read().strip()
+        except OSError:
+            return None
+        return digest if os.path.exists(self._get_object_path(digest)) else None
+
+    def _download(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Download photos concurrently and store them in the cache.
+
+        Parameters:
+            urls (List[str]): URLs of the photos.
+
+        Returns:
+            Dict[str, Optional[str]]: Digests of the photos by URL, None for photos that couldn't be downloaded.
+        """
+        workers = min(self.MAX_DOWNLOADS, len(urls))
+        with requests.Session() as session:
+            session.mount("http://", HTTPAdapter(pool_maxsize=workers))
+            session.mount("https://", HTTPAdapter(pool_maxsize=workers))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                digests = pool.map(lambda url: self._download_photo(session, url), urls)
+                return dict(zip(urls, digests))
+
+    def _download_photo(self, session: requests.Session, url: str) -> Optional[str]:
+        """
+        Download a single photo and store it by the digest of its content.
+
+        Parameters:
+            session (requests.Session): The session sharing connections between downloads.
+            url (str): URL of the photo.
+
+        Returns:
+            Optional[str]: The digest of the photo, or None if it couldn't be downloaded.
+        """
+        # The photo is streamed, so a too large one is dropped as soon as it passes the limit
+        chunks = []
+        size = 0
+        digest_hash = hashlib.sha256()
+        try:
+            with session.get(url, timeout=self.TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(self.CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > self.MAX_PHOTO_SIZE:
+                        log.warning("Photo %s is too large: over %d bytes", url, self.MAX_PHOTO_SIZE)
+                        return None
+                    digest_hash.update(chunk)
+                    chunks.append(chunk)
+        except requests.RequestException as e:
+            log.warning("Unable to download photo %s: %s", url, e)
+            return None
+        content = b"".join(chunks)
+        digest = digest_hash.hexdigest()
+        try:
+            if not os.path.exists(self._get_object_path(digest)):
+                write_atomically(self._get_object_path(digest), lambda stream: stream.write(content))
+            write_atomically(self._get_url_path(url), lambda stream: stream.write(digest.encode("utf-8")))
+        except OSError as e:
+            log.warning("Unable to store photo %s: %s", url, e)
+            return None
+        return digest
+
+    def _make_thumbnails(self, thumbnail_paths: Dict[str, str]) -> List[str]:
+        """
+        Downscale photos to thumbnails, in worker processes if there are enough of them.
+
+        Parameters:
+            thumbnail_paths (Dict[str, str]): Paths of the missing thumbnails by photo digest.
+
+        Returns:
+            List[str]: Paths of the thumbnails that couldn't be made.
+        """
+        jobs = [(self._get_object_path(digest), thumbnail_path, self.THUMBNAIL_SIZE)
+                for digest, thumbnail_path in thumbnail_paths.items()]
+        if self.max_workers > 1 and len(jobs) >= self.PROCESS_THRESHOLD:
+            try:
+                return self._make_thumbnails_in_processes(jobs)
+            except (BrokenProcessPool, OSError) as e:
+                log.warning("Unable to make thumbnails in worker processes, making them one by one: %s", e)
+        failed = []
+        for source_path, thumbnail_path, size in jobs:
+            try:
+                _make_thumbnail(source_path, thumbnail_path, size)
+            except Exception as e:
+                log.warning("Unable to make thumbnail of %s: %s", source_path, e)
+                failed.append(thumbnail_path)
+        return failed
+
+    def _make_thumbnails_in_processes(self, jobs: List[tuple]) -> List[str]:
+        """
+        Downscale photos to thumbnails in a process pool.
+
+        Parameters:
+            jobs (List[tuple]): Arguments of _make_thumbnail for each thumbnail.
+
+        Returns:
+            List[str]: Paths of the thumbnails that couldn't be made.
+        """
+        failed = []
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as pool:
+            futures = {pool.submit(_make_thumbnail, *job): job for job in jobs}
+            for future, (source_path, thumbnail_path, _) in futures.items():
+                try:
+                    future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    log.warning("Unable to make thumbnail of %s: %s", source_path, e)
+                    failed.append(thumbnail_path)
+        return failed
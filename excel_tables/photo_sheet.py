@@ -0,0 +1,104 @@
+import logging
+from typing import List, Tuple
+
+from openpyxl.drawing.image import Image
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+from GoogleMyMaps.models import Layer, Place
+from .courses import Courses
+from .photo_cache import PhotoCache
+
+log = logging.getLogger(__name__)
+
+
+class PhotoSheet:
+    """
+    A worksheet with thumbnails of the obstacle photos, added to a workbook.
+
+    Every obstacle of the main and kids courses with photos gets a row with its course, number and name,
+    followed by thumbnails of up to MAX_PHOTOS of its photos.
+
+    Attributes:
+        SHEET_TITLE (str): Title of the added worksheet.
+        HEADERS (List[str]): Headers of the text columns.
+        MAX_PHOTOS (int): Maximal number of photos of an obstacle.
+        PIXELS_PER_POINT (float): Pixels per point of the row height.
+        PIXELS_PER_CHARACTER (float): Pixels per character of the column width.
+    """
+
+    SHEET_TITLE = "ZDJĘCIA"
+    HEADERS = ["TRASA", "NR", "PRZESZKODA"]
+    MAX_PHOTOS = 3
+    PIXELS_PER_POINT = 4 / 3
+    PIXELS_PER_CHARACTER = 7
+
+    def __init__(self, courses: Courses, photo_cache: PhotoCache):
+        """
+        Initialize the photo sheet for the courses of a map.
+
+        Parameters:
+            courses (Courses): Courses of the map.
+            photo_cache (PhotoCache): Cache the thumbnails are taken from.
+        """
+        self.courses = courses
+        self.photo_cache = photo_cache
+
+    def get_obstacles(self) -> List[Tuple[Layer, int, Place]]:
+        """
+        Get the obstacles of the main and kids courses that have photos.
+
+        Returns:
+            List[Tuple[Layer, int, Place]]: Obstacles as tuples of (course layer, obstacle number, obstacle place).
+        """
+        courses_list = self.courses.courses_list
+        if not courses_list:
+            return []
+        main_courses = [courses_list[0]]
+        if len(courses_list) > 1 and "KIDS" in courses_list[-1].name.upper():
+            main_courses.append(courses_list[-1])
+        obstacles = []
+        for course in main_courses:
+            for place in course.places:
+                number = self.courses.get_obstacle_number(place)
+                if number is not None and place.photos:
+                    obstacles.append((course, number, place))
+        return obstacles
+
+    def add_to(self, wb) -> int:
+        """
+        Add the photo sheet to a workbook.
+
+        Parameters:
+            wb (Workbook): The workbook the sheet is added to.
+
+        Returns:
+            int: Number of embedded thumbnails.
+        """
+        obstacles = self.get_obstacles()
+        urls = [url for _, _, place in obstacles for url in place.photos[:self.MAX_PHOTOS]]
+        thumbnails = self.photo_cache.get_thumbnails(urls) if urls else {}
+
+        ws = wb.create_sheet(self.SHEET_TITLE)
+        for col, header in enumerate(self.HEADERS, start=1):
+            ws.cell(row=1, column=col, value=header).font = Font(bold=True)
+        ws.column_dimensions["A"].width = 16
+        ws.column_dimensions["B"].width = 6
+        ws.column_dimensions["C"].width = 30
+        photo_columns = range(len(self.HEADERS) + 1, len(self.HEADERS) + 1 + self.MAX_PHOTOS)
+        for col in photo_columns:
+            ws.column_dimensions[get_column_letter(col)].width = \
+                self.photo_cache.THUMBNAIL_SIZE / self.PIXELS_PER_CHARACTER + 1
+
+        embedded = 0
+        for row, (course, number, place) in enumerate(obstacles, start=2):
+            ws.cell(row=row, column=1, value=course.name[6:])
+            ws.cell(row=row, column=2, value=number)
+            ws.cell(row=row, column=3, value=place.name)
+            ws.row_dimensions[row].height = self.photo_cache.THUMBNAIL_SIZE / self.PIXELS_PER_POINT + 2
+            photo_paths = [thumbnails[url] for url in place.photos[:self.MAX_PHOTOS] if url in thumbnails]
+            for col, photo_path in zip(photo_columns, photo_paths):
+                ws.add_image(Image(photo_path), f"{get_column_letter(col)}{row}")
+                embedded += 1
+        log.info("Photo sheet with %d photos of %d obstacles added", embedded, len(obstacles))
+        return embedded
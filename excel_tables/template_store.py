@@ -0,0 +1,110 @@
+import logging
+import pickle
+import threading
+import time
+from typing import Dict, Optional
+
+import openpyxl as xl
+from openpyxl.workbook.workbook import Workbook
+
+log = logging.getLogger(__name__)
+
+
+class TemplateStore:
+    """
+    Process-wide store of preloaded Excel templates.
+
+    Every template is loaded and parsed by openpyxl only once per process. The parsed workbook is kept
+    as pickled bytes, and each caller gets an independent copy unpickled from them, which is several
+    times cheaper than parsing the styled template again. The bytes are never modified, so copies can be
+    made from any thread, and worker processes fill their own store on first use or in preload.
+    """
+
+    _templates: Dict[str, Optional[bytes]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def preload(*file_paths: str) -> None:
+        """
+        Load templates into the store in advance, e.g. in a worker process initializer.
+
+        Parameters:
+            *file_paths (str): Paths of the templates to load.
+        """
+        for file_path in file_paths:
+            TemplateStore._get_template(file_path)
+
+    @staticmethod
+    def _get_template(file_path: str) -> Optional[bytes]:
+        """
+        Get the pickled template workbook, loading it on first use.
+
+        Parameters:
+            file_path (str): Path of the template.
+
+        Returns:
+            Optional[bytes]: The pickled workbook, or None if the workbook can't be pickled.
+        """
+        with TemplateStore._lock:
+            if file_path in TemplateStore._templates:
+                return TemplateStore._templates[file_path]
+
+            start = time.perf_counter()
+            wb = xl.load_workbook(file_path)
+            load_time = time.perf_counter() - start
+            try:
+                template = pickle.dumps(wb, protocol=pickle.HIGHEST_PROTOCOL)
+                start = time.perf_counter()
+                TemplateStore._copy_workbook(template)
+                log.debug("Template %s preloaded: load %.3f s, copy %.3f s",
+                          file_path, load_time, time.perf_counter() - start)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                log.warning("Template %s can't be preloaded, it will be loaded every time: %s", file_path, e)
+                template = None
+            TemplateStore._templates[file_path] = template
+            return template
+
+    @staticmethod
+    def get_workbook(file_path: str) -> Workbook:
+        """
+        Get an independent copy of a template workbook.
+
+        Parameters:
+            file_path (str): Path of the template.
+
+        Returns:
+            Workbook: A new workbook with the template's content, which can be freely modified.
+        """
+        template = TemplateStore._get_template(file_path)
+        if template is None:
+            return xl.load_workbook(file_path)
+        return TemplateStore._copy_workbook(template)
+
+    @staticmethod
+    def _copy_workbook(template: bytes) -> Workbook:
+        """
+        Unpickle a workbook and rebind the parts of its worksheets that pickle doesn't restore.
+
+        Row and column dimension holders are default dictionaries whose factories are bound methods
+        of their worksheet, and unpickling loses them, so they are bound to the new worksheets again.
+
+        Parameters:
+            template (bytes): The pickled workbook.
+
+        Returns:
+            Workbook: The unpickled workbook.
+        """
+        wb = pickle.loads(template)
+        for ws in wb.worksheets:
+            for dimensions, factory in ((ws.row_dimensions, ws._add_row), (ws.column_dimensions, ws._add_column)):
+                dimensions.worksheet = ws
+                dimensions.default_factory = factory
+        return wb
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Remove all templates from the store.
+        """
+        with TemplateStore._lock:
+            TemplateStore._templates.clear()
@@ -0,0 +1,319 @@
+import logging
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import shapely
+from shapely import STRtree
+
+from GoogleMyMaps.models import Layer
+from .course_trail import CourseTrail
+from .courses import Courses
+
+log = logging.getLogger(__name__)
+
+
+class TrailOverlap:
+    """
+    Overlap between a course trail and the reference (longest) course trail.
+
+    Reference trail segments are buffered and stored in an STRtree, so every vertex of the course trail
+    is matched only against the few nearby reference segments. Consecutive vertices mapped consistently
+    onto the reference trail form shared stretches, which provide an offset mapping between the course's
+    chainage and the reference course's chainage. A stretch follows the reference trail in one direction,
+    so a course running the reference trail in reverse or turning back on it gets separate stretches.
+
+    Attributes:
+        BUFFER_DISTANCE (float): Maximal distance in meters between trails to treat them as shared.
+        EARTH_RADIUS (int): Radius of earth in meters, used by the local metric projection.
+        stretches (List[Tuple[float, float, float, float]]): Shared stretches as tuples of
+            (course start, course end, reference start, reference end) distances in meters,
+            the reference end being before the reference start for stretches run in reverse.
+        course_length (float): Length of the course trail in meters.
+    """
+
+    BUFFER_DISTANCE = 15
+    EARTH_RADIUS = 6371000
+
+    def __init__(self, reference_trail: CourseTrail, course_trail: CourseTrail):
+        """
+        Compute shared stretches of a course trail and the reference trail.
+
+        Parameters:
+            reference_trail (CourseTrail): The trail of the reference (longest) course.
+            course_trail (CourseTrail): The trail of the analysed course.
+        """
+        self.stretches: List[Tuple[float, float, float, float]] = []
+        self.course_length = 0.0
+        self._course_points: List[np.ndarray] = []
+        self._reference_points: List[np.ndarray] = []
+
+        if not reference_trail.trail or len(reference_trail.trail) < 2 \
+                or not course_trail.trail or len(course_trail.trail) < 2:
+            return
+        self._compute(np.asarray(reference_trail.trail, dtype=float), np.asarray(course_trail.trail, dtype=float))
+
+    @staticmethod
+    def _get_cumulative_distances(trail: np.ndarray) -> np.ndarray:
+        """
+        Calculate haversine distances from the start of the trail to each of its points.
+
+        Parameters:
+            trail (np.ndarray): Trail points as an (n, 2) array of (lat, lon) in decimal degrees.
+
+        Returns:
+            np.ndarray: Distances in meters, the first one being 0.
+        """
+        lat, lon = np.radians(trail[:, 0]), np.radians(trail[:, 1])
+        a = np.sin(np.diff(lat) / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lon) / 2) ** 2
+        segments = 2 * TrailOverlap.EARTH_RADIUS * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        return np.concatenate(([0.0], np.cumsum(segments)))
+
+    @staticmethod
+    def _project(trail: np.ndarray, reference_lat: float) -> np.ndarray:
+        """
+        Project (lat, lon) points to local planar coordinates in meters.
+
+        Parameters:
+            trail (np.ndarray): Points as an (n, 2) array of (lat, lon) in decimal degrees.
+            reference_lat (float): Latitude in decimal degrees at which the projection is undistorted.
+
+        Returns:
+            np.ndarray: Points as an (n, 2) array of (x, y) in meters.
+        """
+        radians = np.radians(trail)
+        return np.column_stack((
+            radians[:, 1] * TrailOverlap.EARTH_RADIUS * np.cos(np.radians(reference_lat)),
+            radians[:, 0] * TrailOverlap.EARTH_RADIUS
+        ))
+
+    def _compute(self, reference: np.ndarray, course: np.ndarray) -> None:
+        """
+        Match course trail vertices onto the reference trail and group them into shared stretches.
+
+        Parameters:
+            reference (np.ndarray): Reference trail points as an (n, 2) array of (lat, lon).
+            course (np.ndarray): Course trail points as an (m, 2) array of (lat, lon).
+        """
+        reference_lat = float(reference[:, 0].mean())
+        reference_xy = TrailOverlap._project(reference, reference_lat)
+        course_xy = TrailOverlap._project(course, reference_lat)
+        reference_chainage = TrailOverlap._get_cumulative_distances(reference)
+        course_chainage = TrailOverlap._get_cumulative_distances(course)
+        self.course_length = float(course_chainage[-1])
+
+        segments = shapely.linestrings(np.stack((reference_xy[:-1], reference_xy[1:]), axis=1))
+        tree = STRtree(shapely.buffer(segments, self.BUFFER_DISTANCE))
+        point_indexes, segment_indexes = tree.query(shapely.points(course_xy), predicate="intersects")
+
+        # Project every (course vertex, reference segment) candidate pair at once
+        starts = reference_xy[segment_indexes]
+        vectors = reference_xy[segment_indexes + 1] - starts
+        lengths = np.einsum("ij,ij->i", vectors, vectors)
+        offsets = course_xy[point_indexes] - starts
+        fractions = np.clip(
+            np.divide(np.einsum("ij,ij->i", offsets, vectors), lengths, out=np.zeros_like(lengths), where=lengths > 0),
+            0, 1
+        )
+        distances = np.hypot(*(offsets - vectors * fractions[:, None]).T)
+        candidate_chainage = reference_chainage[segment_indexes] + fractions * np.diff(reference_chainage)[segment_indexes]
+
+        order = np.argsort(point_indexes, kind="stable")
+        point_indexes, candidate_chainage, distances = point_indexes[order], candidate_chainage[order], distances[order]
+        bounds = np.searchsorted(point_indexes, np.arange(len(course) + 1))
+
+        stretch: List[Tuple[float, float]] = []
+        # Direction of the stretch along the reference trail, 0 until it has moved far enough to tell
+        direction = 0
+        # Index of the stretch point farthest along the reference trail in the stretch direction
+        turn = 0
+        for i in range(len(course)):
+            start, end = bounds[i], bounds[i + 1]
+            if start == end:
+                self._close_stretch(stretch, direction)
+                stretch, direction, turn = [], 0, 0
+                continue
+
+            if not stretch:
+                best = start + int(np.argmin(distances[start:end]))
+                stretch.append((float(course_chainage[i]), float(candidate_chainage[best])))
+                continue
+
+            course_delta = course_chainage[i] - stretch[-1][0]
+            best, deviation = start, np.inf
+            # The stretch direction is tried first, the other one finds a course turning back
+            for candidate_direction in ((direction, -direction) if direction else (1, -1)):
+                expected = stretch[-1][1] + candidate_direction * course_delta
+                candidate = start + int(np.argmin(np.abs(candidate_chainage[start:end] - expected)))
+                if abs(candidate_chainage[candidate] - expected) < deviation:
+                    best, deviation = candidate, abs(candidate_chainage[candidate] - expected)
+            point = (float(course_chainage[i]), float(candidate_chainage[best]))
+
+            if deviation > 2 * self.BUFFER_DISTANCE + 0.1 * course_delta:
+                self._close_stretch(stretch, direction)
+                best = start + int(np.argmin(distances[start:end]))
+                stretch, direction, turn = [(point[0], float(candidate_chainage[best]))], 0, 0
+                continue
+
+            if direction and (point[1] - stretch[turn][1]) * direction < -self.BUFFER_DISTANCE:
+                # The course turned back on the reference trail, the stretch is split at the turning point
+                self._close_stretch(stretch[:turn + 1], direction)
+                stretch, direction, turn = stretch[turn:], -direction, 0
+            stretch.append(point)
+            if not direction and abs(point[1] - stretch[0][1]) > self.BUFFER_DISTANCE:
+                direction = 1 if point[1] > stretch[0][1] else -1
+            if direction and (point[1] - stretch[turn][1]) * direction >= 0:
+                turn = len(stretch) - 1
+        self._close_stretch(stretch, direction)
+
+    def _close_stretch(self, stretch: List[Tuple[float, float]], direction: int) -> None:
+        """
+        Store a finished stretch of mapped vertices if it covers more than a single point.
+
+        The reference distances are made monotonic in the direction of the stretch, so a course
+        running the reference trail in reverse keeps decreasing reference distances.
+
+        Parameters:
+            stretch (List[Tuple[float, float]]): Mapped vertices as (course distance, reference distance) pairs.
+            direction (int): 1 if the course runs the reference trail forward, -1 if in reverse, 0 if unknown.
+        """
+        if len(stretch) < 2:
+            return
+        points = np.asarray(stretch)
+        course_points = points[:, 0]
+        if direction < 0:
+            reference_points = np.minimum.accumulate(points[:, 1])
+        else:
+            reference_points = np.maximum.accumulate(points[:, 1])
+        self._course_points.append(course_points)
+        self._reference_points.append(reference_points)
+        self.stretches.append((course_points[0], course_points[-1], reference_points[0], reference_points[-1]))
+
+    def get_shared_length(self) -> float:
+        """
+        Get the total length of the course trail shared with the reference trail.
+
+        Returns:
+            float: Shared length in meters.
+        """
+        return sum(course_end - course_start for course_start, course_end, _, _ in self.stretches)
+
+    def get_unshared_stretches(self) -> List[Tuple[float, float]]:
+        """
+        Get the parts of the course trail which don't run on the reference trail.
+
+        Returns:
+            List[Tuple[float, float]]: Unshared stretches as (start, end) course distances in meters.
+        """
+        unshared = []
+        position = 0.0
+        for course_start, course_end, _, _ in self.stretches:
+            if course_start > position:
+                unshared.append((position, course_start))
+            position = course_end
+        if self.course_length > position:
+            unshared.append((position, self.course_length))
+        return unshared
+
+    def get_reference_distance(self, course_distance: float) -> Optional[float]:
+        """
+        Map a distance along the course trail to the distance along the reference trail.
+
+        Parameters:
+            course_distance (float): Distance in meters from the start of the course trail.
+
+        Returns:
+            Optional[float]: Distance in meters from the start of the reference trail,
+                            or None if the course isn't on the reference trail at this distance.
+        """
+        index = bisect_right([stretch[0] for stretch in self.stretches], course_distance) - 1
+        if index < 0 or course_distance > self.stretches[index][1]:
+            return None
+        return float(np.interp(course_distance, self._course_points[index], self._reference_points[index]))
+
+    def get_course_distance(self, reference_distance: float,
+                            previous_course_distance: Optional[float] = None) -> Optional[float]:
+        """
+        Map a distance along the reference trail to the distance along the course trail.
+
+        If the course runs through the same part of the reference trail more than once, the pass closest
+        after the previous course distance is used, as the obstacles of a course are visited in order.
+        Without a previous course distance, or with no pass after it, the closest or the first pass is used.
+
+        Parameters:
+            reference_distance (float): Distance in meters from the start of the reference trail.
+            previous_course_distance (Optional[float]): Distance in meters from the start of the course trail
+                                                        to the previous obstacle of the course.
+
+        Returns:
+            Optional[float]: Distance in meters from the start of the course trail,
+                            or None if this part of the reference trail isn't shared with the course.
+        """
+        course_distances = []
+        for index, (_, _, reference_start, reference_end) in enumerate(self.stretches):
+            if min(reference_start, reference_end) <= reference_distance <= max(reference_start, reference_end):
+                reference_points, course_points = self._reference_points[index], self._course_points[index]
+                if reference_start > reference_end:
+                    reference_points, course_points = reference_points[::-1], course_points[::-1]
+                course_distances.append(float(np.interp(reference_distance, reference_points, course_points)))
+        if not course_distances or previous_course_distance is None:
+            return course_distances[0] if course_distances else None
+        # The stretches are ordered along the course, so the first pass after the previous one is the closest
+        for course_distance in course_distances:
+            if course_distance >= previous_course_distance - self.BUFFER_DISTANCE:
+                return course_distance
+        return min(course_distances, key=lambda course_distance: abs(course_distance - previous_course_distance))
+
+
+class TrailOverlaps:
+    """
+    Shared-trail analysis of all intermediate courses of a map against the reference (first) course.
+    """
+
+    def __init__(self, courses: Courses, course_trails: Optional[Dict[int, CourseTrail]] = None):
+        """
+        Compute trail overlaps of the intermediate courses with the reference course.
+
+        Parameters:
+            courses (Courses): Courses of the analysed map.
+            course_trails (Optional[Dict[int, CourseTrail]]): Already created trails by id of the course layer,
+                                                               used to avoid extracting the trails again.
+        """
+        course_trails = course_trails if course_trails is not None else {}
+        reference = courses.courses_list[0]
+        reference_trail = course_trails.get(id(reference)) or CourseTrail(reference)
+        self.overlaps: Dict[int, TrailOverlap] = {
+            id(course): TrailOverlap(reference_trail, course_trails.get(id(course)) or CourseTrail(course))
+            for course in courses.courses_list[1:-1]
+        }
+        for course in courses.courses_list[1:-1]:
+            TrailOverlaps._log_overlap(course, self.overlaps[id(course)])
+
+    @staticmethod
+    def _log_overlap(course: Layer, overlap: TrailOverlap) -> None:
+        """
+        Log the shared part of the course trail and warn about parts off the reference trail.
+
+        Parameters:
+            course (Layer): The analysed course layer.
+            overlap (TrailOverlap): The overlap of the course with the reference course.
+        """
+        if not overlap.course_length:
+            return
+        log.info("Course %s shares %.0f%% of its trail with the reference course",
+                 course.name, 100 * overlap.get_shared_length() / overlap.course_length)
+        for start, end in overlap.get_unshared_stretches():
+            log.warning("Course %s is off the reference trail from %.2f km to %.2f km",
+                        course.name, start / 1000, end / 1000)
+
+    def get_overlap(self, course: Layer) -> Optional[TrailOverlap]:
+        """
+        Get the overlap of a course with the reference course.
+
+        Parameters:
+            course (Layer): The course layer.
+
+        Returns:
+            Optional[TrailOverlap]: The overlap, or None for the reference and kids courses.
+        """
+        return self.overlaps.get(id(course))
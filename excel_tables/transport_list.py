@@ -0,0 +1,95 @@
+from typing import List, Optional, Tuple
+
+from GoogleMyMaps.models import Map, Layer, Place
+from .obstacle_list import ObstacleList
+from .obstacle_list_cache import ObstacleListCache
+from .obstacle_table import ObstacleTable
+
+
+class TransportList(ObstacleList):
+    """
+    A class for generating the transport list in Excel format.
+
+    The transport list has the layout of the obstacle list with an additional column
+    of the warehouse the obstacle's equipment is taken from.
+
+    Attributes:
+        COLUMN_STORAGE (int): Column index for the warehouse in the template.
+        column_storage (int): Column index for the warehouse after inserting the extra course columns.
+    """
+
+    COLUMN_STORAGE = 25
+    COLUMN_LAST = 25
+
+    file_name = "LISTA TRANSPORTOWA"
+    file_path = f"WZORY/{file_name}.xlsx"
+
+    def __init__(self, google_map: Map, cache: Optional[ObstacleListCache] = None,
+                 table: Optional[ObstacleTable] = None):
+        """
+        Initialize the TransportList with a Google Map.
+
+        Parameters:
+            google_map (Map): The Google Map object containing course and obstacle data.
+            cache (Optional[ObstacleListCache]): Cache of course results of the obstacle table.
+            table (Optional[ObstacleTable]): The obstacle table already computed from the map.
+        """
+        super().__init__(google_map, cache, table)
+        self.column_storage = self.COLUMN_STORAGE + self.column_last - self.COLUMN_LAST
+
+    def create(self) -> List[Tuple[Layer, int, Place]]:
+        """
+        Write all obstacle data and the warehouses to the workbook without saving it.
+
+        Returns:
+            List[Tuple[Layer, int, Place]]: Obstacles that couldn't be found, each represented as a tuple of
+            (course layer, obstacle number, obstacle place)
+        """
+        if self._data_written:
+            return self.not_found_obstacles
+        not_found_obstacles = super().create()
+        self._write_storage()
+        return not_found_obstacles
+
+    def _write_storage(self) -> None:
+        """
+        Write the warehouse of every obstacle of the main and kids courses.
+        """
+        if not self.courses.courses_list:
+            return
+        main_course, kids_course = self.courses.courses_list[0], self.courses.courses_list[-1]
+        kids_row_offset = self.courses.get_course_obstacles_number(
+            main_course) + self.ROW_OBSTACLES_OFFSET + self.ROW_KIDS_SPACING
+        self._write_course_storage(main_course, self.ROW_OBSTACLES_OFFSET)
+        if "KIDS" in kids_course.name.upper():
+            self._write_course_storage(kids_course, kids_row_offset)
+
+    def _write_course_storage(self, course: Layer, row_offset: int) -> None:
+        """
+        Write the warehouses of the obstacles of a course.
+
+        Parameters:
+            course (Layer): The main or kids course layer.
+            row_offset (int): The row offset of the course obstacles.
+        """
+        for obstacle in course.places:
+            obstacle_number = self.courses.get_obstacle_number(obstacle)
+            if obstacle_number is None or obstacle.data is None:
+                continue
+            storage = self._get_storage(obstacle)
+            if storage:
+                self._write_cell(self.column_storage, obstacle_number + row_offset, storage)
+
+    @staticmethod
+    def _get_storage(obstacle: Place) -> str:
+        """
+        Get the warehouse from the obstacle data.
+
+        Parameters:
+            obstacle (Place): The obstacle place object.
+
+        Returns:
+            str: The warehouse, or an empty string if the obstacle data has none.
+        """
+        normalized_data = {key[0].upper(): value for key, value in obstacle.data.items() if key}
+        return str(normalized_data.get("M", "")).strip()  # MAGAZYN
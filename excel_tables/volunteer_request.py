@@ -0,0 +1,58 @@
+import logging
+from typing import Dict, Optional
+
+from configs.utils import unify_string
+from .map_document import MapDocument
+
+log = logging.getLogger(__name__)
+
+
+class VolunteerRequest(MapDocument):
+    """
+    A class for generating the volunteer request in Excel format.
+
+    The template has a column for every preparation and cleaning day and for every course type.
+    The course columns get the minimal number of volunteers on the obstacles of the matching courses,
+    the preparation and cleaning days are filled in by hand.
+
+    Attributes:
+        ROW_HEADERS (int): Row index for the column headers.
+        ROW_VOLUNTEERS (int): Row index for the numbers of volunteers.
+    """
+
+    ROW_HEADERS = 1
+    ROW_VOLUNTEERS = 3
+
+    file_name = "ZAPOTRZEBOWANIE NA WOLO"
+    file_path = f"WZORY/{file_name}.xlsx"
+
+    def create(self) -> None:
+        """
+        Write the number of volunteers needed on each course type.
+        """
+        volunteers: Dict[int, int] = {}
+        for course_name, course_volunteers in self.context.volunteers.items():
+            column = self._get_course_column(course_name)
+            if column is None:
+                log.warning("No column for course %s in %s", course_name, self.file_name)
+                continue
+            volunteers[column] = volunteers.get(column, 0) + course_volunteers
+        for column, column_volunteers in volunteers.items():
+            self._write_cell(column, self.ROW_VOLUNTEERS, column_volunteers)
+
+    def _get_course_column(self, course_name: str) -> Optional[int]:
+        """
+        Find the column of a course type, e.g. "REKRUT / NOCNY REKRUT" for "TRASA NOCNY REKRUT".
+
+        Parameters:
+            course_name (str): Name of the course layer.
+
+        Returns:
+            Optional[int]: The column number (1-based), or None if no header matches the course.
+        """
+        course_type = unify_string(course_name[len("TRASA"):])
+        for col in range(1, self.ws.max_column + 1):
+            header = self._get_cell_value(col, self.ROW_HEADERS)
+            if header and course_type in (unify_string(part) for part in str(header).split("/")):
+                return col
+        return None
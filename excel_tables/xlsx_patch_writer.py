@@ -0,0 +1,616 @@
+import logging
+import posixpath
+import re
+import zipfile
+from typing import Any, Dict, List, Optional, Set, Tuple
+from xml.sax.saxutils import escape
+
+from openpyxl.utils import get_column_letter, column_index_from_string
+
+log = logging.getLogger(__name__)
+
+
+class XlsxPatchWriter:
+    """
+    A writer that saves a filled template without openpyxl's full serialization.
+
+    All parts of the template's zip archive are copied unchanged, except the modified worksheet, the shared
+    strings and the styles, which are patched as text. Rows of the worksheet without any change are copied
+    as they are, only the rows with written cells or grouping are rewritten, and the used range
+    in the <dimension> element is extended to the written cells.
+    The written cells, formulas, bold fonts and row/column grouping match what openpyxl would save.
+
+    Attributes:
+        BOLD_FONT (str): The font used for bold cells, the same as Font(bold=True, name="Calibri").
+        full_calc_on_load (bool): Whether to make Excel recalculate all formulas when opening the file,
+                                  needed when the patched file has cached formula results, e.g. after saving in Excel.
+    """
+
+    BOLD_FONT = '<font><b/><name val="Calibri"/></font>'
+
+    _ROW_PATTERN = re.compile(r'<row\b[^>]*?(?:/>|>.*?</row>)', re.DOTALL)
+    _CELL_PATTERN = re.compile(r'<c\b[^>]*?(?:/>|>.*?</c>)', re.DOTALL)
+    _ATTRIBUTE_PATTERN = re.compile(r'\s([\w:]+)="([^"]*)"')
+    _SHARED_STRING_PATTERN = re.compile(r'<si>(.*?)</si>', re.DOTALL)
+    _PLAIN_STRING_PATTERN = re.compile(r'<t(?: xml:space="preserve")?>([^<]*)</t>')
+
+    def __init__(self, template_path: str, worksheet_number: int = 0):
+        """
+        Initialize the writer for a template.
+
+        Parameters:
+            template_path (str): Path to the template xlsx file.
+            worksheet_number (int, optional): Index of the modified worksheet (0-based). Defaults to 0.
+        """
+        self.template_path = template_path
+        self.worksheet_number = worksheet_number
+        self.cells: Dict[Tuple[int, int], Any] = {}
+        self.bold_cells: Set[Tuple[int, int]] = set()
+        self.row_groups: List[Tuple[int, int, bool]] = []
+        self.column_groups: List[Tuple[int, int, bool]] = []
+        self.full_calc_on_load = False
+
+    def save(self, file_name: str) -> None:
+        """
+        Save the template with all changes to a file.
+
+        Parameters:
+            file_name (str): Path or file object the xlsx file is written to.
+        """
+        with zipfile.ZipFile(self.template_path) as template:
+            worksheet_part = self._get_worksheet_part(template)
+            styles_part = self._find_part(template, "styles")
+            strings_part = self._find_part(template, "sharedStrings")
+
+            shared_strings = _SharedStrings(template.read(strings_part).decode("utf-8") if strings_part else None)
+            styles = _Styles(template.read(styles_part).decode("utf-8") if styles_part and self.bold_cells else None)
+            worksheet = self._patch_worksheet(template.read(worksheet_part).decode("utf-8"), shared_strings, styles)
+
+            patched = {worksheet_part: worksheet}
+            if self.full_calc_on_load:
+                patched["xl/workbook.xml"] = self._set_full_calc_on_load(template.read("xl/workbook.xml").decode("utf-8"))
+            if strings_part and shared_strings.is_modified():
+                patched[strings_part] = shared_strings.to_xml()
+            if styles_part and styles.is_modified():
+                patched[styles_part] = styles.to_xml()
+
+            with zipfile.ZipFile(file_name, "w", zipfile.ZIP_DEFLATED) as output:
+                for item in template.infolist():
+                    if item.filename in patched:
+                        output.writestr(item, patched[item.filename].encode("utf-8"))
+                    else:
+                        output.writestr(item, template.read(item))
+
+    def _set_full_calc_on_load(self, workbook: str) -> str:
+        """
+        Set the full calculation on load flag in the workbook part.
+
+        Parameters:
+            workbook (str): The workbook.xml content.
+
+        Returns:
+            str: The patched workbook.xml content.
+        """
+        calc_properties = re.search(r'<calcPr\b[^>]*?/?>', workbook)
+        if calc_properties:
+            tag = self._set_attributes(calc_properties.group(0), {"fullCalcOnLoad": "1"})
+            return workbook[:calc_properties.start()] + tag + workbook[calc_properties.end():]
+        # calcPr follows the sheets and the optional function groups, external references and defined names
+        previous = None
+        for element in ("sheets", "functionGroups", "externalReferences", "definedNames"):
+            previous = re.search(rf'</{element}>|<{element}\b[^>]*/>', workbook) or previous
+        position = previous.end() if previous else workbook.rindex("</workbook>")
+        return workbook[:position] + '<calcPr fullCalcOnLoad="1"/>' + workbook[position:]
+
+    def _get_worksheet_part(self, template: zipfile.ZipFile) -> str:
+        """
+        Find the archive path of the modified worksheet.
+
+        Parameters:
+            template (zipfile.ZipFile): The opened template archive.
+
+        Returns:
+            str: Path of the worksheet part, e.g. "xl/worksheets/sheet1.xml".
+        """
+        workbook = template.read("xl/workbook.xml").decode("utf-8")
+        relationships = self._read_relationships(template)
+        sheet_ids = re.findall(r'<sheet\b[^>]*?\br:id="([^"]+)"', workbook)
+        return relationships[sheet_ids[self.worksheet_number]][1]
+
+    def _find_part(self, template: zipfile.ZipFile, relationship_type: str) -> Optional[str]:
+        """
+        Find the archive path of a workbook part of a given relationship type.
+
+        Parameters:
+            template (zipfile.ZipFile): The opened template archive.
+            relationship_type (str): The last segment of the relationship type, e.g. "styles".
+
+        Returns:
+            Optional[str]: Path of the part, or None if the workbook has no such part.
+        """
+        for part_type, part in self._read_relationships(template).values():
+            if part_type.endswith("/" + relationship_type):
+                return part
+        return None
+
+    @staticmethod
+    def _read_relationships(template: zipfile.ZipFile) -> Dict[str, Tuple[str, str]]:
+        """
+        Read relationships of the workbook part.
+
+        Parameters:
+            template (zipfile.ZipFile): The opened template archive.
+
+        Returns:
+            Dict[str, Tuple[str, str]]: Relationship types and archive paths of parts by relationship id.
+        """
+        relationships = {}
+        for relationship in re.findall(r'<Relationship\b[^>]*/>', template.read("xl/_rels/workbook.xml.rels").decode("utf-8")):
+            attributes = dict(XlsxPatchWriter._ATTRIBUTE_PATTERN.findall(relationship))
+            target = attributes["Target"]
+            part = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+            relationships[attributes["Id"]] = (attributes["Type"], part)
+        return relationships
+
+    def _patch_worksheet(self, xml: str, shared_strings: "_SharedStrings", styles: "_Styles") -> str:
+        """
+        Apply written cells and grouping to the worksheet XML.
+
+        Parameters:
+            xml (str): The template worksheet XML.
+            shared_strings (_SharedStrings): Shared strings of the workbook, new strings are added to them.
+            styles (_Styles): Styles of the workbook, bold styles are added to them.
+
+        Returns:
+            str: The patched worksheet XML.
+        """
+        rows_cells: Dict[int, Dict[int, Any]] = {}
+        for (col, row), value in self.cells.items():
+            rows_cells.setdefault(row, {})[col] = value
+        for col, row in self.bold_cells:
+            rows_cells.setdefault(row, {}).setdefault(col, _UNCHANGED)
+        grouped_rows: Dict[int, bool] = {}
+        for start_row, end_row, hidden in self.row_groups:
+            for row in range(start_row, end_row + 1):
+                grouped_rows[row] = hidden
+                rows_cells.setdefault(row, {})
+
+        data_start = xml.index("<sheetData")
+        data_end = xml.rindex("</sheetData>") if "</sheetData>" in xml else None
+        if data_end is None:
+            # Empty <sheetData/> element
+            data_end = data_start + len("<sheetData/>")
+            head, body, tail = xml[:data_start] + "<sheetData>", "", "</sheetData>" + xml[data_end:]
+        else:
+            body_start = xml.index(">", data_start) + 1
+            head, body, tail = xml[:body_start], xml[body_start:data_end], xml[data_end:]
+
+        parts = [self._patch_head(head)]
+        pending_rows = sorted(rows_cells)
+        pending_index = 0
+        for match in self._ROW_PATTERN.finditer(body):
+            row_xml = match.group(0)
+            row = int(re.search(r'\br="(\d+)"', row_xml).group(1))
+            while pending_index < len(pending_rows) and pending_rows[pending_index] < row:
+                new_row = pending_rows[pending_index]
+                parts.append(self._write_row(f'<row r="{new_row}"/>', rows_cells[new_row], grouped_rows.get(new_row),
+                                             shared_strings, styles))
+                pending_index += 1
+            if pending_index < len(pending_rows) and pending_rows[pending_index] == row:
+                parts.append(self._write_row(row_xml, rows_cells[row], grouped_rows.get(row), shared_strings, styles))
+                pending_index += 1
+            else:
+                parts.append(row_xml)
+        for new_row in pending_rows[pending_index:]:
+            parts.append(self._write_row(f'<row r="{new_row}"/>', rows_cells[new_row], grouped_rows.get(new_row),
+                                         shared_strings, styles))
+        parts.append(tail)
+        return "".join(parts)
+
+    def _patch_head(self, head: str) -> str:
+        """
+        Apply column grouping and outline levels to the worksheet XML before the sheet data.
+
+        Parameters:
+            head (str): The worksheet XML up to and including the <sheetData> start tag.
+
+        Returns:
+            str: The patched XML.
+        """
+        head = re.sub(r'<dimension\b[^>]*?/>', lambda match: self._patch_dimension(match.group(0)), head, count=1)
+        if self.row_groups or self.column_groups:
+            head = re.sub(
+                r'<sheetFormatPr\b[^>]*?/>',
+                lambda match: self._set_attributes(match.group(0), {
+                    "outlineLevelRow": "1" if self.row_groups else None,
+                    "outlineLevelCol": "1" if self.column_groups else None,
+                }),
+                head, count=1
+            )
+        if self.column_groups:
+            columns = [dict(self._ATTRIBUTE_PATTERN.findall(column))
+                       for column in re.findall(r'<col\b[^>]*/>', head)]
+            for start_col, end_col, hidden in self.column_groups:
+                columns = self._group_columns(columns, start_col, end_col, hidden)
+            cols_xml = "<cols>" + "".join(
+                "<col " + " ".join(f'{name}="{value}"' for name, value in column.items()) + "/>" for column in columns
+            ) + "</cols>"
+            if "<cols>" in head:
+                head = re.sub(r'<cols>.*?</cols>', lambda match: cols_xml, head, count=1, flags=re.DOTALL)
+            else:
+                head = head.replace("<sheetData", cols_xml + "<sheetData", 1)
+        return head
+
+    def _patch_dimension(self, tag: str) -> str:
+        """
+        Extend the used range of the worksheet to the written cells, like openpyxl computes it from the cells.
+
+        Parameters:
+            tag (str): The <dimension> element of the template, e.g. '<dimension ref="A1:X100"/>'.
+
+        Returns:
+            str: The element with the range covering the template range and all changes.
+        """
+        rows = [row for _, row in self.cells] + [row for _, row in self.bold_cells]
+        cols = [col for col, _ in self.cells] + [col for col, _ in self.bold_cells]
+        if not rows:
+            return tag
+        reference = re.search(r'\bref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"', tag)
+        if reference is None:
+            return tag
+        start_col, start_row = column_index_from_string(reference.group(1)), int(reference.group(2))
+        end_col = column_index_from_string(reference.group(3)) if reference.group(3) else start_col
+        end_row = int(reference.group(4)) if reference.group(4) else start_row
+        start_col, start_row = min([start_col] + cols), min([start_row] + rows)
+        end_col, end_row = max([end_col] + cols), max([end_row] + rows)
+        ref = f"{get_column_letter(start_col)}{start_row}"
+        if (end_col, end_row) != (start_col, start_row):
+            ref += f":{get_column_letter(end_col)}{end_row}"
+        return self._set_attributes(tag, {"ref": ref})
+
+    @staticmethod
+    def _group_columns(columns: List[Dict[str, str]], start_col: int, end_col: int,
+                       hidden: bool) -> List[Dict[str, str]]:
+        """
+        Group a range of columns in a list of <col> element attributes.
+
+        Like openpyxl, the grouped range takes the attributes of its first column.
+
+        Parameters:
+            columns (List[Dict[str, str]]): Attributes of the <col> elements.
+            start_col (int): First column of the group (1-based).
+            end_col (int): Last column of the group (1-based).
+            hidden (bool): Whether the grouped columns should be hidden.
+
+        Returns:
+            List[Dict[str, str]]: Attributes of the <col> elements after grouping, ordered by column.
+        """
+        group = {}
+        result = []
+        for column in columns:
+            column_min, column_max = int(column["min"]), int(column["max"])
+            if column_min <= start_col <= column_max:
+                group = dict(column)
+            if column_max < start_col or column_min > end_col:
+                result.append(column)
+                continue
+            if column_min < start_col:
+                result.append({**column, "max": str(start_col - 1)})
+            if column_max > end_col:
+                result.append({**column, "min": str(end_col + 1)})
+        group.update({"min": str(start_col), "max": str(end_col), "outlineLevel": "1"})
+        if hidden:
+            group["hidden"] = "1"
+        result.append(group)
+        return sorted(result, key=lambda column: int(column["min"]))
+
+    def _write_row(self, row_xml: str, cells: Dict[int, Any], hidden: Optional[bool],
+                   shared_strings: "_SharedStrings", styles: "_Styles") -> str:
+        """
+        Rewrite a single row with its written cells and grouping.
+
+        Parameters:
+            row_xml (str): The template row XML.
+            cells (Dict[int, Any]): Written values by column number, _UNCHANGED for cells that only become bold.
+            hidden (Optional[bool]): Whether the grouped row is hidden, or None if the row isn't grouped.
+            shared_strings (_SharedStrings): Shared strings of the workbook.
+            styles (_Styles): Styles of the workbook.
+
+        Returns:
+            str: The rewritten row XML.
+        """
+        start_tag_end = row_xml.index(">")
+        self_closing = row_xml[start_tag_end - 1] == "/"
+        start_tag = row_xml[:start_tag_end - 1 if self_closing else start_tag_end] + ">"
+        row = int(re.search(r'\br="(\d+)"', start_tag).group(1))
+        start_tag = self._set_attributes(start_tag, {
+            "spans": None,
+            "hidden": "1" if hidden else None,
+            "outlineLevel": "1" if hidden is not None else None,
+        })
+
+        existing = {}
+        if not self_closing:
+            for cell_xml in self._CELL_PATTERN.findall(row_xml[start_tag_end + 1:]):
+                reference = re.search(r'\br="([A-Z]+)\d+"', cell_xml).group(1)
+                existing[column_index_from_string(reference)] = cell_xml
+
+        columns = sorted(set(existing) | set(cells))
+        parts = [start_tag]
+        for col in columns:
+            if col not in cells:
+                parts.append(existing[col])
+                continue
+            cell_xml = existing.get(col)
+            if cell_xml is not None:
+                shared_strings.release(cell_xml)
+            parts.append(self._write_cell(f"{get_column_letter(col)}{row}", cell_xml, cells[col],
+                                          (col, row) in self.bold_cells, shared_strings, styles))
+        if not columns and self_closing:
+            return start_tag[:-1] + "/>"
+        parts.append("</row>")
+        return "".join(parts)
+
+    def _write_cell(self, reference: str, cell_xml: Optional[str], value: Any, bold: bool,
+                    shared_strings: "_SharedStrings", styles: "_Styles") -> str:
+        """
+        Write a single cell, keeping the style of the template cell.
+
+        Parameters:
+            reference (str): The cell reference, e.g. "A3".
+            cell_xml (Optional[str]): The template cell XML, or None if the template has no such cell.
+            value (Any): The written value, or _UNCHANGED to keep the template value.
+            bold (bool): Whether the cell should be bold.
+            shared_strings (_SharedStrings): Shared strings of the workbook.
+            styles (_Styles): Styles of the workbook.
+
+        Returns:
+            str: The cell XML.
+        """
+        attributes = dict(self._ATTRIBUTE_PATTERN.findall(cell_xml[:cell_xml.index(">")])) if cell_xml else {}
+        style = int(attributes.get("s", 0))
+        if bold:
+            style = styles.get_bold_style(style)
+        style_attribute = f' s="{style}"' if style else ""
+
+        if value is _UNCHANGED:
+            if cell_xml is None:
+                return f'<c r="{reference}"{style_attribute}/>'
+            shared_strings.retain(cell_xml)
+            return re.sub(r'^<c\b[^>]*?(/?)>',
+                          lambda match: self._set_attributes(match.group(0), {"s": str(style) if style else None}),
+                          cell_xml, count=1)
+
+        if value is None or value == "":
+            return f'<c r="{reference}"{style_attribute}/>'
+        if isinstance(value, bool):
+            return f'<c r="{reference}"{style_attribute} t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float)):
+            return f'<c r="{reference}"{style_attribute}><v>{value}</v></c>'
+        value = str(value)
+        if value.startswith("=") and len(value) > 1:
+            return f'<c r="{reference}"{style_attribute}><f>{escape(value[1:])}</f><v></v></c>'
+        if shared_strings.xml is None:
+            return f'<c r="{reference}"{style_attribute} t="inlineStr"><is>{_SharedStrings.text_xml(value)}</is></c>'
+        return f'<c r="{reference}"{style_attribute} t="s"><v>{shared_strings.add(value)}</v></c>'
+
+    @staticmethod
+    def _set_attributes(tag: str, attributes: Dict[str, Optional[str]]) -> str:
+        """
+        Set or remove attributes of an XML start tag.
+
+        Parameters:
+            tag (str): The start tag, e.g. '<row r="1">'.
+            attributes (Dict[str, Optional[str]]): New attribute values, None removes the attribute.
+
+        Returns:
+            str: The changed start tag.
+        """
+        for name, value in attributes.items():
+            pattern = re.compile(rf'\s{re.escape(name)}="[^"]*"')
+            if pattern.search(tag):
+                tag = pattern.sub(f' {name}="{value}"' if value is not None else "", tag, count=1)
+            elif value is not None:
+                end = -2 if tag.endswith("/>") else -1
+                tag = f'{tag[:end]} {name}="{value}"{tag[end:]}'
+        return tag
+
+
+class _Unchanged:
+    """Marker of a cell that is only made bold, without writing a new value."""
+
+
+_UNCHANGED = _Unchanged()
+
+
+class _SharedStrings:
+    """
+    The shared strings part of a workbook, with new strings appended at its end.
+    """
+
+    def __init__(self, xml: Optional[str]):
+        """
+        Read existing shared strings.
+
+        Parameters:
+            xml (Optional[str]): The sharedStrings.xml content, or None if the workbook has no shared strings.
+        """
+        self.xml = xml
+        self.indexes: Dict[str, int] = {}
+        self.new_strings: List[str] = []
+        self.count = 0
+        self.unique_count = 0
+        if xml is None:
+            return
+        items = XlsxPatchWriter._SHARED_STRING_PATTERN.findall(xml)
+        self.unique_count = len(items)
+        count = re.search(r'<sst\b[^>]*?\bcount="(\d+)"', xml)
+        self.count = int(count.group(1)) if count else 0
+        self._initial_count = self.count
+        for index, item in enumerate(items):
+            plain = XlsxPatchWriter._PLAIN_STRING_PATTERN.fullmatch(item)
+            if plain:
+                self.indexes.setdefault(_SharedStrings.unescape(plain.group(1)), index)
+
+    @staticmethod
+    def unescape(text: str) -> str:
+        """
+        Unescape XML entities of a text node.
+
+        Parameters:
+            text (str): Escaped text.
+
+        Returns:
+            str: Unescaped text.
+        """
+        return text.replace("&lt;", "<").replace("&gt;", ">").replace("&quot;", '"').replace("&amp;", "&")
+
+    @staticmethod
+    def text_xml(value: str) -> str:
+        """
+        Create a <t> element with a string value.
+
+        Parameters:
+            value (str): The string.
+
+        Returns:
+            str: The <t> element, preserving leading and trailing whitespace.
+        """
+        if value != value.strip():
+            return f'<t xml:space="preserve">{escape(value)}</t>'
+        return f"<t>{escape(value)}</t>"
+
+    def add(self, value: str) -> int:
+        """
+        Get the index of a string, adding it if it's a new one.
+
+        Parameters:
+            value (str): The string.
+
+        Returns:
+            int: Index of the string in the shared strings.
+        """
+        self.count += 1
+        index = self.indexes.get(value)
+        if index is None:
+            index = self.unique_count + len(self.new_strings)
+            self.indexes[value] = index
+            self.new_strings.append(value)
+        return index
+
+    def release(self, cell_xml: str) -> None:
+        """
+        Decrease the reference count for a template cell that is overwritten, if it held a shared string.
+
+        Parameters:
+            cell_xml (str): The template cell XML.
+        """
+        if 't="s"' in cell_xml:
+            self.count -= 1
+
+    def retain(self, cell_xml: str) -> None:
+        """
+        Restore the reference count of a released template cell that is kept.
+
+        Parameters:
+            cell_xml (str): The template cell XML.
+        """
+        if 't="s"' in cell_xml:
+            self.count += 1
+
+    def is_modified(self) -> bool:
+        """
+        Check whether the shared strings have to be written again.
+
+        Returns:
+            bool: True if strings were added or the reference count changed.
+        """
+        return bool(self.new_strings) or self.count != self._initial_count
+
+    def to_xml(self) -> str:
+        """
+        Create the shared strings XML with new strings appended.
+
+        Returns:
+            str: The sharedStrings.xml content.
+        """
+        unique_count = self.unique_count + len(self.new_strings)
+        xml = re.sub(r'(<sst\b[^>]*?\bcount=")\d+', rf'\g<1>{self.count}', self.xml, count=1)
+        xml = re.sub(r'(<sst\b[^>]*?\buniqueCount=")\d+', rf'\g<1>{unique_count}', xml, count=1)
+        new_items = "".join(f"<si>{_SharedStrings.text_xml(value)}</si>" for value in self.new_strings)
+        if xml.rstrip().endswith("/>"):
+            # Empty <sst/> element
+            end = xml.rindex("/>")
+            return f"{xml[:end]}>{new_items}</sst>"
+        end = xml.rindex("</sst>")
+        return xml[:end] + new_items + xml[end:]
+
+
+class _Styles:
+    """
+    The styles part of a workbook, with the bold font and bold variants of cell formats appended.
+    """
+
+    def __init__(self, xml: Optional[str]):
+        """
+        Read existing styles.
+
+        Parameters:
+            xml (Optional[str]): The styles.xml content, or None if no bold cells are needed.
+        """
+        self.xml = xml
+        self.bold_styles: Dict[int, int] = {}
+        self.new_formats: List[str] = []
+        self.formats: List[str] = []
+        self.fonts_count = 0
+        if xml is None:
+            return
+        cell_formats = re.search(r'<cellXfs\b[^>]*>(.*?)</cellXfs>', xml, re.DOTALL).group(1)
+        self.formats = re.findall(r'<xf\b[^>]*?(?:/>|>.*?</xf>)', cell_formats, re.DOTALL)
+        self.fonts_count = len(re.findall(r'<font\b', re.search(r'<fonts\b.*?</fonts>', xml, re.DOTALL).group(0)))
+
+    def get_bold_style(self, style: int) -> int:
+        """
+        Get the index of the bold variant of a cell format.
+
+        Parameters:
+            style (int): Index of the cell format.
+
+        Returns:
+            int: Index of the same cell format with the bold font.
+        """
+        if self.xml is None:
+            return style
+        if style not in self.bold_styles:
+            cell_format = self.formats[style] if style < len(self.formats) else '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+            start_tag_end = cell_format.index(">")
+            start_tag = XlsxPatchWriter._set_attributes(
+                cell_format[:start_tag_end + 1],
+                {"fontId": str(self.fonts_count), "applyFont": "1"}
+            )
+            self.bold_styles[style] = len(self.formats) + len(self.new_formats)
+            self.new_formats.append(start_tag + cell_format[start_tag_end + 1:])
+        return self.bold_styles[style]
+
+    def is_modified(self) -> bool:
+        """
+        Check whether the styles have to be written again.
+
+        Returns:
+            bool: True if any bold cell format was added.
+        """
+        return bool(self.new_formats)
+
+    def to_xml(self) -> str:
+        """
+        Create the styles XML with the bold font and new cell formats appended.
+
+        Returns:
+            str: The styles.xml content.
+        """
+        xml = re.sub(r'(<fonts\b[^>]*?\bcount=")\d+', rf'\g<1>{self.fonts_count + 1}', self.xml, count=1)
+        xml = xml.replace("</fonts>", XlsxPatchWriter.BOLD_FONT + "</fonts>", 1)
+        formats_count = len(self.formats) + len(self.new_formats)
+        xml = re.sub(r'(<cellXfs\b[^>]*?\bcount=")\d+', rf'\g<1>{formats_count}', xml, count=1)
+        return xml.replace("</cellXfs>", "".join(self.new_formats) + "</cellXfs>", 1)
+
@@ -1,5 +1,8 @@
+import base64
+import io
 import logging
 import tkinter as tk
+from typing import Optional
 
 from configs.utils import start_application, Colors
 
@@ -10,13 +13,24 @@ class FinalFrame(tk.Frame):
     """
     A frame that displays a success message after generating an obstacle list.
     
-    This frame provides a button to open the generated file and automatically
-    closes the application after opening the file.
+    This frame provides a button to open the generated file, and a button
+    returning to the map link frame to generate the list of another map.
+    A preview of the map is shown next to the buttons, for a quick visual check of the result.
+    The watch mode button keeps updating the generated file while the map is being edited.
     
     Attributes:
+        PREVIEW_SIZE (int): The longer side of the shown preview in pixels.
         controller: The parent controller that manages this frame
         open_button: Button widget that opens the generated file
+        documents_button: Button widget that generates all documents of the event
+        export_button: Button widget that exports the obstacle table to CSV or JSON Lines
+        new_map_button: Button widget that returns to the map link frame
+        watch_button: Button widget that starts or stops watching the map for changes
+        watch_status_label: Label widget showing the result of the last watch poll
+        preview_label: Label widget showing the map preview
     """
+
+    PREVIEW_SIZE = 260
     
     def __init__(self, parent, controller):
         """
@@ -36,6 +50,9 @@ class FinalFrame(tk.Frame):
         content_frame = tk.Frame(self, bg=Colors.BG_COLOR)
         content_frame.grid(row=0, column=0)
 
+        self.preview_label = tk.Label(self, bg=Colors.BG_COLOR)
+        self._preview_image: Optional[tk.PhotoImage] = None
+
         label = tk.Label(
             content_frame,
             text="Wygenerowano Listę Przeszkód!",
@@ -43,7 +60,7 @@ class FinalFrame(tk.Frame):
             bg=Colors.BG_COLOR,
             fg=Colors.YELLOW
         )
-        label.pack(pady=(0, 60))
+        label.pack(pady=(0, 20))
 
         self.open_button = tk.Button(
             content_frame,
@@ -60,34 +77,140 @@ class FinalFrame(tk.Frame):
         )
         self.open_button.pack(pady=10)
 
-        self.open_button.bind("<Enter>", self.on_enter)
-        self.open_button.bind("<Leave>", self.on_leave)
+        self.documents_button = tk.Button(
+            content_frame,
+            text="WSZYSTKIE DOKUMENTY",
+            font=("Runmageddon", 14),
+            bg=Colors.YELLOW,
+            fg=Colors.BLACK,
+            activeforeground=Colors.YELLOW,
+            activebackground=Colors.BG_COLOR,
+            bd=5,
+            width=21,
+            command=self.controller.generate_documents,
+            cursor="hand2"
+        )
+        self.documents_button.pack(pady=5)
+
+        self.export_button = tk.Button(
+            content_frame,
+            text="EKSPORT CSV / JSON",
+            font=("Runmageddon", 14),
+            bg=Colors.YELLOW,
+            fg=Colors.BLACK,
+            activeforeground=Colors.YELLOW,
+            activebackground=Colors.BG_COLOR,
+            bd=5,
+            width=21,
+            command=self.controller.export_obstacle_table,
+            cursor="hand2"
+        )
+        self.export_button.pack(pady=5)
+
+        self.new_map_button = tk.Button(
+            content_frame,
+            text="NOWA MAPA",
+            font=("Runmageddon", 14),
+            bg=Colors.YELLOW,
+            fg=Colors.BLACK,
+            activeforeground=Colors.YELLOW,
+            activebackground=Colors.BG_COLOR,
+            bd=5,
+            width=21,
+            command=self.controller.reopen_map_frame,
+            cursor="hand2"
+        )
+        self.new_map_button.pack(pady=5)
+
+        self.watch_button = tk.Button(
+            content_frame,
+            text="OBSERWUJ ZMIANY",
+            font=("Runmageddon", 14),
+            bg=Colors.YELLOW,
+            fg=Colors.BLACK,
+            activeforeground=Colors.YELLOW,
+            activebackground=Colors.BG_COLOR,
+            bd=5,
+            width=21,
+            command=self.controller.toggle_map_watch,
+            cursor="hand2"
+        )
+        self.watch_button.pack(pady=5)
+
+        self.watch_status_label = tk.Label(
+            content_frame,
+            text="",
+            font=("Runmageddon", 10),
+            bg=Colors.BG_COLOR,
+            fg=Colors.TEXT_COLOR
+        )
+        self.watch_status_label.pack()
+
+        for button in (self.open_button, self.documents_button, self.export_button, self.new_map_button,
+                       self.watch_button):
+            button.bind("<Enter>", self.on_enter)
+            button.bind("<Leave>", self.on_leave)
+
+    def show_preview(self, png: Optional[bytes]):
+        """
+        Show the map preview next to the buttons, or hide it.
+        
+        Parameters:
+            png (Optional[bytes]): The preview as a PNG image, None to hide the preview
+        """
+        if png is None:
+            self.preview_label.grid_remove()
+            self._preview_image = None
+            return
+        from PIL import Image
+
+        image = Image.open(io.BytesIO(png))
+        image.thumbnail((self.PREVIEW_SIZE, self.PREVIEW_SIZE))
+        stream = io.BytesIO()
+        image.save(stream, "PNG")
+        # The image must be referenced, otherwise Tk shows an empty label
+        self._preview_image = tk.PhotoImage(data=base64.b64encode(stream.getvalue()))
+        self.preview_label.config(image=self._preview_image)
+        self.preview_label.grid(row=0, column=1, padx=(0, 20))
+
+    def show_watch_status(self, watching: bool, status: str = "", error: bool = False):
+        """
+        Show whether the map is watched and the result of the last watch poll.
+        
+        Parameters:
+            watching (bool): Whether the map is watched
+            status (str): The result of the last poll
+            error (bool): Whether the last poll failed
+        """
+        self.watch_button.config(text="ZATRZYMAJ OBSERWACJĘ" if watching else "OBSERWUJ ZMIANY")
+        self.watch_status_label.config(text=status, fg=Colors.ERROR_RED if error else Colors.TEXT_COLOR)
 
     def on_enter(self, event):
         """
-        Handle mouse enter event for the open button.
+        Handle mouse enter event for the buttons.
         
         Parameters:
             event: The event object containing information about the event
         """
-        self.open_button.config(bg=Colors.YELLOW, fg=Colors.BG_VERY_LIGHT)
+        event.widget.config(bg=Colors.YELLOW, fg=Colors.BG_VERY_LIGHT)
 
     def on_leave(self, event):
         """
-        Handle mouse leave event for the open button.
+        Handle mouse leave event for the buttons.
         
         Parameters:
             event: The event object containing information about the event
         """
-        self.open_button.config(bg=Colors.YELLOW, fg=Colors.BLACK)
+        event.widget.config(bg=Colors.YELLOW, fg=Colors.BLACK)
 
     # noinspection PyUnusedLocal
     def open_file(self, event=None):
         """
-        Open the generated obstacle list file and close the application.
+        Open the generated obstacle list file.
         
-        This method retrieves the file path from the controller, opens the file
-        using the system's default application, and then closes the current application.
+        This method retrieves the file path from the controller and opens the file
+        using the system's default application. The application stays open, so lists
+        of other maps can be generated without restarting it.
         
         Parameters:
             event: Optional event parameter for binding to keyboard events (not used)
@@ -95,7 +218,6 @@ class FinalFrame(tk.Frame):
         obstacle_list_file = self.controller.obstacle_list_file
         if obstacle_list_file:
             start_application(obstacle_list_file)
-            self.controller.destroy()
 
     def bind_open_button(self):
         """
@@ -0,0 +1,318 @@
+import logging
+import queue
+import threading
+from typing import TYPE_CHECKING, Optional, Tuple, Any
+
+from GoogleMyMaps import GoogleMyMaps
+from configs.progress import Progress, ProgressEvent
+from excel_tables.map_validator import MapValidator
+from excel_tables.obstacle_list_cache import ObstacleListCache
+from .map_prefetch import MapPrefetch
+
+if TYPE_CHECKING:
+    from excel_tables.obstacle_list import ObstacleList
+    from excel_tables.photo_cache import PhotoCache
+
+log = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """
+    Raised in the worker thread when the job was cancelled.
+    """
+
+
+class GenerationJob:
+    """
+    Generation of an obstacle list for a map link in a background thread.
+
+    The worker thread never touches Tk widgets, it only puts messages to a thread-safe queue,
+    which the GUI polls with after. A message is a tuple of (kind, payload):
+
+    - ("progress", ProgressEvent): The job advanced.
+    - ("map", Map): The map was loaded.
+    - ("preview", bytes): The preview of the map was rendered as a PNG image.
+    - ("ready", ObstacleList): The obstacle list was generated and waits for a file path, see save.
+    - ("saved", str): The obstacle list was saved to the path.
+    - ("updated", ObstacleListUpdater): The previously generated obstacle list was updated.
+    - ("failed", str): The job failed with the error message.
+    - ("cancelled", None): The job stopped after a cancel.
+
+    The job can be cancelled at any time, it stops before its next stage. If the map was already prefetched
+    while the user was entering the link, the job takes over the prefetch instead of downloading the map again.
+    The time spent in each stage is logged when the job ends. The modules computing and rendering
+    the obstacle list, which import openpyxl and shapely, are imported by the worker thread when the job runs.
+
+    Attributes:
+        map_link (str): Link of the map.
+        update_workbook_path (Optional[str]): Path of a previously generated obstacle list to update
+                                              instead of generating a new one.
+        photo_cache (Optional[PhotoCache]): If set, the obstacle list gets a sheet with the obstacle photos.
+        prefetch (Optional[MapPrefetch]): Running or finished prefetch of the map taken over by the job.
+        render_preview (bool): Whether a preview of the map is rendered after it's loaded.
+        preview_sheet (bool): Whether the rendered preview is added to the obstacle list as a sheet.
+        messages (queue.Queue): Messages for the GUI.
+        google_map (Optional[Map]): The loaded map.
+        obstacle_list (Optional[ObstacleList]): The generated obstacle list, available with the "ready" message.
+        progress (Progress): Progress of the job stages.
+    """
+
+    GENERATE_STAGES = ["download", "decode", "preview", "zones", "chainage", "matching", "render", "save"]
+    UPDATE_STAGES = ["download", "decode", "preview", "update"]
+
+    def __init__(self, gmm: GoogleMyMaps, map_link: str, cache: ObstacleListCache,
+                 update_workbook_path: Optional[str] = None, photo_cache: Optional["PhotoCache"] = None,
+                 prefetch: Optional[MapPrefetch] = None, render_preview: bool = True, preview_sheet: bool = False):
+        """
+        Initialize the job, use start to run it.
+
+        Parameters:
+            gmm (GoogleMyMaps): The map loader.
+            map_link (str): Link of the map.
+            cache (ObstacleListCache): Cache of course results from previous generations.
+            update_workbook_path (Optional[str]): Path of a previously generated obstacle list to update.
+            photo_cache (Optional[PhotoCache]): Cache of the obstacle photos, if they are added to the list.
+            prefetch (Optional[MapPrefetch]): Prefetch of the same map link, used instead of loading the map.
+            render_preview (bool): Whether a preview of the map is rendered after it's loaded.
+            preview_sheet (bool): Whether the rendered preview is added to the obstacle list as a sheet.
+        """
+        self.gmm = gmm
+        self.map_link = map_link
+        self.cache = cache
+        self.update_workbook_path = update_workbook_path
+        self.photo_cache = photo_cache
+        self.prefetch = prefetch
+        self.render_preview = render_preview
+        self.preview_sheet = preview_sheet
+        self.messages: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self.google_map = None
+        self.obstacle_list: Optional["ObstacleList"] = None
+        self.preview_png: Optional[bytes] = None
+        stages = self.UPDATE_STAGES if update_workbook_path else self.GENERATE_STAGES
+        if not render_preview:
+            stages = [stage for stage in stages if stage != "preview"]
+        self.progress = Progress(stages, self._put_progress)
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start generating the obstacle list in a background thread.
+        """
+        self._start_thread(self._generate)
+
+    def save(self, file_path: str) -> None:
+        """
+        Save the generated obstacle list in a background thread, after the "ready" message.
+
+        Parameters:
+            file_path (str): Path of the saved file.
+        """
+        self._start_thread(lambda: self._save(file_path))
+
+    def cancel(self) -> None:
+        """
+        Cancel the job, it stops before its next stage.
+        """
+        log.info("Cancelling generation of %s", self.map_link)
+        self._cancelled.set()
+        if self.prefetch is not None:
+            self.prefetch.cancel()
+
+    def is_running(self) -> bool:
+        """
+        Check whether the worker thread is still running.
+
+        Returns:
+            bool: True while the job is generating or saving.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_messages(self):
+        """
+        Get all messages put to the queue since the last call, without waiting.
+
+        Returns:
+            Iterator[Tuple[str, Any]]: The messages as tuples of (kind, payload).
+        """
+        while True:
+            try:
+                yield self.messages.get_nowait()
+            except queue.Empty:
+                return
+
+    def _start_thread(self, target) -> None:
+        """
+        Run a stage of the job in a new daemon thread.
+
+        Parameters:
+            target: The function run in the thread.
+        """
+        self._thread = threading.Thread(target=target, name="GenerationJob", daemon=True)
+        self._thread.start()
+
+    def _put_progress(self, event: ProgressEvent) -> None:
+        """
+        Put a progress event to the queue for the GUI.
+
+        Parameters:
+            event (ProgressEvent): The progress event.
+        """
+        self.messages.put(("progress", event))
+
+    def _on_download(self, received: int, total: Optional[int]) -> None:
+        """
+        Report the downloaded part of the map page and stop the download if the job was cancelled.
+
+        Parameters:
+            received (int): Downloaded bytes.
+            total (Optional[int]): Size of the page in bytes, None if unknown.
+        """
+        self._report_download(received, total)
+        self._check_cancelled()
+
+    def _report_download(self, received: int, total: Optional[int]) -> None:
+        """
+        Report the downloaded part of the map page.
+
+        Parameters:
+            received (int): Downloaded bytes.
+            total (Optional[int]): Size of the page in bytes, None if unknown.
+        """
+        self.progress.advance(received, total, f"{received // 1024} kB")
+
+    def _check_cancelled(self) -> None:
+        """
+        Stop the job between stages, or between courses of the obstacle table, if it was cancelled.
+
+        Raises:
+            JobCancelled: If the job was cancelled.
+        """
+        if self._cancelled.is_set():
+            raise JobCancelled()
+
+    def _generate(self) -> None:
+        """
+        Load the map and generate or update the obstacle list, in the worker thread.
+        """
+        finished = True
+        try:
+            try:
+                if self.prefetch is not None:
+                    self._take_over_prefetch()
+                else:
+                    with self.progress.stage("download"):
+                        raw_data = self.gmm.download_map(self.map_link, self._on_download)
+                    self._check_cancelled()
+                    with self.progress.stage("decode"):
+                        self.google_map = self.gmm.decode_map(self.map_link, raw_data)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                self.messages.put(("failed", str(e)))
+                return
+            self._check_cancelled()
+            log.info("Map loaded successfully")
+            self.messages.put(("map", self.google_map))
+
+            validation_report = MapValidator.validate(self.google_map)
+            validation_report.log()
+            if not validation_report.is_valid:
+                self.messages.put(("failed", str(validation_report)))
+                return
+            self._check_cancelled()
+
+            if self.render_preview:
+                with self.progress.stage("preview"):
+                    self._render_preview()
+                self._check_cancelled()
+
+            if self.update_workbook_path:
+                with self.progress.stage("update"):
+                    self._update()
+                return
+
+            from excel_tables.obstacle_list import ObstacleList
+            from excel_tables.obstacle_table import ObstacleTableBuilder
+
+            table = ObstacleTableBuilder(self.google_map, self.cache, self.progress, self._check_cancelled).build()
+            self._check_cancelled()
+            with self.progress.stage("render"):
+                obstacle_list = ObstacleList(self.google_map, table=table)
+                obstacle_list.photo_cache = self.photo_cache
+                if self.preview_sheet:
+                    obstacle_list.preview_png = self.preview_png
+                obstacle_list.create()
+            self._check_cancelled()
+            self.obstacle_list = obstacle_list
+            finished = False
+            self.messages.put(("ready", obstacle_list))
+        except JobCancelled:
+            self.messages.put(("cancelled", None))
+        except Exception as e:
+            log.exception("Error generating obstacle list")
+            self.messages.put(("failed", str(e)))
+        finally:
+            if finished:
+                self.progress.log_timings()
+
+    def _take_over_prefetch(self) -> None:
+        """
+        Wait for the prefetch of the map to finish, reporting its download progress, in the worker thread.
+        """
+        with self.progress.stage("download"):
+            self.prefetch.attach(self._report_download)
+            self.prefetch.wait_for_download(self._check_cancelled)
+        self._check_cancelled()
+        with self.progress.stage("decode"):
+            self.google_map = self.prefetch.wait_for_map(self._check_cancelled)
+
+    def _render_preview(self) -> None:
+        """
+        Render the preview of the loaded map, in the worker thread.
+
+        A failed preview is only logged, the obstacle list is generated without it.
+        """
+        from excel_tables.map_preview import MapPreview
+
+        try:
+            self.preview_png = MapPreview(self.google_map).to_png()
+        except Exception as e:
+            log.warning("Failed to render map preview: %s", e)
+            return
+        self.messages.put(("preview", self.preview_png))
+
+    def _update(self) -> None:
+        """
+        Update the previously generated obstacle list, in the worker thread.
+        """
+        from excel_tables.obstacle_list_updater import ObstacleListUpdater
+
+        updater = ObstacleListUpdater(self.google_map, self.update_workbook_path, self.cache)
+        try:
+            updater.update()
+        except Exception as e:
+            log.error("Error updating file %s: %s", self.update_workbook_path, e)
+            self.messages.put(("failed", f"Nie udało się zaktualizować pliku: {e}"))
+            return
+        self.messages.put(("updated", updater))
+
+    def _save(self, file_path: str) -> None:
+        """
+        Save the generated obstacle list, in the worker thread.
+
+        Parameters:
+            file_path (str): Path of the saved file.
+        """
+        try:
+            self._check_cancelled()
+            with self.progress.stage("save"):
+                self.obstacle_list.save_to_path(file_path)
+            self.messages.put(("saved", file_path))
+        except JobCancelled:
+            self.messages.put(("cancelled", None))
+        except Exception as e:
+            log.error("Error saving file %s: %s", file_path, e)
+            self.messages.put(("failed", f"Nie udało się zapisać pliku: {e}"))
+        finally:
+            self.progress.log_timings()
@@ -0,0 +1,234 @@
+import itertools
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from GoogleMyMaps import GoogleMyMaps
+from excel_tables.obstacle_list_cache import ObstacleListCache
+from .generation_job import GenerationJob
+
+if TYPE_CHECKING:
+    from excel_tables.obstacle_list import ObstacleList
+    from excel_tables.photo_cache import PhotoCache
+
+log = logging.getLogger(__name__)
+
+
+class QueuedJob:
+    """
+    A map in the job queue with the state of its generation.
+
+    Attributes:
+        QUEUED, RUNNING, READY, SAVING, SAVED, FAILED, CANCELLED (str): The job statuses.
+        FINISHED (tuple): Statuses of jobs that won't change anymore.
+        id (int): Identifier of the job, unique in the queue.
+        map_link (str): Link of the map.
+        name (str): Name of the map once it's loaded, the link before.
+        status (str): The job status.
+        fraction (float): Done part of the generation from 0 to 1.
+        detail (str): The current stage while running, or the error message of a failed job.
+        obstacle_list (Optional[ObstacleList]): The generated obstacle list, set when the job is ready.
+        file_path (Optional[str]): Path the obstacle list is saved to.
+        job (GenerationJob): The generation job running in the background.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    READY = "ready"
+    SAVING = "saving"
+    SAVED = "saved"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    FINISHED = (SAVED, FAILED, CANCELLED)
+
+    def __init__(self, job_id: int, job: GenerationJob):
+        """
+        Initialize a queued job.
+
+        Parameters:
+            job_id (int): Identifier of the job.
+            job (GenerationJob): The generation job, not started yet.
+        """
+        self.id = job_id
+        self.job = job
+        self.map_link = job.map_link
+        self.name = job.map_link
+        self.status = self.QUEUED
+        self.fraction = 0.0
+        self.detail = ""
+        self.obstacle_list: Optional["ObstacleList"] = None
+        self.file_path: Optional[str] = None
+
+    def is_active(self) -> bool:
+        """
+        Check whether the job runs in the background.
+
+        Returns:
+            bool: True while the obstacle list is generated or saved.
+        """
+        return self.status in (self.RUNNING, self.SAVING)
+
+
+class JobQueue:
+    """
+    Queue of obstacle list generations for several maps, processed by a bounded number of background jobs.
+
+    Each map is generated by its own GenerationJob, at most max_running of them run at once and the rest wait
+    in the queue. The queue doesn't touch Tk widgets, the GUI calls poll with after, which takes the messages
+    of the running jobs, updates their state and starts the waiting jobs. A generated obstacle list waits
+    for the user to save it and doesn't block the queue. Every map link gets its own course result cache,
+    so maps with the same course names don't evict each other's results.
+
+    Attributes:
+        MAX_RUNNING (int): Default maximal number of jobs generating at once.
+        jobs (List[QueuedJob]): All jobs in the order they were added.
+    """
+
+    MAX_RUNNING = 2
+
+    def __init__(self, gmm: GoogleMyMaps, max_running: Optional[int] = None):
+        """
+        Initialize an empty job queue.
+
+        Parameters:
+            gmm (GoogleMyMaps): The map loader.
+            max_running (Optional[int]): Maximal number of jobs generating at once, MAX_RUNNING by default.
+        """
+        self.gmm = gmm
+        self.max_running = max_running or self.MAX_RUNNING
+        self.jobs: List[QueuedJob] = []
+        self._caches: Dict[str, ObstacleListCache] = {}
+        self._ids = itertools.count(1)
+
+    def add(self, map_link: str, photo_cache: Optional["PhotoCache"] = None) -> QueuedJob:
+        """
+        Add a map to the queue, it's started by poll once a slot is free.
+
+        Parameters:
+            map_link (str): Link of the map.
+            photo_cache (Optional[PhotoCache]): Cache of the obstacle photos, if they are added to the list.
+
+        Returns:
+            QueuedJob: The added job.
+        """
+        cache = self._caches.setdefault(map_link, ObstacleListCache())
+        # The queue window doesn't show previews
+        job = GenerationJob(self.gmm, map_link, cache, photo_cache=photo_cache, render_preview=False)
+        queued_job = QueuedJob(next(self._ids), job)
+        self.jobs.append(queued_job)
+        log.info("Map %s added to the queue as job %d", map_link, queued_job.id)
+        return queued_job
+
+    def save(self, queued_job: QueuedJob, file_path: str) -> None:
+        """
+        Save the obstacle list of a ready job in the background.
+
+        Parameters:
+            queued_job (QueuedJob): The ready job.
+            file_path (str): Path of the saved file.
+        """
+        if queued_job.status != QueuedJob.READY:
+            return
+        queued_job.status = QueuedJob.SAVING
+        queued_job.file_path = file_path
+        queued_job.job.save(file_path)
+
+    def cancel(self, queued_job: QueuedJob) -> None:
+        """
+        Cancel a job, a waiting or ready job is cancelled at once, a running job stops before its next stage.
+
+        Parameters:
+            queued_job (QueuedJob): The cancelled job.
+        """
+        if queued_job.is_active():
+            queued_job.job.cancel()
+        elif queued_job.status in (QueuedJob.QUEUED, QueuedJob.READY):
+            queued_job.status = QueuedJob.CANCELLED
+            queued_job.obstacle_list = None
+
+    def cancel_all(self) -> None:
+        """
+        Cancel all jobs that aren't finished.
+        """
+        for queued_job in self.jobs:
+            self.cancel(queued_job)
+
+    def remove_finished(self) -> List[QueuedJob]:
+        """
+        Remove the saved, failed and cancelled jobs from the queue.
+
+        Returns:
+            List[QueuedJob]: The removed jobs.
+        """
+        removed = [queued_job for queued_job in self.jobs if queued_job.status in QueuedJob.FINISHED]
+        self.jobs = [queued_job for queued_job in self.jobs if queued_job.status not in QueuedJob.FINISHED]
+        return removed
+
+    def get_running_count(self) -> int:
+        """
+        Get the number of jobs using a slot of the queue, saving started by the user doesn't use one.
+
+        Returns:
+            int: Number of jobs generating.
+        """
+        return sum(1 for queued_job in self.jobs if queued_job.status == QueuedJob.RUNNING)
+
+    def poll(self) -> List[QueuedJob]:
+        """
+        Take the messages of the running jobs and start the waiting jobs, in the GUI thread.
+
+        Returns:
+            List[QueuedJob]: Jobs whose state changed.
+        """
+        changed = []
+        for queued_job in self.jobs:
+            if queued_job.is_active() and self._handle_messages(queued_job):
+                changed.append(queued_job)
+
+        free_slots = self.max_running - self.get_running_count()
+        for queued_job in self.jobs:
+            if free_slots <= 0:
+                break
+            if queued_job.status == QueuedJob.QUEUED:
+                queued_job.status = QueuedJob.RUNNING
+                queued_job.job.start()
+                free_slots -= 1
+                changed.append(queued_job)
+        return changed
+
+    @staticmethod
+    def _handle_messages(queued_job: QueuedJob) -> bool:
+        """
+        Update the state of a job from its messages.
+
+        Parameters:
+            queued_job (QueuedJob): The running job.
+
+        Returns:
+            bool: True if the job had any messages.
+        """
+        changed = False
+        for kind, payload in queued_job.job.get_messages():
+            changed = True
+            if kind == "progress":
+                queued_job.fraction = payload.fraction
+                queued_job.detail = f"{payload.label} {payload.detail}".strip()
+            elif kind == "map":
+                queued_job.name = payload.name
+            elif kind == "ready":
+                queued_job.status = QueuedJob.READY
+                queued_job.obstacle_list = payload
+                queued_job.detail = ""
+            elif kind == "saved":
+                queued_job.status = QueuedJob.SAVED
+                queued_job.fraction = 1.0
+                queued_job.detail = payload
+                # The saved workbook isn't needed anymore
+                queued_job.obstacle_list = queued_job.job.obstacle_list = None
+            elif kind == "failed":
+                log.error("Job %d failed: %s", queued_job.id, payload)
+                queued_job.status = QueuedJob.FAILED
+                queued_job.detail = payload
+            elif kind == "cancelled":
+                queued_job.status = QueuedJob.CANCELLED
+                queued_job.detail = ""
+        return changed
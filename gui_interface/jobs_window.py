@@ -0,0 +1,262 @@
+import logging
+import tkinter as tk
+from tkinter import ttk, font
+from typing import Optional
+
+from GoogleMyMaps.parsers import GoogleMyMapsParser
+from configs.utils import start_application, Colors
+from .error_window import ErrorWindow
+from .job_queue import JobQueue, QueuedJob
+from .not_found_obstacles_window import NotFoundObstaclesWindow
+
+log = logging.getLogger(__name__)
+
+
+class JobsWindow(tk.Toplevel):
+    """
+    Window with a queue of obstacle lists generated for several maps.
+
+    Links pasted one per line are added to the JobQueue, which generates them in the background.
+    Every map has a row with its status, progress and error, and each generated obstacle list is saved
+    and opened on its own. Closing the window only hides it, the queued jobs keep running.
+
+    Attributes:
+        POLL_INTERVAL (int): Interval of polling the job queue in milliseconds.
+        STATUS_LABELS (dict): Labels of the job statuses shown to the user.
+        queue (JobQueue): The queue of jobs shown in the window.
+    """
+
+    POLL_INTERVAL = 100
+    STATUS_LABELS = {
+        QueuedJob.QUEUED: "W kolejce",
+        QueuedJob.RUNNING: "W toku",
+        QueuedJob.READY: "Gotowa do zapisu",
+        QueuedJob.SAVING: "Zapisywanie",
+        QueuedJob.SAVED: "Zapisana",
+        QueuedJob.FAILED: "Błąd",
+        QueuedJob.CANCELLED: "Anulowana",
+    }
+
+    def __init__(self, parent, queue: JobQueue):
+        """
+        Initialize the JobsWindow.
+
+        Parameters:
+            parent (tk.Widget): The main application window.
+            queue (JobQueue): The queue of jobs shown in the window.
+        """
+        super().__init__(parent)
+        self.queue = queue
+        self.title("RMG - Kolejka map")
+        self.geometry("900x450")
+        self.resizable(True, True)
+        self.configure(bg=Colors.BG_COLOR)
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+        default_font = font.nametofont("TkDefaultFont")
+        title_font = font.Font(family=default_font.cget("family"), size=12, weight="bold")
+
+        main_frame = tk.Frame(self, bg=Colors.BG_COLOR, padx=10, pady=10)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        title_label = tk.Label(
+            main_frame,
+            text="Wklej linki do map, każdy w osobnej linii:",
+            font=title_font,
+            bg=Colors.BG_COLOR,
+            fg=Colors.YELLOW
+        )
+        title_label.pack(anchor=tk.W)
+
+        self.links_text = tk.Text(main_frame, height=4, font=font.Font(size=10))
+        self.links_text.pack(fill=tk.X, pady=(5, 5))
+
+        add_frame = tk.Frame(main_frame, bg=Colors.BG_COLOR)
+        add_frame.pack(fill=tk.X)
+
+        self.photos_var = tk.BooleanVar(self, value=False)
+        photos_checkbutton = tk.Checkbutton(
+            add_frame,
+            text="Dołącz zdjęcia przeszkód",
+            variable=self.photos_var,
+            bg=Colors.BG_COLOR,
+            fg=Colors.TEXT_COLOR,
+            activebackground=Colors.BG_COLOR,
+            activeforeground=Colors.YELLOW,
+            selectcolor=Colors.BG_COLOR,
+            cursor="hand2"
+        )
+        photos_checkbutton.pack(side=tk.LEFT)
+
+        self.message_label = tk.Label(add_frame, text="", bg=Colors.BG_COLOR, fg=Colors.ERROR_RED)
+        self.message_label.pack(side=tk.LEFT, padx=10)
+
+        add_button = self._create_button(add_frame, "DODAJ DO KOLEJKI", self.add_links)
+        add_button.pack(side=tk.RIGHT)
+
+        tree_frame = tk.Frame(main_frame, bg=Colors.BG_COLOR)
+        tree_frame.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+
+        scrollbar = tk.Scrollbar(tree_frame,
+                                 bg=Colors.YELLOW,
+                                 troughcolor=Colors.BG_LIGHT,
+                                 activebackground=Colors.YELLOW_DARKER)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        columns = ("name", "status", "progress", "detail")
+        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings", yscrollcommand=scrollbar.set,
+                                 style="Treeview", selectmode="browse")
+        self.tree.heading("name", text="Mapa")
+        self.tree.heading("status", text="Status")
+        self.tree.heading("progress", text="Postęp")
+        self.tree.heading("detail", text="Szczegóły")
+        self.tree.column("name", width=260)
+        self.tree.column("status", width=120)
+        self.tree.column("progress", width=60, anchor=tk.E)
+        self.tree.column("detail", width=420)
+        self.tree.tag_configure(QueuedJob.FAILED, foreground=Colors.ERROR_RED)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.tree.yview)
+        self.tree.bind("<Double-1>", self.on_double_click)
+
+        buttons_frame = tk.Frame(main_frame, bg=Colors.BG_COLOR)
+        buttons_frame.pack(fill=tk.X, pady=(10, 0))
+        for text, command in (("ZAPISZ", self.save_selected), ("OTWÓRZ", self.open_selected),
+                              ("ANULUJ", self.cancel_selected), ("USUŃ ZAKOŃCZONE", self.remove_finished)):
+            self._create_button(buttons_frame, text, command).pack(side=tk.LEFT, padx=(0, 10))
+
+        for queued_job in self.queue.jobs:
+            self.show_job(queued_job)
+        self.poll()
+
+    def add_links(self):
+        """
+        Add the pasted links to the queue, skipping invalid links.
+        """
+        links = [line.strip() for line in self.links_text.get("1.0", tk.END).splitlines() if line.strip()]
+        valid_links = [link for link in links if GoogleMyMapsParser.is_valid_map_link(link)]
+        photo_cache = None
+        if self.photos_var.get() and valid_links:
+            from excel_tables.photo_cache import PhotoCache
+            photo_cache = PhotoCache()
+        for link in valid_links:
+            self.show_job(self.queue.add(link, photo_cache))
+        skipped = len(links) - len(valid_links)
+        self.message_label.config(text=f"Pominięte nieprawidłowe linki: {skipped}" if skipped else "")
+        self.links_text.delete("1.0", tk.END)
+
+    def show_job(self, queued_job: QueuedJob):
+        """
+        Add or update the row of a job.
+
+        Parameters:
+            queued_job (QueuedJob): The shown job.
+        """
+        values = (queued_job.name, self.STATUS_LABELS[queued_job.status],
+                  f"{queued_job.fraction:.0%}", queued_job.detail)
+        item = str(queued_job.id)
+        if self.tree.exists(item):
+            self.tree.item(item, values=values, tags=(queued_job.status,))
+        else:
+            self.tree.insert("", tk.END, iid=item, values=values, tags=(queued_job.status,))
+
+    def poll(self):
+        """
+        Poll the job queue and update the rows of the changed jobs, while the window exists.
+        """
+        for queued_job in self.queue.poll():
+            self.show_job(queued_job)
+        self.after(self.POLL_INTERVAL, self.poll)
+
+    def get_selected_job(self) -> Optional[QueuedJob]:
+        """
+        Get the job of the selected row.
+
+        Returns:
+            Optional[QueuedJob]: The selected job, None if no row is selected.
+        """
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        return next((queued_job for queued_job in self.queue.jobs if str(queued_job.id) == selection[0]), None)
+
+    def save_selected(self):
+        """
+        Ask where to save the obstacle list of the selected ready job and save it in the background.
+        """
+        queued_job = self.get_selected_job()
+        if queued_job is None or queued_job.status != QueuedJob.READY:
+            return
+        obstacle_list = queued_job.obstacle_list
+        file_path = obstacle_list.ask_save_path(obstacle_list.get_default_file_name(), self)
+        if obstacle_list.not_found_obstacles:
+            NotFoundObstaclesWindow.show_not_found_obstacles(self, obstacle_list)
+        if file_path is None:
+            return
+        self.queue.save(queued_job, file_path)
+        self.show_job(queued_job)
+
+    def open_selected(self):
+        """
+        Open the saved obstacle list of the selected job.
+        """
+        queued_job = self.get_selected_job()
+        if queued_job is not None and queued_job.status == QueuedJob.SAVED:
+            start_application(queued_job.file_path)
+
+    def cancel_selected(self):
+        """
+        Cancel the selected job.
+        """
+        queued_job = self.get_selected_job()
+        if queued_job is not None:
+            self.queue.cancel(queued_job)
+            self.show_job(queued_job)
+
+    def remove_finished(self):
+        """
+        Remove the rows of the saved, failed and cancelled jobs.
+        """
+        for queued_job in self.queue.remove_finished():
+            self.tree.delete(str(queued_job.id))
+
+    def on_double_click(self, event):
+        """
+        Save a ready job, open a saved job or show the error of a failed job.
+
+        Parameters:
+            event (tk.Event): The double click event.
+        """
+        queued_job = self.get_selected_job()
+        if queued_job is None:
+            return
+        if queued_job.status == QueuedJob.READY:
+            self.save_selected()
+        elif queued_job.status == QueuedJob.SAVED:
+            self.open_selected()
+        elif queued_job.status == QueuedJob.FAILED:
+            ErrorWindow(self, queued_job.detail)
+
+    def _create_button(self, parent, text: str, command) -> tk.Button:
+        """
+        Create a button in the style of the application.
+
+        Parameters:
+            parent (tk.Widget): The parent widget of the button.
+            text (str): Text of the button.
+            command: Function called when the button is clicked.
+
+        Returns:
+            tk.Button: The created button, not placed yet.
+        """
+        button = tk.Button(
+            parent,
+            text=text,
+            bg=Colors.YELLOW,
+            fg=Colors.BLACK,
+            activeforeground=Colors.YELLOW,
+            activebackground=Colors.BG_COLOR,
+            command=command,
+            cursor="hand2"
+        )
+        return button
@@ -1,5 +1,7 @@
 import tkinter as tk
+from tkinter import ttk
 
+from configs.progress import ProgressEvent
 from configs.utils import Colors
 
 
@@ -9,7 +11,8 @@ class LoadingFrame(tk.Frame):
     
     This frame is typically shown during operations that require waiting,
     such as data processing or initialization tasks. It displays a centered
-    "Loading..." text with the Runmageddon font.
+    "Loading..." text with the Runmageddon font, a progress bar with the current stage
+    and the elapsed time, and a button cancelling the running job.
     
     Parameters
     ----------
@@ -24,6 +27,13 @@ class LoadingFrame(tk.Frame):
     None
     """
     def __init__(self, parent, controller):
+        """
+        Initialize the LoadingFrame with the loading message and the cancel button.
+        
+        Parameters:
+            parent (tk.Widget): The parent widget that will contain this frame
+            controller: The controller object, must implement cancel_job()
+        """
         super().__init__(parent)
         self.controller = controller
         self.config(bg=Colors.BG_COLOR)
@@ -41,3 +51,86 @@ class LoadingFrame(tk.Frame):
             bg=Colors.BG_COLOR,
             fg=Colors.YELLOW)
         label.pack(pady=(0,20))
+
+        self.progress_bar = ttk.Progressbar(content_frame, orient="horizontal", length=400,
+                                            mode="determinate", maximum=100)
+        self.progress_bar.pack(pady=(0, 5))
+
+        self.stage_label = tk.Label(
+            content_frame,
+            text="",
+            font=("Runmageddon", 12),
+            bg=Colors.BG_COLOR,
+            fg=Colors.TEXT_COLOR)
+        self.stage_label.pack()
+
+        self.elapsed_label = tk.Label(
+            content_frame,
+            text="",
+            font=("Runmageddon", 10),
+            bg=Colors.BG_COLOR,
+            fg=Colors.TEXT_COLOR)
+        self.elapsed_label.pack(pady=(0, 10))
+
+        self.cancel_button = tk.Button(
+            content_frame,
+            text="ANULUJ",
+            font=("Runmageddon", 20),
+            bg=Colors.YELLOW,
+            fg=Colors.BLACK,
+            activeforeground=Colors.YELLOW,
+            activebackground=Colors.BG_COLOR,
+            bd=5,
+            width=10,
+            command=self.controller.cancel_job,
+            cursor="hand2"
+        )
+        self.cancel_button.pack(pady=10)
+        self.cancel_button.bind("<Enter>", self.on_enter)
+        self.cancel_button.bind("<Leave>", self.on_leave)
+
+    def on_enter(self, event):
+        """
+        Handle mouse enter event for the cancel button.
+        
+        Parameters:
+            event: The event object containing information about the event
+        """
+        event.widget.config(bg=Colors.YELLOW, fg=Colors.BG_VERY_LIGHT)
+
+    def on_leave(self, event):
+        """
+        Handle mouse leave event for the cancel button.
+        
+        Parameters:
+            event: The event object containing information about the event
+        """
+        event.widget.config(bg=Colors.YELLOW, fg=Colors.BLACK)
+
+    def reset(self):
+        """
+        Clear the progress of the previous job.
+        """
+        self.progress_bar["value"] = 0
+        self.stage_label.config(text="")
+        self.elapsed_label.config(text="")
+
+    def show_progress(self, event: ProgressEvent):
+        """
+        Show the progress of the running job.
+        
+        Parameters:
+            event (ProgressEvent): The latest progress event of the job.
+        """
+        self.progress_bar["value"] = event.fraction * 100
+        text = f"{event.label}: {event.detail}" if event.detail else event.label
+        self.stage_label.config(text=text)
+
+    def show_elapsed(self, elapsed: float):
+        """
+        Show the time since the job started.
+        
+        Parameters:
+            elapsed (float): The elapsed time in seconds.
+        """
+        self.elapsed_label.config(text=f"{elapsed:.1f} s")
@@ -1,15 +1,30 @@
 import logging
+import queue
 import threading
+import time
 import tkinter as tk
+from tkinter import messagebox, filedialog
+from typing import TYPE_CHECKING, Optional
 
 from GoogleMyMaps import GoogleMyMaps
 from configs.utils import resource_path, Colors
-from excel_tables.obstacle_list import ObstacleList
+from excel_tables.obstacle_list_cache import ObstacleListCache
 from .error_window import ErrorWindow
 from .final_frame import FinalFrame
+from .generation_job import GenerationJob
+from .job_queue import JobQueue
+from .jobs_window import JobsWindow
 from .loading_frame import LoadingFrame
 from .map_link_frame import MapLinkFrame
+from .map_watch import MapWatch
+from .map_prefetch import MapPrefetch
 from .not_found_obstacles_window import NotFoundObstaclesWindow
+from .warm_up import WarmUp
+
+if TYPE_CHECKING:
+    from excel_tables.obstacle_list import ObstacleList
+    from excel_tables.obstacle_list_updater import ObstacleListUpdater
+    from excel_tables.obstacle_table import ObstacleTable
 
 log = logging.getLogger(__name__)
 
@@ -21,7 +36,24 @@ class MainApp(tk.Tk):
     This class initializes the main application window, sets up the UI frames,
     and handles the core functionality of processing Google Maps data to create
     obstacle lists.
+    
+    Only the modules needed to show the window are imported at startup, the modules working
+    with workbooks, geometry and HTTP are imported when a job or a button first needs them,
+    or earlier by the warm-up started once the window is shown.
+    
+    Attributes:
+        JOB_POLL_INTERVAL (int): Interval of polling the running job in milliseconds.
+        WARM_UP_DELAY (int): Delay of starting the warm-up after the window is shown in milliseconds.
+        WATCH_POLL_INTERVAL (int): Interval of polling the messages of the map watch in milliseconds.
+        TASK_POLL_INTERVAL (int): Interval of polling the results of background tasks in milliseconds.
+        watch_interval (Optional[float]): Interval between polls of the watched map in seconds,
+                                          MapWatch.INTERVAL if None.
     """
+
+    JOB_POLL_INTERVAL = 50
+    WARM_UP_DELAY = 500
+    WATCH_POLL_INTERVAL = 500
+    TASK_POLL_INTERVAL = 100
     
     def __init__(self):
         """
@@ -59,9 +91,21 @@ class MainApp(tk.Tk):
         self.gmm = GoogleMyMaps()
         self.google_map = None
         self.obstacle_list_file = None
+        self.obstacle_table: Optional["ObstacleTable"] = None
+        self.update_workbook_path: Optional[str] = None
+        self.job: Optional[GenerationJob] = None
+        self.prefetch: Optional[MapPrefetch] = None
+        self.job_queue: Optional[JobQueue] = None
+        self.jobs_window: Optional[JobsWindow] = None
+        self.map_watch: Optional[MapWatch] = None
+        self.watch_interval: Optional[float] = None
+        self.obstacle_list_cache = ObstacleListCache()
+        self.warm_up = WarmUp()
 
         self.show_frame("MapLinkFrame")
         self.bind("<Escape>", self.quit_app)
+        self.protocol("WM_DELETE_WINDOW", self.quit_app)
+        self.after(self.WARM_UP_DELAY, self.warm_up.start)
 
     def center_window(self, width, height):
         """
@@ -93,52 +137,429 @@ class MainApp(tk.Tk):
         frame = self.frames[page_name]
         frame.tkraise()
 
-    def process_map_link(self, map_link: str):
+    def prefetch_map_link(self, map_link: Optional[str]):
         """
-        Process the provided Google Maps link in a separate thread.
+        Start loading the map of a valid link entered by the user before it is submitted.
+        
+        A prefetch of a different link is cancelled, and a prefetch of the same link is kept running.
         
-        Creates a new thread to handle the map processing to prevent UI freezing.
-        If successful, proceeds to process the map data; otherwise, displays an error.
+        Parameters:
+            map_link (Optional[str]): The valid Google Maps URL, None if the entered link isn't valid.
+        
+        Returns:
+            None
+        """
+        if self.prefetch is not None:
+            if self.prefetch.map_link == map_link and self.prefetch.is_usable():
+                return
+            self.prefetch.cancel()
+            self.prefetch = None
+        if map_link is None or self.job is not None:
+            return
+        self.prefetch = MapPrefetch(self.gmm, map_link)
+        self.prefetch.start()
+
+    def take_prefetch(self, map_link: str) -> Optional[MapPrefetch]:
+        """
+        Take the prefetch of a submitted link, cancelling a prefetch of a different link.
+        
+        Parameters:
+            map_link (str): The submitted Google Maps URL.
+        
+        Returns:
+            Optional[MapPrefetch]: The running or finished prefetch of the link, None if there is no usable one.
+        """
+        prefetch, self.prefetch = self.prefetch, None
+        if prefetch is None:
+            return None
+        if prefetch.map_link != map_link or not prefetch.is_usable():
+            prefetch.cancel()
+            return None
+        log.info("Using prefetched map %s", map_link)
+        return prefetch
+
+    def process_map_link(self, map_link: str, update_workbook_path: Optional[str] = None):
+        """
+        Generate the obstacle list for the provided Google Maps link in a background job.
+        
+        The job loads, validates and computes the map and renders the obstacle list in a worker thread,
+        so the window stays responsive and the job can be cancelled. Its results are taken from the job's
+        queue by poll_job. A prefetch of the same link started while the link was entered is reused.
         
         Parameters:
             map_link (str): The Google Maps URL to process.
+            update_workbook_path (Optional[str]): Path of a previously generated obstacle list to update
+                                                  instead of generating a new one.
+        
+        Returns:
+            None
+        """
+        self.update_workbook_path = update_workbook_path
+        photo_cache = None
+        if self.frames["MapLinkFrame"].photos_var.get():
+            from excel_tables.photo_cache import PhotoCache
+            photo_cache = PhotoCache()
+        self.job = GenerationJob(self.gmm, map_link, self.obstacle_list_cache, update_workbook_path, photo_cache,
+                                 self.take_prefetch(map_link),
+                                 preview_sheet=self.frames["MapLinkFrame"].preview_var.get())
+        self.frames["FinalFrame"].show_preview(None)
+        self.frames["LoadingFrame"].reset()
+        self.job.start()
+        self.after(self.JOB_POLL_INTERVAL, self.poll_job)
+
+    def poll_job(self):
+        """
+        Handle the messages of the running job, show its progress and keep polling while it runs.
+        
+        Returns:
+            None
+        """
+        job = self.job
+        if job is None:
+            return
+        for kind, payload in job.get_messages():
+            if job is not self.job:
+                return
+            if kind == "progress":
+                self.frames["LoadingFrame"].show_progress(payload)
+            elif kind == "map":
+                self.google_map = payload
+            elif kind == "preview":
+                self.frames["FinalFrame"].show_preview(payload)
+            elif kind == "ready":
+                self.obstacle_list_ready(payload)
+            elif kind == "saved":
+                self.obstacle_list_saved(payload)
+            elif kind == "updated":
+                self.obstacle_list_updated(payload)
+            elif kind == "failed":
+                self.job = None
+                self.failed_to_load_map(payload)
+            elif kind == "cancelled":
+                self.job = None
+                log.info("Generation cancelled")
+                self.reopen_map_frame()
+        if self.job is job:
+            self.frames["LoadingFrame"].show_elapsed(job.progress.get_elapsed())
+            self.after(self.JOB_POLL_INTERVAL, self.poll_job)
+
+    def show_jobs_window(self):
+        """
+        Show the window with the queue of maps generated in the background, creating it on first use.
+        
+        The queue lives as long as the application, closing its window only hides it.
+        
+        Returns:
+            None
+        """
+        if self.jobs_window is None:
+            self.job_queue = JobQueue(self.gmm)
+            self.jobs_window = JobsWindow(self, self.job_queue)
+        else:
+            self.jobs_window.deiconify()
+        self.jobs_window.lift()
+        self.jobs_window.focus_force()
+
+    def cancel_job(self):
+        """
+        Cancel the running job, it stops before its next stage and the map link frame is shown again.
+        
+        Returns:
+            None
+        """
+        if self.job is not None:
+            self.job.cancel()
+
+    def obstacle_list_ready(self, obstacle_list: "ObstacleList"):
+        """
+        Ask where to save the generated obstacle list and save it in the job's worker thread.
+        
+        Parameters:
+            obstacle_list (ObstacleList): The generated obstacle list.
+        
+        Returns:
+            None
+        """
+        self.obstacle_table = obstacle_list.table
+        file_path = obstacle_list.ask_save_path(obstacle_list.get_default_file_name(), self)
+        if obstacle_list.not_found_obstacles:
+            NotFoundObstaclesWindow.show_not_found_obstacles(self, obstacle_list)
+        if file_path is None:
+            log.warning("File name not provided")
+            self.job = None
+            self.reopen_map_frame()
+            return
+        self.job.save(file_path)
+
+    def obstacle_list_saved(self, file_path: str):
+        """
+        Show the final frame after the obstacle list was saved.
+        
+        Parameters:
+            file_path (str): Path of the saved obstacle list.
+        
+        Returns:
+            None
+        """
+        self.job = None
+        self.obstacle_list_file = file_path
+        self.frames["MapLinkFrame"].unbind_submit_button()
+        self.frames["FinalFrame"].bind_open_button()
+        self.show_frame("FinalFrame")
+
+    def obstacle_list_updated(self, updater: "ObstacleListUpdater"):
+        """
+        Show the result of updating the previously generated obstacle list chosen by the user.
+        
+        Only the cells computed from the map are rewritten, the number of changed cells is shown
+        in a message, and the full report is logged.
+        
+        Parameters:
+            updater (ObstacleListUpdater): The finished update.
+        
+        Returns:
+            None
+        """
+        self.job = None
+        message = f"Zmienione komórki: {len(updater.changes)}"
+        if updater.unplaced:
+            message += (f"\nNie zmieściło się w pliku: {len(updater.unplaced)}"
+                        f"\nWygeneruj nową listę, aby je dodać")
+        messagebox.showinfo("AKTUALIZACJA", message, parent=self)
+        self.obstacle_table = updater.obstacle_list.table
+        if updater.obstacle_list.not_found_obstacles:
+            NotFoundObstaclesWindow.show_not_found_obstacles(self, updater.obstacle_list)
+        self.obstacle_list_file = self.update_workbook_path
+        self.frames["MapLinkFrame"].unbind_submit_button()
+        self.frames["FinalFrame"].bind_open_button()
+        self.show_frame("FinalFrame")
+
+    def toggle_map_watch(self):
+        """
+        Start watching the map of the shown obstacle list for changes, or stop watching it.
+        
+        While the map is watched, the obstacle list file is updated in the background whenever the map
+        changes, and the result of every poll is shown in the final frame.
+        
+        Returns:
+            None
+        """
+        if self.map_watch is not None and self.map_watch.is_running():
+            self.stop_map_watch()
+            return
+        if self.google_map is None or not self.obstacle_list_file:
+            return
+        self.map_watch = MapWatch(self.gmm, self.google_map, self.obstacle_list_file, self.obstacle_list_cache,
+                                  self.watch_interval)
+        self.map_watch.start()
+        self.frames["FinalFrame"].show_watch_status(
+            True, f"Sprawdzanie co {self.map_watch.interval:.0f} s")
+        self.after(self.WATCH_POLL_INTERVAL, self.poll_map_watch)
+
+    def stop_map_watch(self):
+        """
+        Stop watching the map, if it's watched.
         
         Returns:
             None
         """
-        def process():
+        if self.map_watch is not None:
+            self.map_watch.stop()
+            self.map_watch = None
+        self.frames["FinalFrame"].show_watch_status(False)
+
+    def poll_map_watch(self):
+        """
+        Show the results of the map watch polls and keep polling while the map is watched.
+        
+        Returns:
+            None
+        """
+        map_watch = self.map_watch
+        if map_watch is None:
+            return
+        checked_at = time.strftime("%H:%M:%S")
+        for kind, payload in map_watch.get_messages():
+            if kind == "unchanged":
+                self.frames["FinalFrame"].show_watch_status(True, f"Brak zmian ({checked_at})")
+            elif kind in ("updated", "needs_regeneration"):
+                self.google_map = map_watch.google_map
+                self.obstacle_table = payload.obstacle_list.table
+                status = f"Zaktualizowano ({checked_at}), zmienione komórki: {len(payload.changes)}"
+                if kind == "needs_regeneration":
+                    status += f", nie zmieściło się: {len(payload.unplaced)}"
+                self.frames["FinalFrame"].show_watch_status(True, status)
+                if kind == "needs_regeneration" and self.offer_regeneration(payload):
+                    return
+            elif kind == "failed":
+                _, delay = payload
+                self.frames["FinalFrame"].show_watch_status(
+                    True, f"Błąd ({checked_at}), ponowna próba za {delay:.0f} s", error=True)
+        if self.map_watch is map_watch:
+            self.after(self.WATCH_POLL_INTERVAL, self.poll_map_watch)
+
+    def offer_regeneration(self, updater: "ObstacleListUpdater") -> bool:
+        """
+        Ask whether to generate a new obstacle list when the watched file has no place for the map's changes.
+
+        The watched file keeps its partial update and the coordinators' edits. If the user agrees, the watch
+        is stopped and a new list is generated like from the map link frame, saved to a file the user chooses.
+
+        Parameters:
+            updater (ObstacleListUpdater): The update that couldn't place all courses and obstacles.
+
+        Returns:
+            bool: True if the new list is being generated.
+        """
+        message = (f"Zmienione komórki: {len(updater.changes)}"
+                   f"\nNie zmieściło się w pliku: {len(updater.unplaced)}"
+                   f"\nWygenerować nową listę do osobnego pliku?")
+        if not messagebox.askyesno("OBSERWOWANIE MAPY", message, parent=self):
+            return False
+        map_link = self.map_watch.map_link
+        self.stop_map_watch()
+        self.show_frame("LoadingFrame")
+        self.process_map_link(map_link)
+        return True
+
+    def generate_documents(self):
+        """
+        Generate all documents of the event for the loaded map into a directory chosen by the user.
+        
+        The documents are generated in a separate thread, reusing the computed obstacle list courses,
+        and the number of saved documents is shown when they are ready.
+        
+        Returns:
+            None
+        """
+        if self.google_map is None:
+            return
+        directory = filedialog.askdirectory(parent=self, initialdir=".")
+        if not directory:
+            return
+        from excel_tables.document_pack import DocumentPack
+
+        document_pack = DocumentPack(self.google_map, self.obstacle_list_cache)
+        self.frames["FinalFrame"].documents_button.config(state=tk.DISABLED)
+
+        def on_error(e: Exception):
+            log.error("Error generating documents: %s", e)
+            self.frames["FinalFrame"].documents_button.config(state=tk.NORMAL)
+            ErrorWindow(self, str(e))
+
+        self.run_in_background(lambda: document_pack.create_and_save(directory),
+                               lambda saved: self.documents_generated(
+                                   f"Zapisane dokumenty: {len(saved)} z {len(document_pack.DOCUMENTS)}"),
+                               on_error)
+
+    def run_in_background(self, task, on_result, on_error):
+        """
+        Run a task in a daemon thread and pass its result to a callback in the GUI thread.
+        
+        The thread never touches Tk widgets, it only puts the result or the error to a queue,
+        which is polled with after.
+        
+        Parameters:
+            task: Function run in the thread, returning the result.
+            on_result: Function called with the result in the GUI thread.
+            on_error: Function called with the exception in the GUI thread if the task failed.
+        
+        Returns:
+            None
+        """
+        results: "queue.Queue" = queue.Queue()
+
+        def run():
             try:
-                self.google_map = self.gmm.create_map(map_link)
-                self.after(0, self.process_map)
+                results.put((on_result, task()))
             except Exception as e:
-                error_msg = str(e)
-                self.after(0, lambda: self.failed_to_load_map(error_msg))
+                results.put((on_error, e))
 
-        thread = threading.Thread(target=process)
-        thread.daemon = True
-        thread.start()
+        threading.Thread(target=run, daemon=True).start()
+        self.after(self.TASK_POLL_INTERVAL, lambda: self.poll_background_task(results))
 
-    def process_map(self):
+    def poll_background_task(self, results: "queue.Queue"):
         """
-        Process the loaded Google Map data to create an obstacle list.
+        Pass the result of a background task to its callback, or keep polling while the task runs.
         
-        Creates an obstacle list from the loaded map data, handles any obstacles
-        that couldn't be found, and updates the UI accordingly.
+        Parameters:
+            results (queue.Queue): The queue the task puts its callback and result to.
         
         Returns:
             None
         """
-        log.info("Map loaded successfully")
-        obstacle_list = ObstacleList(self.google_map)
-        self.obstacle_list_file, not_found_obstacles = obstacle_list.create_and_save()
-        if not_found_obstacles:
-            NotFoundObstaclesWindow.show_not_found_obstacles(obstacle_list)
-        if self.obstacle_list_file is None:
-            self.reopen_map_frame()
-        else:
-            self.frames["MapLinkFrame"].unbind_submit_button()
-            self.frames["FinalFrame"].bind_open_button()
-            self.show_frame("FinalFrame")
+        try:
+            callback, value = results.get_nowait()
+        except queue.Empty:
+            self.after(self.TASK_POLL_INTERVAL, lambda: self.poll_background_task(results))
+            return
+        callback(value)
+
+    def export_obstacle_table(self):
+        """
+        Export the computed obstacle table to a CSV or JSON Lines file chosen by the user.
+        
+        The table of the generated obstacle list is reused, so nothing is recomputed. If there is no table yet,
+        it's computed in a background thread first, with the export button disabled meanwhile.
+        
+        Returns:
+            None
+        """
+        if self.google_map is None:
+            return
+        if self.obstacle_table is None:
+            from excel_tables.obstacle_table import ObstacleTableBuilder
+
+            google_map = self.google_map
+            export_button = self.frames["FinalFrame"].export_button
+            export_button.config(state=tk.DISABLED)
+
+            def on_result(table: "ObstacleTable"):
+                export_button.config(state=tk.NORMAL)
+                if self.google_map is google_map:
+                    self.obstacle_table = table
+                    self.export_obstacle_table()
+
+            def on_error(e: Exception):
+                export_button.config(state=tk.NORMAL)
+                log.error("Error computing obstacle table: %s", e)
+                ErrorWindow(self, str(e))
+
+            self.run_in_background(lambda: ObstacleTableBuilder(google_map, self.obstacle_list_cache).build(),
+                                   on_result, on_error)
+            return
+        from excel_tables.obstacle_list import ObstacleList
+        from excel_tables.obstacle_table_export import ObstacleTableExport
+
+        file_path = filedialog.asksaveasfilename(
+            parent=self,
+            initialdir=".",
+            initialfile=f"{self.google_map.name} - {ObstacleList.file_name}.csv",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")]
+        )
+        if not file_path:
+            return
+        try:
+            ObstacleTableExport.save_to_path(self.obstacle_table, file_path)
+        except (OSError, ValueError) as e:
+            log.error("Error exporting file %s: %s", file_path, e)
+            ErrorWindow(self, f"Nie udało się wyeksportować pliku: {e}")
+            return
+        messagebox.showinfo("EKSPORT", f"Zapisano: {file_path}", parent=self)
+
+    def documents_generated(self, message: str):
+        """
+        Show the result of generating all documents.
+        
+        Parameters:
+            message (str): The message with the number of saved documents.
+        
+        Returns:
+            None
+        """
+        self.frames["FinalFrame"].documents_button.config(state=tk.NORMAL)
+        messagebox.showinfo("DOKUMENTY", message, parent=self)
 
     def failed_to_load_map(self, error_message: str):
         """
@@ -168,9 +589,11 @@ class MainApp(tk.Tk):
             None
         """
         log.info("Please provide map link again")
+        self.stop_map_watch()
         self.frames["MapLinkFrame"].entry.delete(0, tk.END)
         self.frames["MapLinkFrame"].bind_submit_button()
         self.show_frame("MapLinkFrame")
+        self.frames["MapLinkFrame"].entry.focus_set()
 
     def quit_app(self, event=None):
         """
@@ -183,4 +606,11 @@ class MainApp(tk.Tk):
             None
         """
         log.info("Closing application...")
+        self.warm_up.cancel()
+        if self.map_watch is not None:
+            self.map_watch.stop()
+        if self.job_queue is not None:
+            self.job_queue.cancel_all()
+        if self.prefetch is not None:
+            self.prefetch.cancel()
         self.destroy()
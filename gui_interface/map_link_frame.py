@@ -1,7 +1,10 @@
 import logging
 import tkinter as tk
+from tkinter import filedialog
 from tkinter.font import Font
+from typing import Optional
 
+from GoogleMyMaps.parsers import GoogleMyMapsParser
 from configs.utils import Colors
 
 log = logging.getLogger(__name__)
@@ -15,16 +18,30 @@ class MapLinkFrame(tk.Frame):
     be processed to generate route information. It includes an entry field for the link,
     a submit button, and instructions for proper map formatting.
     
+    The link is validated as it changes, after a short pause in typing, and a valid link
+    is passed to the controller to prefetch the map before the user submits it.
+    
     Parameters:
         parent (tk.Widget): The parent widget in which this frame will be placed.
         controller: The controller object that manages frame switching and data processing.
-                   Must implement show_frame() and process_map_link() methods.
+                   Must implement show_frame(), process_map_link(), prefetch_map_link()
+                   and show_jobs_window() methods.
     
     Attributes:
+        VALIDATION_DELAY (int): Pause in typing after which the link is validated in milliseconds.
         controller: Reference to the controller for frame navigation and data processing.
+        link_var (tk.StringVar): The map link in the entry field.
         entry (tk.Entry): The entry field where users input the map link.
+        link_status_label (tk.Label): Label showing whether the entered link is valid.
         submit_button (tk.Button): Button that triggers the link processing.
+        update_button (tk.Button): Button that triggers updating a previously generated obstacle list.
+        queue_button (tk.Button): Button that shows the queue for generating lists of several maps.
+        photos_var (tk.BooleanVar): Whether a sheet with the obstacle photos is added to the obstacle list.
+        preview_var (tk.BooleanVar): Whether a sheet with the map preview is added to the obstacle list.
     """
+
+    VALIDATION_DELAY = 400
+
     def __init__(self, parent, controller):
         log.info("Please provide map link")
         super().__init__(parent)
@@ -44,10 +61,11 @@ class MapLinkFrame(tk.Frame):
             bg=Colors.BG_COLOR,
             fg=Colors.YELLOW
         )
-        label.pack(pady=(80, 50))
+        label.pack(pady=(50, 30))
 
-        self.entry = tk.Entry(content_frame, width=70, font=Font(size=10))
-        self.entry.pack(pady=10)
+        self.link_var = tk.StringVar(self)
+        self.entry = tk.Entry(content_frame, width=70, font=Font(size=10), textvariable=self.link_var)
+        self.entry.pack(pady=(10, 0))
         self.bind_submit_button()
         self.entry.focus_set()
 
@@ -55,8 +73,55 @@ class MapLinkFrame(tk.Frame):
         # self.entry.insert(0,"https://www.google.com/maps/d/u/0/edit?mid=1QU5ydDpF5bg_8jfQca3An2qJfqddpcY&ll=53.08931730768191%2C21.56582239999997&z=15")
         # self.entry.insert(0, "https://www.google.com/maps/d/u/1/edit?mid=134VUSLwnSE0LorF8FeYLEd3E6EhIYwc&usp=sharing")
 
-        self.submit_button = tk.Button(
+        self.link_status_label = tk.Label(
             content_frame,
+            text="",
+            font=("Runmageddon", 10),
+            bg=Colors.BG_COLOR,
+            fg=Colors.ERROR_RED
+        )
+        self.link_status_label.pack()
+        self._validation_job: Optional[str] = None
+        self.link_var.trace_add("write", self.on_link_changed)
+
+        options_frame = tk.Frame(content_frame, bg=Colors.BG_COLOR)
+        options_frame.pack()
+
+        self.photos_var = tk.BooleanVar(value=False)
+        photos_checkbutton = tk.Checkbutton(
+            options_frame,
+            text="Dołącz zdjęcia przeszkód",
+            variable=self.photos_var,
+            font=("Runmageddon", 10),
+            bg=Colors.BG_COLOR,
+            fg=Colors.TEXT_COLOR,
+            activebackground=Colors.BG_COLOR,
+            activeforeground=Colors.YELLOW,
+            selectcolor=Colors.BG_COLOR,
+            cursor="hand2"
+        )
+        photos_checkbutton.pack(side=tk.LEFT)
+
+        self.preview_var = tk.BooleanVar(value=False)
+        preview_checkbutton = tk.Checkbutton(
+            options_frame,
+            text="Dołącz podgląd mapy",
+            variable=self.preview_var,
+            font=("Runmageddon", 10),
+            bg=Colors.BG_COLOR,
+            fg=Colors.TEXT_COLOR,
+            activebackground=Colors.BG_COLOR,
+            activeforeground=Colors.YELLOW,
+            selectcolor=Colors.BG_COLOR,
+            cursor="hand2"
+        )
+        preview_checkbutton.pack(side=tk.LEFT)
+
+        buttons_frame = tk.Frame(content_frame, bg=Colors.BG_COLOR)
+        buttons_frame.pack(pady=(10, 10))
+
+        self.submit_button = tk.Button(
+            buttons_frame,
             text="GENERUJ",
             font=("Runmageddon", 20),
             bg=Colors.YELLOW,
@@ -68,7 +133,36 @@ class MapLinkFrame(tk.Frame):
             command=self.submit_link,
             cursor="hand2"
         )
-        self.submit_button.pack(pady=(10, 80))
+        self.submit_button.pack(side="left", padx=10)
+
+        self.update_button = tk.Button(
+            buttons_frame,
+            text="AKTUALIZUJ",
+            font=("Runmageddon", 20),
+            bg=Colors.YELLOW,
+            fg=Colors.BLACK,
+            activeforeground=Colors.YELLOW,
+            activebackground=Colors.BG_COLOR,
+            bd=5,
+            width=10,
+            command=self.submit_update_link,
+            cursor="hand2"
+        )
+        self.update_button.pack(side="left", padx=10)
+
+        self.queue_button = tk.Button(
+            content_frame,
+            text="KOLEJKA WIELU MAP",
+            font=("Runmageddon", 10),
+            bg=Colors.YELLOW,
+            fg=Colors.BLACK,
+            activeforeground=Colors.YELLOW,
+            activebackground=Colors.BG_COLOR,
+            bd=3,
+            command=self.controller.show_jobs_window,
+            cursor="hand2"
+        )
+        self.queue_button.pack(pady=(0, 10))
 
         disclaimer_label = tk.Label(
             content_frame,
@@ -81,8 +175,9 @@ class MapLinkFrame(tk.Frame):
         )
         disclaimer_label.pack()
 
-        self.submit_button.bind("<Enter>", self.on_enter)
-        self.submit_button.bind("<Leave>", self.on_leave)
+        for button in (self.submit_button, self.update_button, self.queue_button):
+            button.bind("<Enter>", self.on_enter)
+            button.bind("<Leave>", self.on_leave)
 
     def on_enter(self, event):
         """
@@ -94,7 +189,7 @@ class MapLinkFrame(tk.Frame):
         Returns:
             None
         """
-        self.submit_button.config(bg=Colors.YELLOW, fg=Colors.BG_VERY_LIGHT)
+        event.widget.config(bg=Colors.YELLOW, fg=Colors.BG_VERY_LIGHT)
 
     def on_leave(self, event):
         """
@@ -106,7 +201,37 @@ class MapLinkFrame(tk.Frame):
         Returns:
             None
         """
-        self.submit_button.config(bg=Colors.YELLOW, fg=Colors.BLACK)
+        event.widget.config(bg=Colors.YELLOW, fg=Colors.BLACK)
+
+    def on_link_changed(self, *args):
+        """
+        Schedules validating the map link after a pause in typing, replacing the previously scheduled validation.
+        
+        Parameters:
+            *args: Arguments of the variable trace callback.
+        
+        Returns:
+            None
+        """
+        if self._validation_job is not None:
+            self.after_cancel(self._validation_job)
+        self._validation_job = self.after(self.VALIDATION_DELAY, self.validate_link)
+
+    def validate_link(self):
+        """
+        Validates the entered map link and passes it to the controller to prefetch the map.
+        
+        An invalid link is marked below the entry field, and an empty or invalid link
+        cancels the prefetch of the previous link.
+        
+        Returns:
+            None
+        """
+        self._validation_job = None
+        map_link = self.link_var.get()
+        is_valid = GoogleMyMapsParser.is_valid_map_link(map_link)
+        self.link_status_label.config(text="" if is_valid or not map_link else "Nieprawidłowy link do mapy")
+        self.controller.prefetch_map_link(map_link if is_valid else None)
 
     def submit_link(self, event=None):
         """
@@ -127,6 +252,29 @@ class MapLinkFrame(tk.Frame):
             self.controller.show_frame("LoadingFrame")
             self.controller.process_map_link(map_link)
 
+    def submit_update_link(self):
+        """
+        Processes the map link to update a previously generated obstacle list.
+        
+        Asks for the obstacle list workbook to update, then switches to the loading frame
+        and initiates the map link processing through the controller.
+        
+        Returns:
+            None
+        """
+        map_link = self.entry.get()
+        if not map_link:
+            return
+        workbook_path = filedialog.askopenfilename(
+            parent=self,
+            initialdir=".",
+            filetypes=(("Excel files", "*.xlsx"), ("All files", "*.*"))
+        )
+        if workbook_path:
+            log.info("Map link provided: %s, updating: %s", map_link, workbook_path)
+            self.controller.show_frame("LoadingFrame")
+            self.controller.process_map_link(map_link, workbook_path)
+
     def bind_submit_button(self):
         """
         Binds the Enter and Keypad Enter keys to the submit_link function.
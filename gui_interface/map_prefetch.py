@@ -0,0 +1,171 @@
+import logging
+import threading
+from typing import Callable, Optional, Tuple
+
+from GoogleMyMaps import GoogleMyMaps, Map
+
+log = logging.getLogger(__name__)
+
+
+class PrefetchCancelled(Exception):
+    """
+    Raised in the prefetch thread when the prefetch was cancelled.
+    """
+
+
+class MapPrefetch:
+    """
+    Speculative download and decoding of a map in a background thread, started before the user submits the link.
+
+    A generation job submitted for the same link takes over the prefetch and waits only for the part
+    that isn't done yet. A prefetch of a link that was changed in the meantime is cancelled, the download
+    stops at its next chunk and the decoded map, if any, is dropped.
+
+    Attributes:
+        WAIT_INTERVAL (float): Interval of checking whether the waiting job was cancelled in seconds.
+        map_link (str): Link of the map.
+        raw_data (Optional[str]): The downloaded map page.
+        google_map (Optional[Map]): The decoded map.
+        error (Optional[Exception]): The error the download or decoding failed with.
+    """
+
+    WAIT_INTERVAL = 0.1
+
+    def __init__(self, gmm: GoogleMyMaps, map_link: str):
+        """
+        Initialize the prefetch, use start to run it.
+
+        Parameters:
+            gmm (GoogleMyMaps): The map loader.
+            map_link (str): Link of the map.
+        """
+        self.gmm = gmm
+        self.map_link = map_link
+        self.raw_data: Optional[str] = None
+        self.google_map: Optional[Map] = None
+        self.error: Optional[Exception] = None
+        self._cancelled = threading.Event()
+        self._downloaded = threading.Event()
+        self._decoded = threading.Event()
+        self._on_download: Optional[Callable[[int, Optional[int]], None]] = None
+        self._download_progress: Optional[Tuple[int, Optional[int]]] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Start downloading and decoding the map in a background thread.
+        """
+        log.info("Prefetching map %s", self.map_link)
+        threading.Thread(target=self._run, name="MapPrefetch", daemon=True).start()
+
+    def cancel(self) -> None:
+        """
+        Cancel the prefetch, the download stops at its next chunk.
+        """
+        if not self._decoded.is_set():
+            log.info("Cancelling prefetch of %s", self.map_link)
+        self._cancelled.set()
+
+    def is_usable(self) -> bool:
+        """
+        Check whether a job can take over the prefetch.
+
+        Returns:
+            bool: True if the prefetch is running or finished successfully, False if it was cancelled or failed.
+        """
+        return not self._cancelled.is_set() and self.error is None
+
+    def attach(self, on_download: Callable[[int, Optional[int]], None]) -> None:
+        """
+        Report the download progress to a callback, starting with the progress made so far.
+
+        Parameters:
+            on_download (Callable[[int, Optional[int]], None]): Callback getting the downloaded and total bytes.
+        """
+        with self._lock:
+            self._on_download = on_download
+            download_progress = self._download_progress
+        if download_progress is not None:
+            on_download(*download_progress)
+
+    def wait_for_download(self, check_cancelled: Callable[[], None]) -> str:
+        """
+        Wait until the map page is downloaded.
+
+        Parameters:
+            check_cancelled (Callable[[], None]): Called while waiting, raises to stop waiting.
+
+        Returns:
+            str: The downloaded map page.
+        """
+        self._wait(self._downloaded, check_cancelled)
+        return self.raw_data
+
+    def wait_for_map(self, check_cancelled: Callable[[], None]) -> Map:
+        """
+        Wait until the map is decoded.
+
+        Parameters:
+            check_cancelled (Callable[[], None]): Called while waiting, raises to stop waiting.
+
+        Returns:
+            Map: The decoded map.
+        """
+        self._wait(self._decoded, check_cancelled)
+        return self.google_map
+
+    def _wait(self, event: threading.Event, check_cancelled: Callable[[], None]) -> None:
+        """
+        Wait for a part of the prefetch, re-raising its error.
+
+        Parameters:
+            event (threading.Event): Event set when the part is done.
+            check_cancelled (Callable[[], None]): Called while waiting, raises to stop waiting.
+
+        Raises:
+            Exception: The error the prefetch failed with.
+        """
+        while not event.wait(self.WAIT_INTERVAL):
+            check_cancelled()
+        if self.error is not None:
+            check_cancelled()
+            raise self.error
+
+    def _report_download(self, received: int, total: Optional[int]) -> None:
+        """
+        Remember the download progress and pass it to the attached callback.
+
+        Parameters:
+            received (int): Downloaded bytes.
+            total (Optional[int]): Size of the page in bytes, None if unknown.
+
+        Raises:
+            PrefetchCancelled: If the prefetch was cancelled.
+        """
+        if self._cancelled.is_set():
+            raise PrefetchCancelled()
+        with self._lock:
+            self._download_progress = (received, total)
+            on_download = self._on_download
+        if on_download is not None:
+            on_download(received, total)
+
+    def _run(self) -> None:
+        """
+        Download and decode the map, in the prefetch thread.
+        """
+        try:
+            self.raw_data = self.gmm.download_map(self.map_link, self._report_download)
+            self._downloaded.set()
+            if self._cancelled.is_set():
+                raise PrefetchCancelled()
+            self.google_map = self.gmm.decode_map(self.map_link, self.raw_data)
+            log.info("Map %s prefetched", self.map_link)
+        except PrefetchCancelled as e:
+            self.error = e
+        except Exception as e:
+            log.info("Unable to prefetch map %s: %s", self.map_link, e)
+            self.error = e
+        finally:
+            self._downloaded.set()
+            self._decoded.set()
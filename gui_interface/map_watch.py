@@ -0,0 +1,214 @@
+import logging
+import math
+import queue
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from GoogleMyMaps import GoogleMyMaps, Map
+from excel_tables.map_validator import MapValidator
+from excel_tables.obstacle_list_cache import ObstacleListCache
+
+log = logging.getLogger(__name__)
+
+
+class MapWatch:
+    """
+    Watch mode polling a map link and updating a generated obstacle list whenever the map changes.
+
+    The map page is polled in a daemon thread with conditional requests, so a server answering
+    304 Not Modified costs no download. A downloaded page is compared by the hash of its page data,
+    which ignores the tokens changing with every load, and only a page with different data is decoded.
+    The layers of the decoded map are then compared by their content hashes, and if any changed,
+    the workbook is updated in place by the ObstacleListUpdater. If courses or obstacles were added
+    that have no place in the workbook, the rest is still updated and the GUI is told that a new list
+    is needed, the workbook with the coordinators' edits is never replaced without asking the user.
+    The course result cache is shared with the generation, so only the courses depending on the changed
+    layers are recomputed.
+
+    Between polls the thread only waits, and after a failed poll the interval is doubled up to MAX_BACKOFF,
+    until a poll succeeds again. The thread never touches Tk widgets, the GUI polls the messages with after.
+    A message is a tuple of (kind, payload):
+
+    - ("unchanged", None): The map didn't change since the last poll.
+    - ("updated", ObstacleListUpdater): The map changed and the workbook was updated.
+    - ("needs_regeneration", ObstacleListUpdater): The map changed and the workbook was updated,
+      but some courses or obstacles have no place in it and a new list has to be generated.
+    - ("failed", Tuple[str, float]): The poll failed with the error message, the next poll is in the given seconds.
+
+    Attributes:
+        INTERVAL (float): Default interval between polls in seconds.
+        MIN_INTERVAL (float): The shortest allowed interval between polls in seconds.
+        MAX_BACKOFF (float): The longest interval between polls after errors in seconds.
+        map_link (str): Link of the watched map.
+        workbook_path (str): Path of the updated obstacle list.
+        interval (float): Interval between polls in seconds.
+        google_map (Map): The latest version of the map.
+        failures (int): Number of failed polls in a row.
+        messages (queue.Queue): Messages for the GUI.
+    """
+
+    INTERVAL = 60.0
+    MIN_INTERVAL = 10.0
+    MAX_BACKOFF = 900.0
+
+    def __init__(self, gmm: GoogleMyMaps, google_map: Map, workbook_path: str, cache: ObstacleListCache,
+                 interval: Optional[float] = None):
+        """
+        Initialize the watch, use start to run it.
+
+        Parameters:
+            gmm (GoogleMyMaps): The map loader.
+            google_map (Map): The version of the map the workbook was generated from.
+            workbook_path (str): Path of the generated obstacle list.
+            cache (ObstacleListCache): Cache of course results from previous generations.
+            interval (Optional[float]): Interval between polls in seconds, INTERVAL by default.
+        """
+        self.gmm = gmm
+        self.map_link = google_map.link
+        self.google_map = google_map
+        self.workbook_path = workbook_path
+        self.cache = cache
+        self.interval = max(interval or self.INTERVAL, self.MIN_INTERVAL)
+        self.failures = 0
+        self.messages: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self._validators: Dict[str, Optional[str]] = {}
+        self._page_data_hash: Optional[str] = None
+        self._layer_hashes = self._get_layer_hashes(google_map)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start polling the map in a background thread, the first poll is after one interval.
+        """
+        log.info("Watching map %s every %.0f s", self.map_link, self.interval)
+        self._thread = threading.Thread(target=self._run, name="MapWatch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop watching the map, a running poll finishes without updating the workbook.
+        """
+        if self.is_running():
+            log.info("Stopped watching map %s", self.map_link)
+        self._stopped.set()
+
+    def is_running(self) -> bool:
+        """
+        Check whether the watch thread is still running.
+
+        Returns:
+            bool: True while the map is watched.
+        """
+        return self._thread is not None and self._thread.is_alive() and not self._stopped.is_set()
+
+    def get_messages(self):
+        """
+        Get all messages put to the queue since the last call, without waiting.
+
+        Returns:
+            Iterator[Tuple[str, Any]]: The messages as tuples of (kind, payload).
+        """
+        while True:
+            try:
+                yield self.messages.get_nowait()
+            except queue.Empty:
+                return
+
+    def get_delay(self) -> float:
+        """
+        Get the time to the next poll, the interval doubled for every failed poll in a row.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        longest = max(self.MAX_BACKOFF, self.interval)
+        # The exponent stops growing once the delay is capped, so any number of failed polls can't overflow
+        exponent = min(self.failures, math.ceil(math.log2(longest / self.interval)))
+        return min(self.interval * 2 ** exponent, longest)
+
+    def poll(self) -> Tuple[str, Any]:
+        """
+        Check the map for changes and update the workbook if it changed, in the watch thread.
+
+        Returns:
+            Tuple[str, Any]: The message about the result, "unchanged", "updated" or "needs_regeneration".
+
+        Raises:
+            Exception: If the map can't be loaded or the workbook can't be updated.
+        """
+        # The validators of the new version are kept only once it's handled, so a failed update is retried
+        validators = dict(self._validators)
+        raw_data = self.gmm.download_map(self.map_link, validators=validators)
+        if raw_data is None:
+            log.debug("Map %s not modified", self.map_link)
+            return "unchanged", None
+        page_data_hash = self.gmm.get_page_data_hash(raw_data)
+        if page_data_hash == self._page_data_hash:
+            self._validators = validators
+            log.debug("Page data of map %s unchanged", self.map_link)
+            return "unchanged", None
+
+        google_map = self.gmm.decode_map(self.map_link, raw_data)
+        layer_hashes = self._get_layer_hashes(google_map)
+        changed_layers = sorted(name for name in set(layer_hashes) | set(self._layer_hashes)
+                                if layer_hashes.get(name) != self._layer_hashes.get(name))
+        if not changed_layers and google_map.name == self.google_map.name:
+            # The page data changed without a change of the map content, e.g. the page was just re-rendered
+            self._page_data_hash = page_data_hash
+            self._validators = validators
+            log.debug("Map %s content unchanged", self.map_link)
+            return "unchanged", None
+        log.info("Map %s changed, changed layers: %s", self.map_link, ", ".join(changed_layers) or "none")
+
+        validation_report = MapValidator.validate(google_map)
+        validation_report.log()
+        if not validation_report.is_valid:
+            raise ValueError(str(validation_report))
+        if self._stopped.is_set():
+            return "unchanged", None
+
+        from excel_tables.obstacle_list_updater import ObstacleListUpdater
+
+        updater = ObstacleListUpdater(google_map, self.workbook_path, self.cache)
+        updater.update()
+        kind = "updated"
+        if updater.unplaced:
+            log.warning("Courses and obstacles missing in %s, a new obstacle list is needed: %s",
+                        self.workbook_path, ", ".join(updater.unplaced))
+            kind = "needs_regeneration"
+        self.google_map = google_map
+        self._layer_hashes = layer_hashes
+        self._page_data_hash = page_data_hash
+        self._validators = validators
+        return kind, updater
+
+    def _run(self) -> None:
+        """
+        Poll the map until the watch is stopped, in the watch thread.
+        """
+        while not self._stopped.wait(self.get_delay()):
+            try:
+                message = self.poll()
+            except Exception as e:
+                self.failures += 1
+                log.warning("Watching map %s failed, retrying in %.0f s: %s", self.map_link, self.get_delay(), e)
+                self.messages.put(("failed", (str(e), self.get_delay())))
+                continue
+            self.failures = 0
+            if self._stopped.is_set():
+                return
+            self.messages.put(message)
+
+    @staticmethod
+    def _get_layer_hashes(google_map: Map) -> Dict[str, str]:
+        """
+        Get the content hashes of the map layers.
+
+        Parameters:
+            google_map (Map): The map.
+
+        Returns:
+            Dict[str, str]: Hashes of the layers by their names.
+        """
+        return {layer.name: ObstacleListCache.get_layer_hash(layer) for layer in google_map.layers}
@@ -1,29 +1,64 @@
+import logging
 import tkinter as tk
-from tkinter import ttk, font
+from tkinter import ttk, font, filedialog
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-from excel_tables.obstacle_list import ObstacleList
+from GoogleMyMaps.models import Place
+from excel_tables.obstacle_suggestions import ObstacleSuggestions
 from configs.utils import Colors
 
+if TYPE_CHECKING:
+    from excel_tables.obstacle_list import ObstacleList
 
-class NotFoundObstaclesWindow(tk.Tk):
-    """Window displaying obstacles that couldn't be found"""
+log = logging.getLogger(__name__)
 
-    def __init__(self, obstacle_list):
+class NotFoundObstaclesWindow(tk.Toplevel):
+    """
+    Window displaying obstacles that couldn't be found.
+
+    The window is a Toplevel of the main application window. Rows are inserted into the treeview
+    in chunks scheduled with after, so the application stays responsive even with thousands of not found
+    obstacles, and their suggestions are computed only for the inserted chunk. Sorting and filtering
+    by course are done on the list of obstacles, after which the treeview is filled again.
+
+    Attributes:
+        ALL_COURSES (str): Filter option showing the obstacles of all courses.
+        CHUNK_SIZE (int): Number of rows inserted into the treeview at once.
+        CHUNK_DELAY (int): Delay between inserting chunks in milliseconds.
+        SORT_COLUMNS (Tuple[str, ...]): Columns the obstacles can be sorted by.
+    """
+
+    ALL_COURSES = "Wszystkie formuły"
+    CHUNK_SIZE = 100
+    CHUNK_DELAY = 1
+    SORT_COLUMNS = ("course_name", "obstacle_number", "obstacle_name")
+
+    def __init__(self, parent, obstacle_list):
         """
         Initialize the NotFoundObstaclesWindow.
-        
+
         Creates a window that displays a list of obstacles that couldn't be found
         in a treeview with scrollbar. The window shows the course name, obstacle number,
-        and obstacle name for each not found obstacle.
-        
+        obstacle name and the most similar obstacles from the main courses for each not found obstacle.
+
         Parameters:
-            obstacle_list (ObstacleList): An object containing the list of obstacles 
+            parent (tk.Widget): The main application window.
+            obstacle_list (ObstacleList): An object containing the list of obstacles
                                           that couldn't be found.
         """
-        super().__init__()
+        super().__init__(parent)
         self.obstacle_list = obstacle_list
+        self.obstacles: List[Tuple[str, Optional[int], Place]] = [
+            (course.name, number, obstacle) for course, number, obstacle in obstacle_list.not_found_obstacles
+        ]
+        self.shown_obstacles: List[Tuple[str, Optional[int], Place]] = self.obstacles
+        self._shown_indexes: List[int] = list(range(len(self.obstacles)))
+        self.sort_column: Optional[str] = None
+        self.sort_descending = False
+        self._suggestions: Dict[int, str] = {}
+        self._populate_job: Optional[str] = None
         self.title("RMG - Robot Mateusza Grzech")
-        self.geometry("600x400")
+        self.geometry("900x400")
         self.resizable(True, True)
 
         # Set window background color
@@ -49,6 +84,21 @@ class NotFoundObstaclesWindow(tk.Tk):
         )
         title_label.pack(fill=tk.X)
 
+        # Course filter
+        course_names = list(dict.fromkeys(course_name for course_name, _, _ in self.obstacles))
+        self.course_var = tk.StringVar(self, value=self.ALL_COURSES)
+        course_menu = tk.OptionMenu(main_frame, self.course_var, self.ALL_COURSES, *course_names,
+                                    command=lambda _: self.apply_view())
+        course_menu.configure(
+            bg=Colors.YELLOW,
+            fg=Colors.BLACK,
+            activeforeground=Colors.YELLOW,
+            activebackground=Colors.BG_COLOR,
+            highlightthickness=0,
+            cursor="hand2"
+        )
+        course_menu.pack(anchor=tk.W, pady=(0, 10))
+
         # Create a frame for the list
         frame = tk.Frame(main_frame, bg=Colors.BG_COLOR, highlightthickness=0, bd=0)
         frame.pack(fill=tk.BOTH, expand=True)
@@ -61,22 +111,31 @@ class NotFoundObstaclesWindow(tk.Tk):
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         # Create columns
-        columns = ("course_name", "obstacle_number", "obstacle_name")
+        columns = ("course_name", "obstacle_number", "obstacle_name", "suggestions")
 
         # Create treeview with explicit background
         self.tree = ttk.Treeview(frame, columns=columns, show="headings", yscrollcommand=scrollbar.set,
                                  style="Treeview")
         self.tree.configure(style="Treeview")  # Ensure style is applied
 
-        # Define headings
-        self.tree.heading("course_name", text="Formuła")
-        self.tree.heading("obstacle_number", text="Numer")
-        self.tree.heading("obstacle_name", text="Nazwa Przeszkody")
+        # Define headings, clicking a heading sorts the obstacles by its column
+        self.headings = {
+            "course_name": "Formuła",
+            "obstacle_number": "Numer",
+            "obstacle_name": "Nazwa Przeszkody",
+            "suggestions": "Podobne przeszkody",
+        }
+        for column, text in self.headings.items():
+            if column in self.SORT_COLUMNS:
+                self.tree.heading(column, text=text, command=lambda c=column: self.sort_by(c))
+            else:
+                self.tree.heading(column, text=text)
 
         # Define columns width
         self.tree.column("course_name", width=175)
         self.tree.column("obstacle_number", width=40, anchor=tk.E)
         self.tree.column("obstacle_name", width=285)
+        self.tree.column("suggestions", width=400)
 
         # Pack treeview
         self.tree.pack(fill=tk.BOTH, expand=True)
@@ -88,47 +147,192 @@ class NotFoundObstaclesWindow(tk.Tk):
         self.tree.tag_configure('odd', background=Colors.BG_COLOR, foreground=Colors.TEXT_COLOR)
         self.tree.tag_configure('even', background=Colors.BG_LIGHT, foreground=Colors.TEXT_COLOR)
 
-        # Add obstacles to the list
-        self.populate_tree()
-
         # Create button frame
         button_frame = tk.Frame(main_frame, bg=Colors.BG_COLOR)
         button_frame.pack(fill=tk.X, pady=(10, 0))
 
         # Count label
-        count_text = f"Lista zawiera {len(self.obstacle_list.not_found_obstacles)} przeszkód"
-        count_label = tk.Label(
+        self.count_label = tk.Label(
             button_frame,
-            text=count_text,
             bg=Colors.BG_COLOR,
             fg=Colors.YELLOW,
             font=default_font
         )
-        count_label.pack(side=tk.LEFT, padx=5)
+        self.count_label.pack(side=tk.LEFT, padx=5)
+
+        report_button = tk.Button(
+            button_frame,
+            text="ZAPISZ RAPORT",
+            bg=Colors.YELLOW,
+            fg=Colors.BLACK,
+            activeforeground=Colors.YELLOW,
+            activebackground=Colors.BG_COLOR,
+            command=self.save_report,
+            cursor="hand2"
+        )
+        report_button.pack(side=tk.RIGHT, padx=5)
+
+        self.bind("<Destroy>", self.on_destroy)
+
+        # Add obstacles to the list
+        self.apply_view()
+
+    def sort_by(self, column: str):
+        """
+        Sort the obstacles by a column, clicking the same column again reverses the order.
+
+        Parameters:
+            column (str): The clicked column.
+        """
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+        for heading_column in self.SORT_COLUMNS:
+            text = self.headings[heading_column]
+            if heading_column == column:
+                text += " ▼" if self.sort_descending else " ▲"
+            self.tree.heading(heading_column, text=text)
+        self.apply_view()
+
+    def apply_view(self):
+        """
+        Filter and sort the obstacles by the chosen course and column, then fill the treeview again.
+        """
+        course_name = self.course_var.get()
+        obstacles = [(i, entry) for i, entry in enumerate(self.obstacles)
+                     if course_name == self.ALL_COURSES or entry[0] == course_name]
+        if self.sort_column is not None:
+            obstacles.sort(key=self._get_sort_key, reverse=self.sort_descending)
+        self.shown_obstacles = [entry for _, entry in obstacles]
+        self._shown_indexes = [i for i, _ in obstacles]
+
+        if len(self.shown_obstacles) == len(self.obstacles):
+            count_text = f"Lista zawiera {len(self.obstacles)} przeszkód"
+        else:
+            count_text = f"Wyświetlono {len(self.shown_obstacles)} z {len(self.obstacles)} przeszkód"
+        self.count_label.configure(text=count_text)
+        self.populate_tree()
 
     def populate_tree(self):
         """
-        Populate the tree with obstacles.
-        
-        Iterates through the list of not found obstacles and adds each one to the treeview
-        with alternating row colors for better readability.
+        Populate the tree with the shown obstacles.
+
+        Removes the current rows and schedules adding the shown obstacles in chunks,
+        with alternating row colors for better readability. Every row also shows
+        the most similar obstacles from the main courses. Filling the tree again
+        cancels the chunks that weren't added yet.
+        """
+        self._cancel_populate()
+        self.tree.delete(*self.tree.get_children())
+        self._populate_chunk(0)
+
+    def save_report(self):
+        """
+        Save the report of not found obstacles with suggestions to a text file.
+
+        The file path is chosen by the user in a save dialog.
         """
-        for i, (course, number, obstacle) in enumerate(self.obstacle_list.not_found_obstacles):
+        report_file_name = filedialog.asksaveasfilename(
+            parent=self,
+            initialdir=".",
+            initialfile="NIEZNALEZIONE PRZESZKODY.txt",
+            defaultextension=".txt",
+            filetypes=(("Text files", "*.txt"), ("All files", "*.*"))
+        )
+        if not report_file_name:
+            return
+        try:
+            with open(report_file_name, "w", encoding="utf-8") as report_file:
+                report_file.write(self.obstacle_list.get_not_found_obstacles_report())
+            log.info("Report saved successfully: %s", report_file_name)
+        except OSError as e:
+            log.error("Error saving report %s: %s", report_file_name, e)
+
+    def on_destroy(self, event):
+        """
+        Stop adding rows when the window is closed.
+
+        Parameters:
+            event (tk.Event): The destroy event, also sent for every child widget.
+        """
+        if event.widget is self:
+            self._cancel_populate()
+
+    def _populate_chunk(self, start: int):
+        """
+        Add a chunk of the shown obstacles to the tree and schedule the next one.
+
+        Parameters:
+            start (int): Index of the first shown obstacle of the chunk.
+        """
+        self._populate_job = None
+        end = min(start + self.CHUNK_SIZE, len(self.shown_obstacles))
+        for i in range(start, end):
+            course_name, number, obstacle = self.shown_obstacles[i]
             tag = 'odd' if i % 2 else 'even'
-            self.tree.insert("", tk.END, values=(course.name, number, obstacle.name), tags=(tag,))
+            suggestions = self._get_suggestions(self._shown_indexes[i], obstacle)
+            self.tree.insert("", tk.END, values=(course_name, number, obstacle.name, suggestions), tags=(tag,))
+        if end < len(self.shown_obstacles):
+            self._populate_job = self.after(self.CHUNK_DELAY, self._populate_chunk, end)
+
+    def _cancel_populate(self):
+        """
+        Cancel the scheduled chunk of rows, if any.
+        """
+        if self._populate_job is not None:
+            self.after_cancel(self._populate_job)
+            self._populate_job = None
+
+    def _get_suggestions(self, index: int, obstacle: Place) -> str:
+        """
+        Get the formatted suggestions of an obstacle, computing them on the first call.
+
+        Parameters:
+            index (int): Index of the obstacle in the list of all not found obstacles.
+            obstacle (Place): The obstacle.
+
+        Returns:
+            str: The suggestions as a single line of text.
+        """
+        if index not in self._suggestions:
+            self._suggestions[index] = ObstacleSuggestions.format_suggestions(
+                self.obstacle_list.get_obstacle_suggestions(obstacle)
+            )
+        return self._suggestions[index]
+
+    def _get_sort_key(self, item: Tuple[int, Tuple[str, Optional[int], Place]]):
+        """
+        Get the sort key of an obstacle for the chosen sort column.
+
+        Parameters:
+            item (Tuple[int, Tuple[str, Optional[int], Place]]): Index of the obstacle and the obstacle
+                                                                 as a tuple of (course name, number, place).
+
+        Returns:
+            tuple: The key, obstacles without a number are sorted last.
+        """
+        index, (course_name, number, obstacle) = item
+        if self.sort_column == "course_name":
+            return course_name, index
+        if self.sort_column == "obstacle_number":
+            return (number is None) != self.sort_descending, number or 0, index
+        return obstacle.name.casefold(), index
 
     @staticmethod
-    def show_not_found_obstacles(obstacle_list: ObstacleList):
+    def show_not_found_obstacles(parent, obstacle_list: "ObstacleList"):
         """
         Show window with obstacles that couldn't be found.
-        
+
         Creates and displays a window showing obstacles that couldn't be found,
         but only if there are any such obstacles.
-        
+
         Parameters:
+            parent (tk.Widget): The main application window.
             obstacle_list (ObstacleList): An object containing the list of obstacles
                                           that couldn't be found.
-        
+
         Returns:
             NotFoundObstaclesWindow or None: The created window instance if there are
                                             obstacles that couldn't be found, None otherwise.
@@ -136,6 +340,6 @@ class NotFoundObstaclesWindow(tk.Tk):
         if not obstacle_list.not_found_obstacles:
             return
 
-        window = NotFoundObstaclesWindow(obstacle_list)
+        window = NotFoundObstaclesWindow(parent, obstacle_list)
         window.focus_force()  # Force focus on this window
         return window
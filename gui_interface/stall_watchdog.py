@@ -0,0 +1,184 @@
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+class StallWatchdog:
+    """
+    Detector of stalls of the Tk event loop, for finding the code that freezes the window.
+
+    A heartbeat is scheduled on the event loop with after, and the lateness of every tick is measured.
+    A monitor thread checks the heartbeat meanwhile: while the loop is late by more than the threshold,
+    it samples the stack of the main thread with sys._current_frames. The first sample of a stall is logged
+    with the full stack, every sample counts towards the hot spot of the innermost application frame.
+    The statistics are logged by log_summary, e.g. at exit.
+
+    Attributes:
+        HEARTBEAT_INTERVAL (int): Interval of the heartbeat in milliseconds.
+        STALL_THRESHOLD (float): Lateness of the heartbeat in seconds after which the loop is stalled.
+        LATENESS_BUCKETS (List[float]): Lateness limits in seconds the ticks are counted for.
+        HOT_SPOTS (int): Number of hot spots in the summary.
+        ticks (int): Number of measured heartbeat ticks.
+        stalls (int): Number of detected stalls.
+        stalled_time (float): Total time the loop was stalled in seconds.
+        max_lateness (float): The highest lateness of a tick in seconds.
+        hot_spots (Counter): Stack samples taken during stalls by application frame.
+    """
+
+    HEARTBEAT_INTERVAL = 100
+    STALL_THRESHOLD = 0.25
+    LATENESS_BUCKETS = [0.05, 0.1, 0.25, 1.0]
+    HOT_SPOTS = 5
+
+    # Frames of the application code are looked for in this directory
+    PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def __init__(self, root, threshold: Optional[float] = None):
+        """
+        Initialize the watchdog, use start to run it.
+
+        Parameters:
+            root (tk.Tk): The application window whose event loop is watched.
+            threshold (Optional[float]): Lateness in seconds after which the loop is stalled,
+                                         STALL_THRESHOLD by default.
+        """
+        self.root = root
+        self.threshold = threshold or self.STALL_THRESHOLD
+        self.ticks = 0
+        self.stalls = 0
+        self.stalled_time = 0.0
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+        self.bucket_counts = [0] * len(self.LATENESS_BUCKETS)
+        self.hot_spots: Counter = Counter()
+        self._expected = 0.0
+        self._tick = 0
+        self._sampled_tick = -1
+        self._stall_location: Optional[str] = None
+        self._main_thread_id: Optional[int] = None
+        self._heartbeat_job: Optional[str] = None
+        self._stopped = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        """
+        Start the heartbeat and the monitor thread, in the thread running the event loop.
+        """
+        log.info("Event loop watchdog started, stall threshold %.3f s", self.threshold)
+        self._main_thread_id = threading.get_ident()
+        self._started = time.perf_counter()
+        self._schedule_heartbeat()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="StallWatchdog", daemon=True)
+        self._monitor.start()
+
+    def stop(self) -> None:
+        """
+        Stop the heartbeat and the monitor thread.
+        """
+        self._stopped.set()
+        if self._heartbeat_job is not None:
+            try:
+                self.root.after_cancel(self._heartbeat_job)
+            except Exception:
+                # The window may be destroyed already
+                pass
+            self._heartbeat_job = None
+        if self._monitor is not None:
+            self._monitor.join(timeout=1)
+
+    def get_summary(self) -> str:
+        """
+        Get the statistics of the event loop latency and stalls.
+
+        Returns:
+            str: The statistics as a multi-line text.
+        """
+        mean_lateness = self.total_lateness / self.ticks if self.ticks else 0.0
+        lines = [
+            f"Event loop watched for {time.perf_counter() - self._started:.1f} s, {self.ticks} ticks, "
+            f"mean lateness {mean_lateness * 1000:.1f} ms, max {self.max_lateness * 1000:.0f} ms",
+            "Ticks late by more than " + ", ".join(f"{limit * 1000:.0f} ms: {count}" for limit, count
+                                                  in zip(self.LATENESS_BUCKETS, self.bucket_counts)),
+            f"Stalls over {self.threshold * 1000:.0f} ms: {self.stalls}, {self.stalled_time:.3f} s in total",
+        ]
+        for location, samples in self.hot_spots.most_common(self.HOT_SPOTS):
+            lines.append(f"  {samples} samples in {location}")
+        return "\n".join(lines)
+
+    def log_summary(self) -> None:
+        """
+        Log the statistics of the event loop latency and stalls.
+        """
+        log.info("Event loop watchdog summary:\n%s", self.get_summary())
+
+    def _schedule_heartbeat(self) -> None:
+        """
+        Schedule the next heartbeat tick and remember when it's expected.
+        """
+        self._expected = time.perf_counter() + self.HEARTBEAT_INTERVAL / 1000
+        self._heartbeat_job = self.root.after(self.HEARTBEAT_INTERVAL, self._heartbeat)
+
+    def _heartbeat(self) -> None:
+        """
+        Measure the lateness of the tick, record a stall and schedule the next tick, in the event loop.
+        """
+        lateness = max(time.perf_counter() - self._expected, 0.0)
+        self.ticks += 1
+        self.total_lateness += lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+        for i, limit in enumerate(self.LATENESS_BUCKETS):
+            if lateness > limit:
+                self.bucket_counts[i] += 1
+        if lateness > self.threshold:
+            self.stalls += 1
+            self.stalled_time += lateness
+            log.warning("Event loop stalled for %.3f s in %s", lateness, self._stall_location or "unknown code")
+        self._stall_location = None
+        self._tick += 1
+        if not self._stopped.is_set():
+            self._schedule_heartbeat()
+
+    def _monitor_loop(self) -> None:
+        """
+        Sample the main thread stack while the event loop is stalled, in the monitor thread.
+        """
+        while not self._stopped.wait(self.threshold / 2):
+            tick = self._tick
+            if time.perf_counter() - self._expected <= self.threshold:
+                continue
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+            location = self._get_location(frame)
+            self.hot_spots[location] += 1
+            if self._sampled_tick != tick:
+                # Only the first sample of a stall is logged with the full stack
+                self._sampled_tick = tick
+                self._stall_location = location
+                log.warning("Event loop stalled for more than %.3f s, main thread stack:\n%s",
+                            self.threshold, "".join(traceback.format_stack(frame)))
+
+    def _get_location(self, frame) -> str:
+        """
+        Get the innermost frame of the application code in a stack.
+
+        Parameters:
+            frame (FrameType): The innermost frame of the stack.
+
+        Returns:
+            str: The frame as "file:line in function", the innermost frame if no frame is in the application.
+        """
+        stack: List[Tuple[str, int, str]] = [(frame_summary.filename, frame_summary.lineno, frame_summary.name)
+                                             for frame_summary in traceback.extract_stack(frame)]
+        application_frames = [entry for entry in stack
+                              if entry[0].startswith(self.PROJECT_DIRECTORY) and entry[0] != __file__]
+        filename, line, function = (application_frames or stack)[-1]
+        return f"{os.path.relpath(filename, self.PROJECT_DIRECTORY)}:{line} in {function}"
@@ -0,0 +1,113 @@
+import importlib
+import logging
+import threading
+from typing import Callable, List, Tuple
+
+from GoogleMyMaps.parsers import GoogleMyMapsParser
+from configs.progress import Progress
+from configs.utils import resource_path
+
+log = logging.getLogger(__name__)
+
+
+class WarmUp:
+    """
+    Background warm-up of the application while the user is entering the map link.
+
+    The heavy modules are imported, the WZORY templates are preloaded into the TemplateStore
+    and a connection to the map server is opened in a session handed over to the first thread loading a map,
+    so the first generation starts hot. The steps run
+    one after another in a daemon thread with a pause before each, so the GUI thread gets the interpreter
+    in between. The warm-up can be cancelled at any time, it stops before its next step.
+
+    Attributes:
+        MODULES (List[str]): Modules imported in advance.
+        STEP_PAUSE (float): Pause before each step in seconds.
+        progress (Progress): Timings of the finished steps.
+    """
+
+    MODULES = [
+        "excel_tables.obstacle_list",
+        "excel_tables.obstacle_table",
+        "excel_tables.obstacle_list_updater",
+        "excel_tables.document_pack",
+        "requests",
+        "bs4",
+        "pyjsparser",
+    ]
+    STEP_PAUSE = 0.05
+
+    def __init__(self):
+        """
+        Initialize the warm-up, use start to run it.
+        """
+        self.progress = Progress()
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """
+        Start the warm-up in a background thread.
+        """
+        self._thread = threading.Thread(target=self._run, name="WarmUp", daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """
+        Cancel the warm-up, it stops before its next step.
+        """
+        if self.is_running():
+            log.info("Cancelling warm-up")
+        self._cancelled.set()
+
+    def is_running(self) -> bool:
+        """
+        Check whether the warm-up thread is still running.
+
+        Returns:
+            bool: True while the warm-up runs.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_steps(self) -> List[Tuple[str, Callable[[], None]]]:
+        """
+        Get the warm-up steps in the order they run.
+
+        Returns:
+            List[Tuple[str, Callable[[], None]]]: Steps as tuples of (name, function).
+        """
+        steps = [(f"import {module}", lambda module=module: importlib.import_module(module))
+                 for module in self.MODULES]
+        steps.append(("templates", self._preload_templates))
+        steps.append(("connection", GoogleMyMapsParser.open_connection))
+        return steps
+
+    def _preload_templates(self) -> None:
+        """
+        Preload the templates of all documents, stopping early if the warm-up was cancelled.
+        """
+        from excel_tables.document_pack import DocumentPack
+        from excel_tables.template_store import TemplateStore
+
+        for document_class in DocumentPack.DOCUMENTS:
+            if self._cancelled.is_set():
+                return
+            TemplateStore.preload(resource_path(document_class.file_path))
+
+    def _run(self) -> None:
+        """
+        Run the warm-up steps, in the warm-up thread.
+        """
+        try:
+            for name, step in self.get_steps():
+                if self._cancelled.wait(self.STEP_PAUSE):
+                    log.info("Warm-up cancelled")
+                    return
+                with self.progress.stage(name):
+                    step()
+            log.info("Warm-up finished in %.3f s", self.progress.get_elapsed())
+        except Exception as e:
+            # A failed warm-up only means the work is done later, when it is needed
+            log.warning("Warm-up failed: %s", e)
+        finally:
+            self.progress.log_timings()
@@ -1,9 +1,40 @@
+import time
+
+STARTED = time.perf_counter()
+
 import logging
+import multiprocessing
+import os
+import sys
 
 from configs.logger_config import setup_logger
 from gui_interface.main_app import MainApp
+from gui_interface.stall_watchdog import StallWatchdog
+
+log = logging.getLogger(__name__)
+
+
+def print_banner():
+    """
+    Print the RMG banner to the console.
+
+    The banner is skipped if there is no console, as in the windowed executable, or if the RMG_NO_BANNER
+    environment variable is set. pyfiglet is imported only when the banner is printed.
+    """
+    if os.environ.get("RMG_NO_BANNER") or sys.stdout is None or not sys.stdout.isatty():
+        return
+    import pyfiglet
 
-import pyfiglet
+    try:
+        result = pyfiglet.figlet_format("RMG", font="ansi_shadow")
+        print(f"\033[94m{result}")
+    except pyfiglet.FontNotFound:
+        try:
+            result = pyfiglet.figlet_format("default")
+            print(f"\033[94m{result}")
+        except Exception as e:
+            print(f"\033[94m=== RMG ===")
+            print(f"Font error: {str(e)}")
 
 
 def main():
@@ -32,6 +63,12 @@ def main():
     - The DEBUG level provides maximum verbosity for development and troubleshooting
     - The MainApp class is imported from gui_interface.main_app and handles all UI components
     - The Tkinter mainloop() method blocks execution until the application window is closed
+    - Heavy modules (openpyxl, shapely, requests, ...) are imported only when they are first needed,
+      the time to the first window is logged and checked by benchmarks/startup_time.py
+    - Setting the RMG_WATCHDOG environment variable starts a StallWatchdog, which logs the main thread
+      stack when the window freezes and a summary of the event loop stalls at exit
+    - The RMG_WATCH_INTERVAL environment variable sets the interval in seconds between polls of a map
+      in the watch mode, started from the final frame
     
     Example Usage:
     ```
@@ -54,23 +91,31 @@ def main():
         - Future enhancements may include command-line arguments for different logging levels
           or other configuration options.
     """
-    try:
-        result = pyfiglet.figlet_format("RMG", font="ansi_shadow")
-        print(f"\033[94m{result}")
-    except pyfiglet.FontNotFound:
-        try:
-            result = pyfiglet.figlet_format("default")
-            print(f"\033[94m{result}")
-        except Exception as e:
-            print(f"\033[94m=== RMG ===")
-            print(f"Font error: {str(e)}")
+    print_banner()
 
     setup_logger(logging.DEBUG)
 
     app = MainApp()
-    app.mainloop()
+    if os.environ.get("RMG_WATCH_INTERVAL"):
+        try:
+            app.watch_interval = float(os.environ["RMG_WATCH_INTERVAL"])
+        except ValueError:
+            log.warning("Invalid RMG_WATCH_INTERVAL %r, using the default watch interval",
+                        os.environ["RMG_WATCH_INTERVAL"])
+    app.after_idle(lambda: log.info("First window shown %.3f s after start", time.perf_counter() - STARTED))
+    watchdog = StallWatchdog(app) if os.environ.get("RMG_WATCHDOG") else None
+    if watchdog is not None:
+        watchdog.start()
+    try:
+        app.mainloop()
+    finally:
+        if watchdog is not None:
+            watchdog.stop()
+            watchdog.log_summary()
 
 if __name__ == '__main__':
+    # Documents are rendered in worker processes, which need this in the frozen executable
+    multiprocessing.freeze_support()
     main()
 
     # TODO:
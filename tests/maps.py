@@ -0,0 +1,59 @@
+from typing import List, Optional
+
+from GoogleMyMaps.models import Map, Layer, Place
+
+NAMES = ["ŚCIANA", "LINY", "MONKEY BARS", "KONTENER", "BŁOTO", "OPONY", "DRABINA", "RAMPA", "SIATKA", "WORKI"]
+
+
+def icon(number: int) -> str:
+    """
+    Get the icon URL of a point numbered on the map.
+    """
+    return ("https://mt.google.com/vt/icon/name=icons/onion/1899-blank-shape_pin.png"
+            f"&highlight=ff000000,0288D1&scale=2.0&text={number}&psize=16")
+
+
+def point(name: str, number: Optional[int], coords: List[float], data: Optional[dict] = None) -> Place:
+    """
+    Create a point place, numbered if number is given.
+    """
+    return Place("Point", name, icon(number) if number is not None else None, list(coords), None, data)
+
+
+def line(name: str, coords: List[List[float]]) -> Place:
+    """
+    Create a line place.
+    """
+    return Place("Line", name, None, [list(coord) for coord in coords], None, None)
+
+
+def polygon(name: str, coords: List[List[float]]) -> Place:
+    """
+    Create a polygon place.
+    """
+    return Place("Polygon", name, None, [list(coord) for coord in coords], None, None)
+
+
+def make_map(obstacles: int = 12) -> Map:
+    """
+    Create a map of an event with zones, a main course, a shorter course sharing its trail and a kids course.
+
+    The main course runs north along a straight trail with an obstacle every 3 trail points, the shorter course
+    has every other obstacle of the main course, and the trail is split into 2 zones.
+    """
+    trail = [[52.0 + i * 0.0005, 21.0] for i in range(obstacles * 3)]
+    middle = 52.0 + len(trail) * 0.0005 / 2 + 0.0001
+    zones = [polygon("STREFA 1", [[51.99, 20.99], [51.99, 21.01], [middle, 21.01], [middle, 20.99]]),
+             polygon("STREFA 2", [[middle, 20.99], [middle, 21.01], [52.1, 21.01], [52.1, 20.99]])]
+
+    main = [point(f"{NAMES[i % len(NAMES)]} {i + 1}", i + 1, trail[i * 3], {"WOLO": "2", "SĘDZIA": "1"})
+            for i in range(obstacles)]
+    short = [point(place.name, number, place.coords) for number, place in enumerate(main[::2], start=1)]
+    kids_trail = [[52.0 + i * 0.0005, 21.002] for i in range(12)]
+    kids = [point(f"KIDS {i + 1}", i + 1, kids_trail[i * 2], {"WOLO": "1"}) for i in range(6)]
+    return Map("https://www.google.com/maps/d/u/0/edit?mid=TEST", "TEST MAP", [
+        Layer("STREFY", zones),
+        Layer("TRASA HARDCORE", [line("TRASA HARDCORE", trail)] + main),
+        Layer("TRASA CLASSIC", [line("TRASA CLASSIC", trail)] + short),
+        Layer("TRASA KIDS", [line("TRASA KIDS", kids_trail)] + kids),
+    ])
@@ -0,0 +1,107 @@
+from GoogleMyMaps.models import Map, Layer
+from excel_tables.map_diff import MapDiff
+from tests.maps import point, line, polygon
+
+LINK = "https://www.google.com/maps/d/u/0/edit?mid=TEST"
+
+
+def make_old_map() -> Map:
+    return Map(LINK, "TEST MAP", [
+        Layer("STREFY", [polygon("STREFA 1", [[52.0, 21.0], [52.0, 21.1], [52.1, 21.1]])]),
+        Layer("TRASA HARDCORE", [
+            line("TRASA HARDCORE", [[52.0, 21.0], [52.01, 21.0]]),
+            point("ŚCIANA", 1, [52.0, 21.0]),
+            point("LINY", 2, [52.001, 21.0]),
+            point("BŁOTO", 3, [52.002, 21.0]),
+        ]),
+    ])
+
+
+def get_changes(diff: MapDiff):
+    return [(change.change_type, change.layer_name,
+             change.old_place.name if change.old_place else None,
+             change.new_place.name if change.new_place else None) for change in diff.changes]
+
+
+def test_same_map_has_no_changes():
+    assert MapDiff(make_old_map(), make_old_map()).changes == []
+
+
+def test_added_and_removed():
+    new_map = make_old_map()
+    places = new_map.layers[1].places
+    places.remove(places[3])
+    places.append(point("OPONY", 4, [52.003, 21.0]))
+
+    assert sorted(get_changes(MapDiff(make_old_map(), new_map))) == [
+        (MapDiff.ADDED, "TRASA HARDCORE", None, "OPONY"),
+        (MapDiff.REMOVED, "TRASA HARDCORE", "BŁOTO", None),
+    ]
+
+
+def test_renamed_point_is_matched_by_number():
+    new_map = make_old_map()
+    new_map.layers[1].places[2].name = "LINA"
+
+    assert get_changes(MapDiff(make_old_map(), new_map)) == [(MapDiff.RENAMED, "TRASA HARDCORE", "LINY", "LINA")]
+
+
+def test_renamed_with_other_case_and_spaces_is_unchanged():
+    new_map = make_old_map()
+    new_map.layers[1].places[1].name = "ściana "
+
+    assert MapDiff(make_old_map(), new_map).changes == []
+
+
+def test_moved_above_threshold():
+    new_map = make_old_map()
+    new_map.layers[1].places[1].coords = [52.0001, 21.0]
+    new_map.layers[1].places[2].coords = [52.00101, 21.0]
+
+    diff = MapDiff(make_old_map(), new_map)
+
+    assert get_changes(diff) == [(MapDiff.MOVED, "TRASA HARDCORE", "ŚCIANA", "ŚCIANA")]
+    assert 10 < diff.changes[0].distance < 12
+    assert diff.changes[0].to_dict()["distance"] == round(diff.changes[0].distance, 1)
+
+
+def test_renumbered():
+    new_map = make_old_map()
+    new_map.layers[1].places[3].icon = point("BŁOTO", 5, [0, 0]).icon
+
+    diff = MapDiff(make_old_map(), new_map)
+
+    assert get_changes(diff) == [(MapDiff.RENUMBERED, "TRASA HARDCORE", "BŁOTO", "BŁOTO")]
+    assert (diff.changes[0].to_dict()["old_number"], diff.changes[0].to_dict()["new_number"]) == (3, 5)
+
+
+def test_reshaped_line_and_polygon():
+    new_map = make_old_map()
+    new_map.layers[0].places[0].coords = [[52.0, 21.0], [52.0, 21.2], [52.1, 21.1]]
+    new_map.layers[1].places[0].coords = [[52.0, 21.0], [52.005, 21.001], [52.01, 21.0]]
+
+    assert get_changes(MapDiff(make_old_map(), new_map)) == [
+        (MapDiff.RESHAPED, "STREFY", "STREFA 1", "STREFA 1"),
+        (MapDiff.RESHAPED, "TRASA HARDCORE", "TRASA HARDCORE", "TRASA HARDCORE"),
+    ]
+
+
+def test_added_and_removed_layers():
+    new_map = make_old_map()
+    new_map.layers[0].name = "STREFY 2025"
+
+    changes = get_changes(MapDiff(make_old_map(), new_map))
+
+    assert (MapDiff.ADDED, "STREFY 2025", None, "STREFA 1") in changes
+    assert (MapDiff.REMOVED, "STREFY", "STREFA 1", None) in changes
+
+
+def test_snapshot_round_trip(tmp_path):
+    old_map = make_old_map()
+    snapshot_path = str(tmp_path / "snapshot.json")
+    MapDiff.save_snapshot(old_map, snapshot_path)
+
+    restored = MapDiff.load_snapshot(snapshot_path)
+
+    assert MapDiff(old_map, restored).changes == []
+    assert restored.to_dict() == old_map.to_dict()
@@ -0,0 +1,87 @@
+import copy
+
+import openpyxl as xl
+import pytest
+
+from GoogleMyMaps.models import Layer
+from GoogleMyMaps.parsers.GoogleMyMapsParser import GoogleMyMapsParser
+from excel_tables.obstacle_list import ObstacleList
+from excel_tables.obstacle_list_cache import ObstacleListCache
+from gui_interface.map_watch import MapWatch
+from tests.maps import make_map
+
+
+class FakeMaps:
+    """
+    Map loader returning a new version of the map page whenever the version is changed.
+    """
+
+    def __init__(self, google_map):
+        self.google_map = google_map
+        self.version = 0
+
+    def download_map(self, link, on_download=None, validators=None):
+        return f'<script>var _pageData = "{self.version}";</script>'
+
+    def get_page_data_hash(self, raw_data):
+        return GoogleMyMapsParser.get_page_data_hash(raw_data)
+
+    def decode_map(self, link, raw_data):
+        return copy.deepcopy(self.google_map)
+
+
+@pytest.fixture
+def watched(tmp_path):
+    """
+    Generate an obstacle list of a map, edit it by hand and watch the map.
+    """
+    google_map = make_map()
+    path = str(tmp_path / "lista.xlsx")
+    cache = ObstacleListCache()
+    ObstacleList(google_map, cache).create_and_save(path)
+    wb = xl.load_workbook(path)
+    wb.worksheets[0]["V3"] = "Jan Kowalski"
+    wb.save(path)
+    maps = FakeMaps(google_map)
+    return MapWatch(maps, copy.deepcopy(google_map), path, cache), maps, path
+
+
+def test_changed_map_is_updated(watched):
+    watch, maps, path = watched
+    maps.google_map.layers[1].places[2].name = "NOWA NAZWA"
+    maps.version = 1
+
+    kind, updater = watch.poll()
+
+    assert kind == "updated"
+    assert [change.new_value for change in updater.changes] == ["NOWA NAZWA"]
+    ws = xl.load_workbook(path).worksheets[0]
+    assert (ws["S4"].value, ws["V3"].value) == ("NOWA NAZWA", "Jan Kowalski")
+
+
+def test_unplaced_course_keeps_the_edited_workbook(watched):
+    watch, maps, path = watched
+    new_course = copy.deepcopy(maps.google_map.layers[2])
+    maps.google_map.layers.insert(3, Layer("TRASA NOWA", new_course.places))
+    maps.google_map.layers[1].places[2].name = "NOWA NAZWA"
+    maps.version = 1
+
+    kind, updater = watch.poll()
+
+    assert kind == "needs_regeneration"
+    assert updater.unplaced == ['Course "TRASA NOWA" is missing in the workbook']
+    ws = xl.load_workbook(path).worksheets[0]
+    # The partial update is written, the manual edits are kept and the new course isn't added
+    assert (ws["S4"].value, ws["V3"].value) == ("NOWA NAZWA", "Jan Kowalski")
+    assert "NOWA" not in [ws.cell(row=1, column=col).value for col in range(1, ObstacleList.COLUMN_NAME)]
+    assert watch.poll() == ("unchanged", None)
+
+
+def test_delay_doubles_up_to_the_longest_backoff(watched):
+    watch = watched[0]
+    delays = []
+    for failures in (0, 1, 2, 10, 1024, 10 ** 6):
+        watch.failures = failures
+        delays.append(watch.get_delay())
+
+    assert delays == [watch.interval, 2 * watch.interval, 4 * watch.interval] + [MapWatch.MAX_BACKOFF] * 3
@@ -0,0 +1,83 @@
+import openpyxl as xl
+import pytest
+
+from excel_tables.obstacle_list import ObstacleList
+from excel_tables.obstacle_list_updater import ObstacleListUpdater
+from tests.maps import make_map
+
+# Columns filled in by the coordinators, never computed from the map
+RESPONSIBLE_COLUMN = "V"
+NOTES_COLUMN = "X"
+
+
+def load_sheet(path):
+    """
+    Load the obstacle sheet of a workbook.
+    """
+    return xl.load_workbook(path).worksheets[0]
+
+
+def computed_values(ws) -> dict:
+    """
+    Get the values of the cells computed from the map: course numbers, zones and kilometres, names and people.
+    """
+    return {(row, col): ws.cell(row=row, column=col).value
+            for row in range(1, ObstacleList.ROW_MAX + 1) for col in range(1, ObstacleList.COLUMN_JUDGE + 1)}
+
+
+@pytest.fixture
+def edited_list(tmp_path):
+    """
+    Generate an obstacle list and edit it like a coordinator would.
+    """
+    path = str(tmp_path / "lista.xlsx")
+    ObstacleList(make_map()).create_and_save(path)
+    wb = xl.load_workbook(path)
+    ws = wb.worksheets[0]
+    ws[f"{RESPONSIBLE_COLUMN}3"] = "Jan Kowalski"
+    ws[f"{RESPONSIBLE_COLUMN}10"] = "Ola Nowak"
+    ws[f"{NOTES_COLUMN}5"] = "notatka koordynatora"
+    # A computed cell overwritten by hand, the update restores it
+    ws["T4"] = 99
+    wb.save(path)
+    return path
+
+
+def test_update_keeps_manual_columns_and_matches_fresh_generation(tmp_path, edited_list):
+    google_map = make_map()
+    moved = google_map.layers[1].places[5]
+    moved.coords = [moved.coords[0] + 0.001, moved.coords[1]]
+    before = load_sheet(edited_list)
+
+    updater = ObstacleListUpdater(google_map, edited_list)
+    changes = updater.update()
+
+    fresh_path = str(tmp_path / "nowa.xlsx")
+    ObstacleList(google_map).create_and_save(fresh_path)
+    updated, fresh = load_sheet(edited_list), load_sheet(fresh_path)
+    assert not updater.unplaced
+    assert computed_values(updated) == computed_values(fresh)
+    # The moved obstacle 5 has a new km in the main course and in the course sharing its trail
+    assert {change.reference for change in changes} >= {"C7", "F7", "T4"}
+    assert updated["C7"].value != before["C7"].value
+    assert updated["T4"].value == fresh["T4"].value != 99
+
+    assert updated[f"{RESPONSIBLE_COLUMN}3"].value == "Jan Kowalski"
+    assert updated[f"{RESPONSIBLE_COLUMN}10"].value == "Ola Nowak"
+    assert updated[f"{NOTES_COLUMN}5"].value == "notatka koordynatora"
+    for row in range(1, ObstacleList.ROW_MAX + 1):
+        if row != 5:
+            assert updated[f"{NOTES_COLUMN}{row}"].value == fresh[f"{NOTES_COLUMN}{row}"].value
+
+
+def test_update_of_unchanged_map_only_restores_computed_cells(edited_list):
+    updater = ObstacleListUpdater(make_map(), edited_list)
+
+    changes = updater.update()
+
+    assert [(change.reference, change.old_value) for change in changes] == [("T4", 99)]
+    assert not updater.unplaced
+    updated = load_sheet(edited_list)
+    assert updated[f"{RESPONSIBLE_COLUMN}3"].value == "Jan Kowalski"
+    assert updated[f"{NOTES_COLUMN}5"].value == "notatka koordynatora"
+    assert ObstacleListUpdater(make_map(), edited_list).update() == []
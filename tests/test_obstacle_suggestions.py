@@ -0,0 +1,70 @@
+from GoogleMyMaps.models import Layer
+from excel_tables.obstacle_suggestions import ObstacleSuggestions
+from tests.maps import point
+
+
+def make_suggestions() -> ObstacleSuggestions:
+    course = Layer("TRASA HARDCORE", [
+        point("ŚCIANA", 1, [52.0, 21.0]),
+        point("ŻABKI", 2, [52.1, 21.0]),
+        point("MONKEY BARS", 3, [52.2, 21.0]),
+        point("ŚCIANA", 4, [52.3, 21.0]),
+    ])
+    return ObstacleSuggestions([course])
+
+
+def test_same_name_with_other_case_and_spaces_scores_one():
+    suggestions = make_suggestions().get_suggestions(point("ściana ", None, [0, 0]))
+
+    place, number, score = suggestions[0]
+    assert (place.name, number, score) == ("ŚCIANA", 1, 1.0)
+
+
+def test_duplicate_names_are_indexed_once():
+    suggestions = make_suggestions().get_suggestions(point("ŚCIANA", None, [0, 0]))
+
+    assert [number for _, number, _ in suggestions].count(4) == 0
+
+
+def test_name_without_diacritics_is_suggested_below_exact_match():
+    suggestions = make_suggestions().get_suggestions(point("ZABKI", None, [0, 0]))
+
+    place, number, score = suggestions[0]
+    assert (place.name, number) == ("ŻABKI", 2)
+    assert ObstacleSuggestions.MIN_SCORE <= score < 1.0
+
+
+def test_typo_is_ranked_first():
+    suggestions = make_suggestions().get_suggestions(point("MONKY BARS", None, [0, 0]))
+
+    assert suggestions[0][1] == 3
+    assert all(suggestions[0][2] >= score for _, _, score in suggestions)
+
+
+def test_candidates_below_min_score_are_not_suggested():
+    suggestions = make_suggestions()
+
+    assert suggestions.get_suggestions(point("TYROLKA", None, [0, 0])) == []
+    for query in ("ŚCIAN", "ZABKI", "MONKEY"):
+        assert all(score >= ObstacleSuggestions.MIN_SCORE for _, _, score in suggestions.get_suggestions(
+            point(query, None, [0, 0])))
+
+
+def test_limit_and_format():
+    suggestions = make_suggestions().get_suggestions(point("ŚCIANA MONKEY", None, [0, 0]), limit=1)
+
+    assert len(suggestions) == 1
+    place, number, score = suggestions[0]
+    assert ObstacleSuggestions.format_suggestions(suggestions) == f"{number}. {place.name} ({score:.0%})"
+
+
+def test_min_score_cutoff(monkeypatch):
+    suggestions = make_suggestions()
+    query = point("ZABKI", None, [0, 0])
+    monkeypatch.setattr(ObstacleSuggestions, "MIN_SCORE", 0.0)
+    score = suggestions.get_suggestions(query)[0][2]
+
+    monkeypatch.setattr(ObstacleSuggestions, "MIN_SCORE", score)
+    assert [number for _, number, _ in suggestions.get_suggestions(query)] == [2]
+    monkeypatch.setattr(ObstacleSuggestions, "MIN_SCORE", score + 0.01)
+    assert suggestions.get_suggestions(query) == []
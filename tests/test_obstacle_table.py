@@ -0,0 +1,63 @@
+import itertools
+
+import pytest
+
+from excel_tables.obstacle_table import ObstacleTableBuilder
+from tests.maps import make_map
+
+
+class Cancelled(Exception):
+    pass
+
+
+@pytest.fixture
+def processed(monkeypatch) -> list:
+    """
+    Record the names of the courses the builder processes.
+    """
+    names = []
+    process_course = ObstacleTableBuilder._process_course
+
+    def record(self, course, *args, **kwargs):
+        names.append(course.name)
+        return process_course(self, course, *args, **kwargs)
+
+    monkeypatch.setattr(ObstacleTableBuilder, "_process_course", record)
+    return names
+
+
+def cancel_at(call: int):
+    """
+    Get a cancel check raising on the given call.
+    """
+    calls = itertools.count(1)
+
+    def check_cancelled():
+        if next(calls) == call:
+            raise Cancelled()
+
+    return check_cancelled
+
+
+@pytest.mark.parametrize("call, courses", [
+    (1, []),
+    (2, []),
+    (3, ["TRASA HARDCORE"]),
+    (4, ["TRASA HARDCORE", "TRASA KIDS"]),
+    (5, ["TRASA HARDCORE", "TRASA KIDS"]),
+])
+def test_cancel_stops_between_stages_and_courses(processed, call, courses):
+    with pytest.raises(Cancelled):
+        ObstacleTableBuilder(make_map(), check_cancelled=cancel_at(call)).build()
+
+    assert processed == courses
+
+
+def test_build_checks_before_every_course(processed):
+    calls = []
+
+    ObstacleTableBuilder(make_map(), check_cancelled=lambda: calls.append(len(processed))).build()
+
+    assert processed == ["TRASA HARDCORE", "TRASA KIDS", "TRASA CLASSIC"]
+    # Before the zones, before each chainage course, before the matching and before each matched course
+    assert calls == [0, 0, 1, 2, 2]
@@ -0,0 +1,130 @@
+import io
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+from openpyxl import Workbook
+
+from excel_tables.courses import Courses
+from excel_tables.photo_cache import PhotoCache
+from excel_tables.photo_sheet import PhotoSheet
+from tests.maps import make_map
+
+
+def png(size, color, mode="RGB") -> bytes:
+    """
+    Get a PNG image of a single color.
+    """
+    stream = io.BytesIO()
+    Image.new(mode, size, color).save(stream, "PNG")
+    return stream.getvalue()
+
+
+PHOTOS = {
+    "/wide.png": png((640, 320), (200, 30, 30)),
+    "/tall.png": png((200, 500), (30, 200, 30)),
+    "/transparent.png": png((300, 300), (30, 30, 200, 0), "RGBA"),
+}
+
+
+class PhotoHandler(BaseHTTPRequestHandler):
+    """
+    Serve the PHOTOS and 404 for any other path, recording the requested paths.
+    """
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        content = PHOTOS.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PhotoHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def urls(server):
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return [base + path for path in PHOTOS] + [base + "/missing.png"]
+
+
+def test_thumbnails_are_made_and_missing_photos_skipped(tmp_path, urls):
+    thumbnails = PhotoCache(str(tmp_path), max_workers=1).get_thumbnails(urls)
+
+    assert sorted(thumbnails) == sorted(urls[:3])
+    for path in thumbnails.values():
+        with Image.open(path) as thumbnail:
+            assert thumbnail.format == "JPEG" and thumbnail.mode == "RGB"
+            assert max(thumbnail.size) == PhotoCache.THUMBNAIL_SIZE
+    with Image.open(thumbnails[urls[2]]) as thumbnail:
+        # Transparent parts become white
+        assert all(value > 240 for value in thumbnail.getpixel((10, 10)))
+
+
+def test_cached_thumbnails_are_not_downloaded_or_downscaled_again(tmp_path, urls, server, monkeypatch):
+    thumbnails = PhotoCache(str(tmp_path), max_workers=1).get_thumbnails(urls)
+    server.requests.clear()
+
+    def make_thumbnails(self, thumbnail_paths):
+        raise AssertionError("Thumbnails made again")
+
+    monkeypatch.setattr(PhotoCache, "_make_thumbnails", make_thumbnails)
+    assert PhotoCache(str(tmp_path), max_workers=1).get_thumbnails(urls) == thumbnails
+    # Only the photo that couldn't be downloaded is requested again
+    assert server.requests == ["/missing.png"]
+
+
+def test_too_large_photo_is_skipped(tmp_path, urls, monkeypatch):
+    # Only the transparent photo fits, the others are dropped after a few chunks
+    monkeypatch.setattr(PhotoCache, "MAX_PHOTO_SIZE", len(PHOTOS["/transparent.png"]))
+    monkeypatch.setattr(PhotoCache, "CHUNK_SIZE", 256)
+
+    thumbnails = PhotoCache(str(tmp_path), max_workers=1).get_thumbnails(urls)
+
+    assert list(thumbnails) == [urls[2]]
+    assert len(list((tmp_path / "objects").iterdir())) == 1
+
+
+def test_photo_sheet_embeds_thumbnails(tmp_path, urls):
+    google_map = make_map()
+    main, kids = google_map.layers[1], google_map.layers[3]
+    main.places[1].photos = urls[:2] + urls[3:]
+    main.places[2].photos = urls[2:3]
+    kids.places[1].photos = urls[:1]
+    wb = Workbook()
+
+    embedded = PhotoSheet(Courses(google_map), PhotoCache(str(tmp_path), max_workers=1)).add_to(wb)
+
+    ws = wb[PhotoSheet.SHEET_TITLE]
+    assert embedded == 4
+    assert len(ws._images) == 4
+    assert [[cell.value for cell in row] for row in ws.iter_rows(min_row=2, max_col=2)] == \
+           [["HARDCORE", 1], ["HARDCORE", 2], ["KIDS", 1]]
+
+
+def test_thumbnail_workers_do_not_import_openpyxl():
+    # Worker processes import the photo cache module to make thumbnails, openpyxl would only slow their start
+    code = "import sys, excel_tables.photo_cache; print('openpyxl' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,104 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import openpyxl as xl
+import pytest
+from openpyxl.styles import Font
+
+from configs.utils import resource_path
+from excel_tables.obstacle_list import ObstacleList
+from excel_tables.template_store import TemplateStore
+
+TEMPLATE = resource_path(ObstacleList.file_path)
+
+
+@pytest.fixture(autouse=True)
+def store():
+    TemplateStore.clear()
+    yield
+    TemplateStore.clear()
+
+
+def fingerprint(wb) -> tuple:
+    """
+    Get the values, fonts, dimensions and merged cells of a workbook's first worksheet.
+    """
+    ws = wb.worksheets[0]
+    cells = tuple(sorted((coordinate, cell.value, cell.font.b, cell.font.name)
+                         for coordinate, cell in ws._cells.items() if coordinate[0] <= 30))
+    rows = tuple(sorted((row, dimension.height, dimension.outlineLevel, dimension.hidden)
+                        for row, dimension in ws.row_dimensions.items() if row <= 30))
+    columns = tuple(sorted((dimension.min, dimension.max, dimension.width, dimension.outlineLevel, dimension.hidden)
+                           for dimension in ws.column_dimensions.values()))
+    merged = tuple(sorted(str(cell_range) for cell_range in ws.merged_cells.ranges))
+    return wb.sheetnames, ws.title, cells, rows, columns, merged, len(wb._fonts), len(wb._cell_styles)
+
+
+def modify(wb) -> None:
+    """
+    Change the values, styles, dimensions and sheets of a workbook in place.
+    """
+    ws = wb.worksheets[0]
+    ws["A3"] = "ZMIENIONE"
+    ws["B3"].font = Font(bold=True, name="Calibri")
+    ws.row_dimensions[5].height = 99
+    ws.row_dimensions.group(10, 20, hidden=True)
+    ws.column_dimensions.group("D", "F", hidden=True)
+    ws.merge_cells("A25:C25")
+    ws.title = "ZMIENIONY"
+    wb.create_sheet("NOWY")
+
+
+def test_copy_matches_the_parsed_template():
+    assert fingerprint(TemplateStore.get_workbook(TEMPLATE)) == fingerprint(xl.load_workbook(TEMPLATE))
+
+
+def test_copies_are_independent_of_the_store_and_each_other():
+    first, second = TemplateStore.get_workbook(TEMPLATE), TemplateStore.get_workbook(TEMPLATE)
+    expected = fingerprint(second)
+
+    modify(first)
+
+    assert fingerprint(first) != expected
+    assert fingerprint(second) == expected
+    assert fingerprint(TemplateStore.get_workbook(TEMPLATE)) == expected
+
+
+def test_new_dimensions_belong_to_the_copy():
+    first, second = TemplateStore.get_workbook(TEMPLATE), TemplateStore.get_workbook(TEMPLATE)
+    first_ws, second_ws = first.worksheets[0], second.worksheets[0]
+
+    # Created by the default factory of the dimension holders, which pickle doesn't restore
+    row_dimension, column_dimension = first_ws.row_dimensions[500], first_ws.column_dimensions["ZZ"]
+    row_dimension.font = Font(italic=True)
+
+    assert row_dimension.parent is first_ws and column_dimension.parent is first_ws
+    assert first_ws.row_dimensions.worksheet is first_ws
+    assert 500 not in second_ws.row_dimensions
+    assert len(second._fonts) == len(xl.load_workbook(TEMPLATE)._fonts)
+
+
+def test_modified_copy_saves_and_reloads():
+    wb = TemplateStore.get_workbook(TEMPLATE)
+    modify(wb)
+    stream = io.BytesIO()
+
+    wb.save(stream)
+
+    assert fingerprint(xl.load_workbook(io.BytesIO(stream.getvalue()))) == fingerprint(wb)
+    assert fingerprint(TemplateStore.get_workbook(TEMPLATE)) == fingerprint(xl.load_workbook(TEMPLATE))
+
+
+def test_copies_from_threads_are_independent():
+    expected = fingerprint(TemplateStore.get_workbook(TEMPLATE))
+
+    def copy_and_modify(index: int) -> tuple:
+        wb = TemplateStore.get_workbook(TEMPLATE)
+        wb.worksheets[0]["A3"] = f"WĄTEK {index}"
+        return wb.worksheets[0]["A3"].value, fingerprint(TemplateStore.get_workbook(TEMPLATE))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(copy_and_modify, range(8)))
+
+    assert [value for value, _ in results] == [f"WĄTEK {index}" for index in range(8)]
+    assert all(copy_fingerprint == expected for _, copy_fingerprint in results)
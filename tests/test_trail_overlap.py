@@ -0,0 +1,86 @@
+import pytest
+
+from GoogleMyMaps.models import Layer
+from excel_tables.course_trail import CourseTrail
+from excel_tables.trail_overlap import TrailOverlap
+from tests.maps import line
+
+# About 55.6 m between the trail points
+STEP = 0.0005
+
+
+def make_trail(coords) -> CourseTrail:
+    """
+    Create the trail of a course layer with a single line.
+    """
+    return CourseTrail(Layer("TRASA TEST", [line("TRASA TEST", coords)]))
+
+
+def straight(points: int):
+    """
+    Get the points of a straight trail running north.
+    """
+    return [[52.0 + i * STEP, 21.0] for i in range(points)]
+
+
+def square(side: int):
+    """
+    Get the points of a closed square loop with side points on each side.
+    """
+    south = [[52.0, 21.0 + i * STEP] for i in range(side)]
+    east = [[52.0 + i * STEP, 21.0 + side * STEP] for i in range(side)]
+    north = [[52.0 + side * STEP, 21.0 + (side - i) * STEP] for i in range(side)]
+    west = [[52.0 + (side - i) * STEP, 21.0] for i in range(side)]
+    return south + east + north + west + [[52.0, 21.0]]
+
+
+def test_same_trail_is_one_stretch():
+    trail = straight(40)
+    overlap = TrailOverlap(make_trail(trail), make_trail(trail))
+
+    assert len(overlap.stretches) == 1
+    assert overlap.get_shared_length() == pytest.approx(overlap.course_length)
+    assert overlap.get_course_distance(1000.0) == pytest.approx(1000.0)
+    assert overlap.get_reference_distance(1000.0) == pytest.approx(1000.0)
+
+
+def test_reversed_course_maps_backward():
+    trail = straight(40)
+    overlap = TrailOverlap(make_trail(trail), make_trail(trail[::-1]))
+    length = overlap.course_length
+
+    assert len(overlap.stretches) == 1
+    course_start, course_end, reference_start, reference_end = overlap.stretches[0]
+    assert reference_start == pytest.approx(length) and reference_end == pytest.approx(0.0)
+    assert overlap.get_shared_length() == pytest.approx(length)
+    assert overlap.get_reference_distance(500.0) == pytest.approx(length - 500.0)
+    assert overlap.get_course_distance(500.0) == pytest.approx(length - 500.0)
+
+
+def test_out_and_back_course_is_split_at_the_turn():
+    trail = straight(40)
+    course = trail[:20] + trail[:19][::-1]
+    overlap = TrailOverlap(make_trail(trail), make_trail(course))
+    turn = overlap.stretches[0][1]
+
+    assert len(overlap.stretches) == 2
+    assert overlap.stretches[0][2] < overlap.stretches[0][3]
+    assert overlap.stretches[1][2] > overlap.stretches[1][3]
+    assert overlap.get_shared_length() == pytest.approx(overlap.course_length)
+    # Both passes are found, the way back isn't flattened to the turning point
+    assert overlap.get_reference_distance(turn + 300.0) == pytest.approx(turn - 300.0)
+    assert overlap.get_course_distance(300.0) == pytest.approx(300.0)
+    assert overlap.get_course_distance(300.0, previous_course_distance=turn) == pytest.approx(2 * turn - 300.0)
+
+
+def test_loop_uses_the_pass_after_the_previous_obstacle():
+    loop = square(10)
+    overlap = TrailOverlap(make_trail(loop), make_trail(loop + loop[1:]))
+    lap = overlap.course_length / 2
+
+    assert len(overlap.stretches) == 2
+    assert overlap.get_course_distance(300.0) == pytest.approx(300.0)
+    assert overlap.get_course_distance(300.0, previous_course_distance=200.0) == pytest.approx(300.0)
+    assert overlap.get_course_distance(300.0, previous_course_distance=lap - 100.0) == pytest.approx(lap + 300.0)
+    # Without a pass after the previous obstacle, the closest pass is used
+    assert overlap.get_course_distance(300.0, previous_course_distance=2 * lap) == pytest.approx(lap + 300.0)
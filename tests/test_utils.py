@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from configs.utils import write_atomically
+
+
+def test_temporary_file_has_the_extension_of_the_target(tmp_path):
+    path = tmp_path / "lista.csv"
+    temp_names = []
+
+    def write(stream):
+        temp_names.extend(os.listdir(tmp_path))
+        stream.write(b"a;b\n")
+
+    write_atomically(str(path), write)
+
+    assert path.read_bytes() == b"a;b\n"
+    assert temp_names[0].startswith(".~") and temp_names[0].endswith(".csv")
+    assert os.listdir(tmp_path) == ["lista.csv"]
+
+
+def test_failed_write_keeps_the_target(tmp_path):
+    path = tmp_path / "lista.xlsx"
+    path.write_bytes(b"stara")
+    os.chmod(path, 0o600)
+
+    def write(stream):
+        stream.write(b"nowa")
+        raise OSError("dysk pełny")
+
+    with pytest.raises(OSError):
+        write_atomically(str(path), write)
+    write_atomically(str(path), lambda stream: stream.write(b"nowa"))
+
+    assert path.read_bytes() == b"nowa"
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert os.listdir(tmp_path) == ["lista.xlsx"]
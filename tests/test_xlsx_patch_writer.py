@@ -0,0 +1,103 @@
+import io
+import re
+import zipfile
+from copy import copy
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from excel_tables.document_pack import DocumentPack
+from excel_tables.excel_file import ExcelFile
+from excel_tables.map_context import MapContext
+from excel_tables.xlsx_patch_writer import XlsxPatchWriter
+from tests.maps import make_map
+
+
+@pytest.fixture(scope="module")
+def context():
+    google_map = make_map(40)
+    # The start obstacles are written in bold
+    for layer in google_map.layers[1:3]:
+        layer.places[1].name = "START"
+    google_map.layers[3].places[1].name = "START KIDS"
+    return MapContext.create(google_map)
+
+
+def snapshot(data: bytes) -> dict:
+    """
+    Load a saved workbook and get the values, styles and grouping of its worksheets.
+    """
+    worksheets = {}
+    for ws in load_workbook(io.BytesIO(data)).worksheets:
+        # The templates have styled cells down to the last row, only the existing cells are visited
+        cells = {
+            # Copies of the style proxies compare by value
+            coordinate: (cell.value, copy(cell.font), copy(cell.fill), copy(cell.border), copy(cell.alignment),
+                         cell.number_format)
+            for coordinate, cell in ws._cells.items()
+        }
+        rows = {row: (dimension.outlineLevel, dimension.hidden) for row, dimension in ws.row_dimensions.items()
+                if dimension.outlineLevel or dimension.hidden}
+        columns = {(dimension.min, dimension.max): (dimension.outlineLevel, dimension.hidden, dimension.width)
+                   for dimension in ws.column_dimensions.values()}
+        worksheets[ws.title] = {"cells": cells, "rows": rows, "columns": columns, "dimensions": ws.dimensions,
+                                "merged": sorted(str(cell_range) for cell_range in ws.merged_cells.ranges)}
+    return worksheets
+
+
+def save(document_class, context, use_patch_writer: bool, monkeypatch) -> bytes:
+    """
+    Create a document and save it with openpyxl or with the XlsxPatchWriter.
+    """
+    monkeypatch.setattr(ExcelFile, "use_patch_writer", use_patch_writer)
+    document = document_class.from_context(context)
+    document.create()
+    assert not document.template_extended
+    return document.to_bytes()
+
+
+@pytest.mark.parametrize("document_class", DocumentPack.DOCUMENTS, ids=lambda cls: cls.__name__)
+def test_patched_document_matches_openpyxl(document_class, context, monkeypatch):
+    expected = snapshot(save(document_class, context, False, monkeypatch))
+    patched = snapshot(save(document_class, context, True, monkeypatch))
+
+    assert list(patched) == list(expected)
+    for title, worksheet in expected.items():
+        for part, value in worksheet.items():
+            if part == "cells":
+                # Compared cell by cell, so a failure names the differing cells
+                differing = {coordinate: (cell, patched[title]["cells"].get(coordinate))
+                             for coordinate, cell in value.items() if patched[title]["cells"].get(coordinate) != cell}
+                assert not differing
+                assert set(patched[title]["cells"]) == set(value)
+            else:
+                assert patched[title][part] == value, part
+
+
+def test_groups_and_bold_cells_are_written(context, monkeypatch):
+    ws = load_workbook(io.BytesIO(save(DocumentPack.DOCUMENTS[0], context, True, monkeypatch))).worksheets[0]
+
+    assert any(cell.font.b for cell in ws._cells.values() if cell.value is not None)
+    assert any(dimension.outlineLevel for dimension in ws.row_dimensions.values())
+    assert any(dimension.outlineLevel for dimension in ws.column_dimensions.values())
+
+
+def test_dimension_is_extended_to_written_cells(tmp_path):
+    wb = Workbook()
+    wb.active["A1"] = "NAGŁÓWEK"
+    wb.active["B2"] = 1
+    template_path = str(tmp_path / "template.xlsx")
+    wb.save(template_path)
+    writer = XlsxPatchWriter(template_path)
+    writer.cells = {(5, 30): "NOWY", (2, 3): 2}
+    writer.bold_cells = {(5, 30)}
+    patched_path = str(tmp_path / "patched.xlsx")
+
+    writer.save(patched_path)
+
+    with zipfile.ZipFile(patched_path) as patched:
+        assert re.search(r'<dimension ref="([^"]+)"', patched.read("xl/worksheets/sheet1.xml").decode()).group(1) \
+               == "A1:E30"
+    ws = load_workbook(patched_path).active
+    assert (ws["A1"].value, ws["B2"].value, ws["B3"].value, ws["E30"].value) == ("NAGŁÓWEK", 1, 2, "NOWY")
+    assert ws["E30"].font.b